@@ -16,6 +16,7 @@
 from functools import wraps
 
 import structlog
+from asgiref.sync import iscoroutinefunction
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import AnonymousUser
@@ -109,8 +110,15 @@ class JWTAuthenticationMiddleware:
 
 
 def auth_optional(view_func):
-    def wrapped_view(request, *args, **kwargs):
-        return view_func(request, *args, **kwargs)
+    if iscoroutinefunction(view_func):
+
+        async def wrapped_view(request, *args, **kwargs):
+            return await view_func(request, *args, **kwargs)
+
+    else:
+
+        def wrapped_view(request, *args, **kwargs):
+            return view_func(request, *args, **kwargs)
 
     view_func.auth_optional = True
     return wraps(view_func)(wrapped_view)
@@ -18,6 +18,7 @@ from django.contrib.auth.admin import UserAdmin as DjangoUserAdmin
 
 from .models import (
     Group,
+    Job,
     Landscape,
     LandscapeDevelopmentStrategy,
     LandscapeGroup,
@@ -43,6 +44,14 @@ class LandscapeAdmin(admin.ModelAdmin):
     raw_id_fields = ("membership_list",)
 
 
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ("task", "status", "attempts", "run_after", "created_at", "finished_at")
+    list_filter = ("status", "task")
+    search_fields = ("task", "dedupe_key")
+    readonly_fields = ("created_at", "updated_at")
+
+
 class LandscapeDefaultGroup(Group):
     class Meta:
         proxy = True
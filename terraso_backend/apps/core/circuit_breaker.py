@@ -0,0 +1,204 @@
+# Copyright © 2026 Technology Matters
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see https://www.gnu.org/licenses/.
+
+"""In-process circuit breaker for calls to slow or unreliable upstream services.
+
+The breaker keeps the outcomes of the calls made in the last window_seconds.
+Once at least min_calls were made and the share of failed calls (exceptions, or
+calls slower than slow_call_seconds) reaches failure_rate, the circuit opens
+and calls are rejected with CircuitOpenError without reaching the upstream.
+After open_seconds a single probe call is let through (half-open): if it
+succeeds the circuit closes again, otherwise it stays open for another
+open_seconds.
+
+Latency is measured around each call, so slow calls count as failures
+whether or not the called function enforces a timeout of its own. Their
+results are still returned.
+
+State and counters are per process.
+"""
+
+import threading
+import time
+from collections import Counter, deque
+from enum import Enum
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+_circuit_breakers = {}
+_circuit_breakers_lock = threading.Lock()
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        name,
+        failure_rate=0.5,
+        min_calls=10,
+        window_seconds=60,
+        slow_call_seconds=None,
+        open_seconds=30,
+        clock=time.monotonic,
+    ):
+        self.name = name
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.window_seconds = window_seconds
+        self.slow_call_seconds = slow_call_seconds
+        self.open_seconds = open_seconds
+        self._clock = clock
+
+        self._lock = threading.Lock()
+        self._state = CircuitState.CLOSED
+        self._opened_at = None
+        self._probe_in_flight = False
+        self._outcomes = deque()
+        self._counters = Counter()
+
+        with _circuit_breakers_lock:
+            _circuit_breakers[name] = self
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._current_state()
+
+    def call(self, func, *args, **kwargs):
+        """
+        Calls func(*args, **kwargs) through the breaker. Raises CircuitOpenError
+        without calling func if the circuit is open.
+        """
+        is_probe = self._before_call()
+        started_at = self._clock()
+        try:
+            result = func(*args, **kwargs)
+        except Exception:
+            self._after_call(is_probe, failed=True, slow=False)
+            raise
+
+        duration = self._clock() - started_at
+        slow = self.slow_call_seconds is not None and duration > self.slow_call_seconds
+        self._after_call(is_probe, failed=slow, slow=slow)
+        return result
+
+    def stats(self):
+        with self._lock:
+            now = self._clock()
+            self._expire_outcomes(now)
+            window_failures = sum(1 for _, failed in self._outcomes if failed)
+            return {
+                "name": self.name,
+                "state": self._current_state().value,
+                "window_calls": len(self._outcomes),
+                "window_failures": window_failures,
+                "calls": self._counters["calls"],
+                "successes": self._counters["successes"],
+                "failures": self._counters["failures"],
+                "slow_calls": self._counters["slow_calls"],
+                "rejected_calls": self._counters["rejected_calls"],
+                "times_opened": self._counters["times_opened"],
+            }
+
+    def reset(self):
+        with self._lock:
+            self._state = CircuitState.CLOSED
+            self._opened_at = None
+            self._probe_in_flight = False
+            self._outcomes.clear()
+            self._counters.clear()
+
+    def _current_state(self):
+        if (
+            self._state == CircuitState.OPEN
+            and self._clock() - self._opened_at >= self.open_seconds
+        ):
+            self._state = CircuitState.HALF_OPEN
+        return self._state
+
+    def _before_call(self):
+        with self._lock:
+            state = self._current_state()
+            if state == CircuitState.CLOSED:
+                self._counters["calls"] += 1
+                return False
+            if state == CircuitState.HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                self._counters["calls"] += 1
+                return True
+
+            self._counters["rejected_calls"] += 1
+        raise CircuitOpenError(f"Circuit {self.name} is open")
+
+    def _after_call(self, is_probe, failed, slow):
+        with self._lock:
+            now = self._clock()
+            self._counters["failures" if failed else "successes"] += 1
+            if slow:
+                self._counters["slow_calls"] += 1
+
+            if is_probe:
+                self._probe_in_flight = False
+                if failed:
+                    self._open(now)
+                else:
+                    self._close()
+                return
+
+            self._outcomes.append((now, failed))
+            self._expire_outcomes(now)
+            if self._state == CircuitState.CLOSED and self._should_open():
+                self._open(now)
+
+    def _expire_outcomes(self, now):
+        while self._outcomes and now - self._outcomes[0][0] > self.window_seconds:
+            self._outcomes.popleft()
+
+    def _should_open(self):
+        calls = len(self._outcomes)
+        if calls < self.min_calls:
+            return False
+        failures = sum(1 for _, failed in self._outcomes if failed)
+        return failures / calls >= self.failure_rate
+
+    def _open(self, now):
+        self._state = CircuitState.OPEN
+        self._opened_at = now
+        self._outcomes.clear()
+        self._counters["times_opened"] += 1
+        logger.warning("Circuit breaker opened", extra={"circuit": self.name})
+
+    def _close(self):
+        self._state = CircuitState.CLOSED
+        self._opened_at = None
+        self._outcomes.clear()
+        logger.info("Circuit breaker closed", extra={"circuit": self.name})
+
+
+def circuit_breaker_stats():
+    with _circuit_breakers_lock:
+        breakers = list(_circuit_breakers.values())
+    return [breaker.stats() for breaker in breakers]
@@ -0,0 +1,48 @@
+# Copyright © 2026 Technology Matters
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see https://www.gnu.org/licenses/.
+
+"""File type checks for GIS uploads that don't need the GIS stack"""
+
+import zipfile
+
+
+def is_geojson_file_extension(file):
+    return file.name.endswith((".geojson", ".json"))
+
+
+def is_shape_file_extension(file):
+    return file.name.endswith(".zip")
+
+
+def is_shape_file_zip(file):
+    with zipfile.ZipFile(file, "r") as zip_file:
+        namelist = zip_file.namelist()
+        shp_filenames = [name for name in namelist if name.endswith(".shp")]
+        shx_filenames = [name for name in namelist if name.endswith(".shx")]
+        prj_filenames = [name for name in namelist if name.endswith(".prj")]
+
+        return all([shp_filenames, shx_filenames, prj_filenames])
+
+
+def is_kml_file_extension(file):
+    return file.name.endswith(".kml")
+
+
+def is_kmz_file_extension(file):
+    return file.name.endswith(".kmz")
+
+
+def is_gpx_file_extension(file):
+    return file.name.endswith(".gpx")
@@ -12,7 +12,11 @@
 #
 # You should have received a copy of the GNU Affero General Public License
 # along with this program. If not, see https://www.gnu.org/licenses/.
+import io
 import json
+import os
+import tempfile
+import uuid
 
 import requests
 from django.conf import settings
@@ -22,9 +26,13 @@ USERNAME = settings.MAPBOX_USERNAME
 TOKEN = settings.MAPBOX_ACCESS_TOKEN
 
 
-def create_tileset(id, geojson, name, description):
+def create_tileset(id, features, name, description):
+    """
+    Creates and publishes a tileset from an iterable of GeoJSON features, which
+    is consumed once, so it can be a generator.
+    """
     tileset_source_id = id
-    response, status_code = _post_tileset_source(geojson, tileset_source_id)
+    response, status_code = _post_tileset_source(features, tileset_source_id)
     if status_code != 200:
         raise Exception(
             "Received error sending post request to create tileset source. Response=", response
@@ -88,13 +96,67 @@ def get_line_delimited_geojson(geojson):
     return "\n".join([json.dumps(feature) for feature in geojson["features"]])
 
 
-def _post_tileset_source(geojson, id):
-    line_delimited_geojson = get_line_delimited_geojson(geojson)
-
+def write_line_delimited_geojson(features, file):
+    """Writes features to a binary file one at a time, returns how many were written"""
+    count = 0
+    for feature in features:
+        if count:
+            file.write(b"\n")
+        file.write(json.dumps(feature).encode("utf-8"))
+        count += 1
+    return count
+
+
+class MultipartFileBody:
+    """
+    multipart/form-data body with a single file field. The file is read in
+    chunks as the request is sent instead of being loaded in memory, and the
+    body length is known so the request has a Content-Length.
+    """
+
+    def __init__(self, field_name, file_name, content_type, file):
+        boundary = uuid.uuid4().hex
+        self.content_type = f"multipart/form-data; boundary={boundary}"
+        self.file = file
+        head = (
+            f"--{boundary}\r\n"
+            f'Content-Disposition: form-data; name="{field_name}"; filename="{file_name}"\r\n'
+            f"Content-Type: {content_type}\r\n\r\n"
+        ).encode("utf-8")
+        tail = f"\r\n--{boundary}--\r\n".encode("utf-8")
+
+        file.seek(0, os.SEEK_END)
+        self._length = len(head) + file.tell() + len(tail)
+        file.seek(0)
+        self._parts = [io.BytesIO(head), file, io.BytesIO(tail)]
+
+    def __len__(self):
+        return self._length
+
+    def read(self, size=-1):
+        chunks = []
+        while self._parts and size != 0:
+            chunk = self._parts[0].read(size)
+            if not chunk:
+                self._parts.pop(0)
+                continue
+            chunks.append(chunk)
+            if size > 0:
+                size -= len(chunk)
+        return b"".join(chunks)
+
+
+def _post_tileset_source(features, id):
     url = f"{API_URL}/tilesets/v1/sources/{USERNAME}/{id}?access_token={TOKEN}"
-    multipart_data = [("file", ("input.ndjson", line_delimited_geojson, "text/plain"))]
 
-    response = requests.post(url, files=multipart_data)
+    # Spooled to disk past MAPBOX_TILESET_SOURCE_SPOOL_MAX_SIZE, so memory use
+    # doesn't grow with the number of features
+    with tempfile.SpooledTemporaryFile(
+        max_size=settings.MAPBOX_TILESET_SOURCE_SPOOL_MAX_SIZE
+    ) as file:
+        write_line_delimited_geojson(features, file)
+        body = MultipartFileBody("file", "input.ndjson", "text/plain", file)
+        response = requests.post(url, data=body, headers={"Content-Type": body.content_type})
     response_json = response.json()
     status_code = response.status_code
     return response_json, status_code
@@ -14,19 +14,27 @@
 # along with this program. If not, see https://www.gnu.org/licenses/.
 
 import json
-import os
-import shutil
-import uuid
 import zipfile
+from contextlib import contextmanager
 
 import fiona
 import geopandas as gpd
+import numpy as np
 import pandas as pd
+import shapely
 import structlog
+from django.conf import settings
 from django.core.exceptions import ValidationError
 from fiona.drvsupport import supported_drivers
-from shapely.geometry import mapping
-
+from fiona.io import ZipMemoryFile
+
+from apps.core.gis.file_types import (
+    is_geojson_file_extension,
+    is_gpx_file_extension,
+    is_kml_file_extension,
+    is_kmz_file_extension,
+    is_shape_file_extension,
+)
 from apps.core.gis.utils import DEFAULT_CRS
 
 logger = structlog.get_logger(__name__)
@@ -47,128 +55,187 @@ IGNORE_KML_PROPS = [
 ]
 
 
-def is_geojson_file_extension(file):
-    return file.name.endswith((".geojson", ".json"))
-
-
-def is_shape_file_extension(file):
-    return file.name.endswith(".zip")
+def _rewind(source):
+    # source is either a file object or a GDAL path
+    if hasattr(source, "seek"):
+        source.seek(0)
 
 
-def is_shape_file_zip(file):
-    with zipfile.ZipFile(file, "r") as zip_file:
-        namelist = zip_file.namelist()
-        shp_filenames = [name for name in namelist if name.endswith(".shp")]
-        shx_filenames = [name for name in namelist if name.endswith(".shx")]
-        prj_filenames = [name for name in namelist if name.endswith(".prj")]
-
-        return all([shp_filenames, shx_filenames, prj_filenames])
+def _get_kml_gdf(source):
+    layers = fiona.listlayers(source)
 
+    if len(layers) == 1:
+        _rewind(source)
+        return gpd.read_file(source, driver="LIBKML")
 
-def is_kml_file_extension(file):
-    return file.name.endswith(".kml")
+    combined_gdf = gpd.GeoDataFrame()
+    for layer in layers:
+        _rewind(source)
+        gdf = gpd.read_file(source, driver="LIBKML", layer=layer)
+        combined_gdf = pd.concat([combined_gdf, gdf], ignore_index=True)
+    return combined_gdf
 
 
-def is_kmz_file_extension(file):
-    return file.name.endswith(".kmz")
+def _geometries_to_geojson(geometries):
+    """GeoJSON geometry dicts for a sequence of shapely geometries, serialized in bulk."""
+    geojson_strings = shapely.to_geojson(np.asarray(geometries, dtype=object))
+    geojson_strings[pd.isna(geojson_strings)] = "null"
+    return json.loads(f"[{','.join(geojson_strings)}]")
 
 
-def is_gpx_file_extension(file):
-    return file.name.endswith(".gpx")
+def _normalize_property_values(values):
+    """Column values as Python objects, with NaN/NaT as None and timestamps as ISO strings."""
+    na_mask = pd.isna(values).to_numpy()
+    inferred_type = pd.api.types.infer_dtype(values, skipna=True)
+    values = values.to_numpy(dtype=object, copy=True)
+    values[na_mask] = None
 
+    if inferred_type in ("datetime64", "datetime", "mixed"):
+        return [value.isoformat() if isinstance(value, pd.Timestamp) else value for value in values]
+    return values
 
-def _get_kml_gdf(file_buffer):
-    layers = fiona.listlayers(file_buffer)
 
-    if len(layers) == 1:
-        file_buffer.seek(0)
-        return gpd.read_file(file_buffer, driver="LIBKML")
+def _property_records(df, columns):
+    """One properties dict per row of df, for the given columns."""
+    columns = list(columns)
+    if not columns:
+        return [{} for _ in range(len(df))]
 
-    combined_gdf = gpd.GeoDataFrame()
-    for layer in layers:
-        file_buffer.seek(0)
-        gdf = gpd.read_file(file_buffer, driver="LIBKML", layer=layer)
-        combined_gdf = pd.concat([combined_gdf, gdf], ignore_index=True)
-    return combined_gdf
+    normalized_columns = [_normalize_property_values(df[column]) for column in columns]
+    return [dict(zip(columns, row)) for row in zip(*normalized_columns)]
 
 
-def parse_kml_file(file_buffer):
-    gdf = _get_kml_gdf(file_buffer)
+def parse_kml_file(source):
+    gdf = _get_kml_gdf(source)
 
-    def row_to_dict(row):
-        row_dict = row.to_dict()
-        for key, value in row_dict.items():
-            if pd.isna(value):  # Explicit check for NaN and NaT values
-                row_dict[key] = None  # Convert NaN or NaT to None
-            if isinstance(value, pd.Timestamp):
-                row_dict[key] = value.isoformat()  # Convert Timestamp to ISO format string
-        return row_dict
+    if gdf.empty:
+        return {"type": "FeatureCollection", "features": []}
 
-    records = [row_to_dict(row) for _, row in gdf.iterrows()]
+    property_columns = [column for column in gdf.columns if column not in IGNORE_KML_PROPS]
+    records = _property_records(gdf, property_columns)
+    geometries = _geometries_to_geojson(gdf["geometry"])
 
     geojson = {
         "type": "FeatureCollection",
         "features": [
             {
                 "type": "Feature",
-                "properties": {
-                    k: v for k, v in record.items() if k not in IGNORE_KML_PROPS and v is not None
-                },
-                "geometry": mapping(record["geometry"]) if record["geometry"] is not None else None,
+                "properties": {k: v for k, v in record.items() if v is not None},
+                "geometry": geometry,
             }
-            for record in records
+            for record, geometry in zip(records, geometries)
         ],
     }
 
     return geojson
 
 
+def _gdf_to_geojson(gdf):
+    """
+    Same FeatureCollection as json.loads(gdf.to_json()), without serializing
+    the features one by one and parsing the resulting string back.
+    """
+    geometry_column = gdf.geometry.name
+    records = _property_records(gdf, gdf.columns.drop(geometry_column))
+    geometry_values = gdf.geometry.to_numpy()
+    # to_json writes empty geometries as null
+    geometry_values = np.where(shapely.is_empty(geometry_values), None, geometry_values)
+    geometries = _geometries_to_geojson(geometry_values)
+
+    geojson = {
+        "type": "FeatureCollection",
+        "features": [
+            {"id": str(feature_id), "type": "Feature", "properties": record, "geometry": geometry}
+            for feature_id, record, geometry in zip(gdf.index, records, geometries)
+        ],
+    }
+
+    if gdf.crs is not None and not gdf.crs.equals("epsg:4326"):
+        authority = gdf.crs.to_authority()
+        if authority is not None and authority[0] in ["EDCS", "EPSG", "OGC", "SI", "UCUM"]:
+            geojson["crs"] = {
+                "type": "name",
+                "properties": {"name": f"urn:ogc:def:crs:{authority[0]}::{authority[1]}"},
+            }
+
+    return geojson
+
+
+@contextmanager
+def _open_zip_archive(file):
+    """
+    Opens an uploaded zip file through GDAL's /vsizip/ filesystem, so its
+    members can be read without extracting them. Yields the GDAL path of the
+    archive and the names of the files in it.
+
+    Uploads Django already spooled to disk are read in place, anything else
+    is loaded into GDAL's in-memory filesystem (/vsimem/).
+    """
+    file.seek(0)
+    with zipfile.ZipFile(file, "r") as zip_file:
+        members = [info for info in zip_file.infolist() if not info.is_dir()]
+
+    uncompressed_size = sum(member.file_size for member in members)
+    if uncompressed_size > settings.GIS_ARCHIVE_MAX_UNCOMPRESSED_SIZE:
+        raise ValueError(f"Archive contents too large: {uncompressed_size} bytes")
+
+    member_names = [
+        member.filename
+        for member in members
+        # Resource forks added by macOS when compressing files
+        if not member.filename.startswith("__MACOSX/")
+    ]
+
+    if hasattr(file, "temporary_file_path"):
+        yield f"/vsizip/{file.temporary_file_path()}", member_names
+        return
+
+    file.seek(0)
+    with ZipMemoryFile(file) as zip_memory_file:
+        yield zip_memory_file.name, member_names
+
+
 def parse_kmz_file(file):
-    tmp_folder = os.path.join("/tmp", str(uuid.uuid4()))
-    with zipfile.ZipFile(file, "r") as zip:
-        kml_filenames = [f for f in zip.namelist() if f.endswith(".kml")]
+    with _open_zip_archive(file) as (archive_path, member_names):
+        kml_filenames = [name for name in member_names if name.endswith(".kml")]
 
         if not kml_filenames:
             raise ValueError("Invalid kmz file")
 
-        kml_file = zip.extract(kml_filenames[0], tmp_folder)
+        return parse_kml_file(f"{archive_path}/{kml_filenames[0]}")
 
-    with open(kml_file, "rb") as file_buffer:
-        geojson = parse_kml_file(file_buffer)
 
-    # Delete extracted files
-    os.remove(os.path.join(tmp_folder, kml_filenames[0]))
-    os.rmdir(tmp_folder)
-
-    return geojson
+def _shapefile_layer_names(member_names):
+    """Shapefiles in the archive that have the index and projection files next to them."""
+    names = set(member_names)
+    return [
+        name
+        for name in member_names
+        if name.endswith(".shp")
+        and f"{name[: -len('.shp')]}.shx" in names
+        and f"{name[: -len('.shp')]}.prj" in names
+    ]
 
 
 def parse_shapefile(file):
-    tmp_folder = os.path.join("/tmp", str(uuid.uuid4()))
-    with zipfile.ZipFile(file, "r") as zip:
-        shp_filenames = [f for f in zip.namelist() if f.endswith(".shp")]
-        shx_filenames = [f for f in zip.namelist() if f.endswith(".shx")]
-        prj_filenames = [f for f in zip.namelist() if f.endswith(".prj")]
+    with _open_zip_archive(file) as (archive_path, member_names):
+        layer_names = _shapefile_layer_names(member_names)
 
-        if not shp_filenames or not shx_filenames or not prj_filenames:
+        if not layer_names:
             raise ValueError("Invalid shapefile")
 
-        shp_file = zip.extract(shp_filenames[0], tmp_folder)
-        zip.extract(prj_filenames[0], tmp_folder)
-        zip.extract(shx_filenames[0], tmp_folder)
-
-    gdf = gpd.read_file(shp_file)
-    gdf_transformed = gdf.to_crs(crs=DEFAULT_CRS)
-
-    # Delete extracted files
-    shutil.rmtree(tmp_folder)
+        gdfs = [
+            gpd.read_file(f"{archive_path}/{layer_name}").to_crs(crs=DEFAULT_CRS)
+            for layer_name in layer_names
+        ]
 
-    return json.loads(gdf_transformed.to_json())
+    gdf = gdfs[0] if len(gdfs) == 1 else pd.concat(gdfs, ignore_index=True)
+    return _gdf_to_geojson(gdf)
 
 
 def parse_gpx_file(file):
     gdf = gpd.read_file(file, driver="GPX")
-    return json.loads(gdf.to_json())
+    return _gdf_to_geojson(gdf)
 
 
 def parse_file_to_geojson(file):
@@ -0,0 +1,105 @@
+# Copyright © 2026 Technology Matters
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see https://www.gnu.org/licenses/.
+
+"""Parses uploaded GIS files to GeoJSON, optionally outside of the web worker.
+
+When GIS_PARSING_PROCESS_POOL_SIZE is greater than zero, files are parsed in a
+pool of worker processes with an address space limit of
+GIS_PARSING_WORKER_MEMORY_LIMIT_MB, and parsing is cancelled after
+GIS_PARSING_TIMEOUT_SECONDS. A pathological file then only takes down (or
+times out) a worker, and the web worker never has to import the GIS stack to
+parse it. Failures are reported as ValidationError codes, like the parsers do.
+"""
+
+import io
+import resource
+import threading
+
+import structlog
+from django.conf import settings
+from django.core.exceptions import ValidationError
+
+from apps.core.process_pool import ProcessWorkerPool, WorkerCrashed, WorkerTimeout
+
+logger = structlog.get_logger(__name__)
+
+# Errors of the worker pool rather than of the file (a busy or crashed
+# worker), so parsing the file again may succeed
+TRANSIENT_ERROR_CODES = ("parsing_timeout", "parsing_failed")
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _init_worker(memory_limit_bytes):
+    if memory_limit_bytes:
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit_bytes, memory_limit_bytes))
+
+
+def _parse_file_content(file_name, content):
+    # Runs in the worker process, which imports the GIS stack on first use
+    from apps.core.gis.parsers import parse_file_to_geojson as parse
+
+    file = io.BytesIO(content)
+    file.name = file_name
+    try:
+        return parse(file)
+    except MemoryError:
+        # Hit GIS_PARSING_WORKER_MEMORY_LIMIT_MB outside of the parsers' own error handling
+        raise ValidationError("parsing_failed")
+
+
+def _get_pool():
+    global _pool
+    if _pool is None:
+        # Request threads share the pool, so only one of them creates it
+        with _pool_lock:
+            if _pool is None:
+                memory_limit_mb = settings.GIS_PARSING_WORKER_MEMORY_LIMIT_MB
+                _pool = ProcessWorkerPool(
+                    settings.GIS_PARSING_PROCESS_POOL_SIZE,
+                    initializer=_init_worker,
+                    initargs=(memory_limit_mb * 1024 * 1024 if memory_limit_mb else None,),
+                )
+    return _pool
+
+
+def parse_file_to_geojson(file):
+    """
+    Same as apps.core.gis.parsers.parse_file_to_geojson, run in the GIS
+    worker pool when it is enabled.
+    """
+    file.seek(0)
+    if settings.GIS_PARSING_PROCESS_POOL_SIZE <= 0:
+        from apps.core.gis.parsers import parse_file_to_geojson as parse
+
+        return parse(file)
+
+    file_name = file.name
+    content = file.read()
+
+    try:
+        return _get_pool().run(
+            _parse_file_content,
+            file_name,
+            content,
+            timeout=settings.GIS_PARSING_TIMEOUT_SECONDS,
+        )
+    except WorkerTimeout:
+        logger.warning("GIS file parsing timed out", extra={"file_name": file_name})
+        raise ValidationError("parsing_timeout")
+    except WorkerCrashed:
+        logger.error("GIS parsing worker crashed", extra={"file_name": file_name})
+        raise ValidationError("parsing_failed")
@@ -15,17 +15,36 @@
 
 """Geospatial utility methods"""
 
+import json
+from functools import cache
+
 import structlog
-from pyproj import CRS
-from shapely.geometry import MultiPolygon, shape
+from django.conf import settings
 
 logger = structlog.get_logger(__name__)
 
 # CRS that should be used for all GeoJSON (see https://www.rfc-editor.org/rfc/rfc7946#section-4)
-DEFAULT_CRS = CRS.from_string("urn:ogc:def:crs:OGC:1.3:CRS84")
+DEFAULT_CRS_NAME = "urn:ogc:def:crs:OGC:1.3:CRS84"
+
+
+@cache
+def get_default_crs():
+    # pyproj (and shapely below) are only imported on first use, so that
+    # importing the models doesn't load the GIS stack in every worker
+    from pyproj import CRS
+
+    return CRS.from_string(DEFAULT_CRS_NAME)
+
+
+def __getattr__(name):
+    if name == "DEFAULT_CRS":
+        return get_default_crs()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def calculate_geojson_centroid(feature_json):
+    from shapely.geometry import MultiPolygon, shape
+
     if not feature_json:
         return None
     try:
@@ -93,11 +112,156 @@ def calculate_geojson_feature_area(feature_json):
 def calculate_geojson_polygon_area(polygon_json):
     """Calculates the area of a polygon supplied in GeoJSON format. Default CRS is WSG84 if
     none are provided"""
+    from shapely.geometry import shape
+
     untransformed = shape(polygon_json)
-    geod = DEFAULT_CRS.get_geod()
+    geod = get_default_crs().get_geod()
     area, _perimeter = geod.geometry_area_perimeter(untransformed)
     return abs(area)
 
 
 def m2_to_hectares(area):
     return area / 10000
+
+
+# Levels of detail served instead of the full geometry, see GIS_SIMPLIFICATION_TOLERANCES
+LEVEL_OF_DETAIL_FULL = "full"
+
+# A level is only kept when it removes at least this share of the vertices
+MIN_SIMPLIFICATION_VERTEX_REDUCTION = 0.2
+
+
+def _feature_geometries(feature_json):
+    import shapely
+
+    return shapely.from_geojson(
+        [
+            json.dumps(feature["geometry"]) if feature.get("geometry") else None
+            for feature in feature_json["features"]
+        ]
+    )
+
+
+def calculate_geojson_vertex_count(feature_json):
+    import shapely
+
+    if not feature_json or not feature_json.get("features"):
+        return 0
+    return int(shapely.get_num_coordinates(_feature_geometries(feature_json)).sum())
+
+
+def simplify_geojson(feature_json, tolerance):
+    """Simplifies every geometry of a FeatureCollection to tolerance (in degrees), keeping
+    valid topology"""
+    import shapely
+
+    geometries = shapely.simplify(
+        _feature_geometries(feature_json), tolerance, preserve_topology=True
+    )
+    features = [
+        {
+            **feature,
+            "geometry": None if geometry is None else json.loads(shapely.to_geojson(geometry)),
+        }
+        for feature, geometry in zip(feature_json["features"], geometries)
+    ]
+    return {**feature_json, "features": features}
+
+
+def calculate_geojson_simplified_levels(feature_json, vertex_count=None):
+    """
+    Simplified variants of a FeatureCollection keyed by level of detail. Small
+    geometries, and levels that wouldn't remove a meaningful share of the
+    vertices, are left out and served at full detail.
+    """
+    if vertex_count is None:
+        vertex_count = calculate_geojson_vertex_count(feature_json)
+    if vertex_count < settings.GIS_SIMPLIFICATION_MIN_VERTICES:
+        return {}
+
+    levels = {}
+    for level, tolerance in settings.GIS_SIMPLIFICATION_TOLERANCES.items():
+        try:
+            simplified = simplify_geojson(feature_json, tolerance)
+        except Exception as error:
+            logger.exception("Error simplifying geometry", extra={"level": level, "error": error})
+            return {}
+        simplified_vertex_count = calculate_geojson_vertex_count(simplified)
+        if simplified_vertex_count <= vertex_count * (1 - MIN_SIMPLIFICATION_VERTEX_REDUCTION):
+            levels[level] = simplified
+    return levels
+
+
+def get_simplified_geojson(simplified_levels, level):
+    """The simplified variant for a level of detail, None to use the full geometry"""
+    if not level or level == LEVEL_OF_DETAIL_FULL or not simplified_levels:
+        return None
+    return simplified_levels.get(level)
+
+
+def _geometries_metrics(features, geometries):
+    import numpy as np
+    import shapely
+
+    point = next(
+        (
+            {"lat": geom.get("coordinates")[1], "lng": geom.get("coordinates")[0]}
+            for feature in features
+            for geom in [feature.get("geometry")]
+            if geom and geom.get("type") == "Point"
+        ),
+        None,
+    )
+
+    type_ids = shapely.get_type_id(geometries)
+    polygonal = geometries[
+        (type_ids == shapely.GeometryType.POLYGON) | (type_ids == shapely.GeometryType.MULTIPOLYGON)
+    ]
+
+    geod = get_default_crs().get_geod()
+    area = sum(abs(geod.geometry_area_perimeter(geometry)[0]) for geometry in polygonal)
+
+    centroid = None
+    if point is not None:
+        centroid = point
+    elif len(polygonal):
+        centroid_point = shapely.centroid(shapely.multipolygons(shapely.get_parts(polygonal)))
+        if not centroid_point.is_empty:
+            centroid = {"lat": centroid_point.y, "lng": centroid_point.x}
+
+    bounds = shapely.total_bounds(geometries)
+    return {
+        "area_scalar_m2": round(area, 3),
+        "center_coordinates": centroid,
+        "bbox": None if np.isnan(bounds).any() else bounds.tolist(),
+        "vertex_count": int(shapely.get_num_coordinates(geometries).sum()),
+    }
+
+
+def calculate_geojson_metrics_batch(feature_jsons):
+    """
+    Area (m2), centroid, bounding box and vertex count of each FeatureCollection.
+    The geometries of the whole batch are parsed at once, and every metric is
+    computed from the same parsed geometries.
+    """
+    import numpy as np
+
+    try:
+        features_per_json = [feature_json["features"] for feature_json in feature_jsons]
+    except KeyError as e:
+        raise ValueError(f"Expecting key '{e.args[0]}' in feature JSON, but it was missing")
+    if not all(features_per_json):
+        raise ValueError("Boundary is empty!")
+
+    geometries = _feature_geometries(
+        {"features": [feature for features in features_per_json for feature in features]}
+    )
+    offsets = np.cumsum([0] + [len(features) for features in features_per_json])
+    return [
+        _geometries_metrics(features, geometries[start:end])
+        for features, start, end in zip(features_per_json, offsets[:-1], offsets[1:])
+    ]
+
+
+def calculate_geojson_metrics(feature_json):
+    return calculate_geojson_metrics_batch([feature_json])[0]
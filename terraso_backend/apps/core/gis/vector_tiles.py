@@ -0,0 +1,284 @@
+# Copyright © 2026 Technology Matters
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see https://www.gnu.org/licenses/.
+
+"""Encodes GeoJSON features as Mapbox Vector Tiles (MVT).
+
+Implements the subset of the Mapbox Vector Tile specification 2.1
+(https://github.com/mapbox/vector-tile-spec) needed to serve a single layer
+of points, lines and polygons, without a protobuf dependency. Geometries are
+expected in Web Mercator (EPSG:3857) meters, see project_to_web_mercator.
+"""
+
+import json
+import math
+import struct
+
+# Half the width of the Web Mercator world, in meters
+WEB_MERCATOR_MAX = 20037508.342789244
+WEB_MERCATOR_MAX_LATITUDE = 85.0511287798066
+
+DEFAULT_EXTENT = 4096
+DEFAULT_BUFFER = 64
+
+CONTENT_TYPE = "application/vnd.mapbox-vector-tile"
+
+_GEOM_POINT = 1
+_GEOM_LINESTRING = 2
+_GEOM_POLYGON = 3
+
+_MOVE_TO = 1
+_LINE_TO = 2
+_CLOSE_PATH = 7
+
+_WIRE_VARINT = 0
+_WIRE_64BIT = 1
+_WIRE_LENGTH_DELIMITED = 2
+
+
+def is_valid_tile(z, x, y):
+    return z >= 0 and 0 <= x < 2**z and 0 <= y < 2**z
+
+
+def tile_bounds(z, x, y):
+    """(min x, min y, max x, max y) of a XYZ tile in Web Mercator meters"""
+    tile_size = 2 * WEB_MERCATOR_MAX / 2**z
+    min_x = -WEB_MERCATOR_MAX + x * tile_size
+    max_y = WEB_MERCATOR_MAX - y * tile_size
+    return (min_x, max_y - tile_size, min_x + tile_size, max_y)
+
+
+def project_to_web_mercator(geometries):
+    """Projects an array of shapely geometries from longitude/latitude to Web Mercator"""
+    import numpy as np
+    import shapely
+
+    def project(coordinates):
+        longitude = coordinates[:, 0]
+        latitude = np.clip(coordinates[:, 1], -WEB_MERCATOR_MAX_LATITUDE, WEB_MERCATOR_MAX_LATITUDE)
+        return np.column_stack(
+            (
+                np.radians(longitude) * 6378137.0,
+                np.log(np.tan(np.pi / 4 + np.radians(latitude) / 2)) * 6378137.0,
+            )
+        )
+
+    return shapely.transform(geometries, project)
+
+
+def encode_tile(layer_name, geometries, properties, bounds, extent=DEFAULT_EXTENT, buffer=None):
+    """
+    Encodes a single layer tile. geometries are shapely geometries in Web
+    Mercator, properties the matching dicts of feature properties, and bounds
+    the tile bounds from tile_bounds. Geometries are clipped to the tile plus
+    buffer (in tile units) and snapped to the tile grid.
+    """
+    import shapely
+
+    if buffer is None:
+        buffer = DEFAULT_BUFFER * extent // DEFAULT_EXTENT
+
+    min_x, min_y, max_x, max_y = bounds
+    scale_x = extent / (max_x - min_x)
+    scale_y = extent / (max_y - min_y)
+
+    def to_tile(coordinates):
+        coordinates = coordinates.copy()
+        coordinates[:, 0] = (coordinates[:, 0] - min_x) * scale_x
+        # Tile y axis points down
+        coordinates[:, 1] = (max_y - coordinates[:, 1]) * scale_y
+        return coordinates
+
+    layer = _Layer(layer_name, extent)
+    for index, (geometry, feature_properties) in enumerate(zip(geometries, properties)):
+        if geometry is None or geometry.is_empty:
+            continue
+        geometry = shapely.transform(geometry, to_tile)
+        geometry = shapely.clip_by_rect(
+            geometry, -buffer, -buffer, extent + buffer, extent + buffer
+        )
+        geometry = shapely.set_precision(geometry, 1.0)
+        for part in _typed_parts(geometry):
+            layer.add_feature(index + 1, part, feature_properties or {})
+
+    if not layer.features:
+        return b""
+    return _field_bytes(3, layer.encode())
+
+
+def _typed_parts(geometry):
+    """Splits a geometry into parts of a single MVT geometry type"""
+    if geometry.is_empty:
+        return []
+    if geometry.geom_type == "GeometryCollection":
+        return [part for child in geometry.geoms for part in _typed_parts(child)]
+    return [geometry]
+
+
+class _Layer:
+    def __init__(self, name, extent):
+        self.name = name
+        self.extent = extent
+        self.features = []
+        self.keys = {}
+        self.values = {}
+
+    def add_feature(self, id, geometry, properties):
+        geom_type, commands = _encode_geometry(geometry)
+        if not commands:
+            return
+
+        tags = []
+        for key, value in properties.items():
+            encoded_value = _encode_value(value)
+            if encoded_value is None:
+                continue
+            tags.append(self.keys.setdefault(key, len(self.keys)))
+            tags.append(self.values.setdefault(encoded_value, len(self.values)))
+
+        self.features.append(
+            _varint_field(1, id)
+            + (_field_bytes(2, _packed(tags)) if tags else b"")
+            + _varint_field(3, geom_type)
+            + _field_bytes(4, _packed(commands))
+        )
+
+    def encode(self):
+        return b"".join(
+            [
+                _varint_field(15, 2),
+                _field_bytes(1, self.name.encode("utf-8")),
+                *(_field_bytes(2, feature) for feature in self.features),
+                *(_field_bytes(3, key.encode("utf-8")) for key in self.keys),
+                *(_field_bytes(4, value) for value in self.values),
+                _varint_field(5, self.extent),
+            ]
+        )
+
+
+def _encode_value(value):
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return _varint_field(7, int(value))
+    if isinstance(value, int) and -(2**63) <= value < 2**63:
+        return _varint_field(6, _zigzag(value))
+    if isinstance(value, float):
+        if math.isnan(value):
+            return None
+        return _key(3, _WIRE_64BIT) + struct.pack("<d", value)
+    if not isinstance(value, str):
+        value = json.dumps(value)
+    return _field_bytes(1, value.encode("utf-8"))
+
+
+def _encode_geometry(geometry):
+    cursor = [0, 0]
+    commands = []
+
+    def add_points(points, command):
+        commands.append(_command(command, len(points)))
+        for x, y in points:
+            commands.append(_zigzag(x - cursor[0]))
+            commands.append(_zigzag(y - cursor[1]))
+            cursor[0], cursor[1] = x, y
+
+    def add_line(points):
+        points = _dedupe(points)
+        if len(points) < 2:
+            return
+        add_points(points[:1], _MOVE_TO)
+        add_points(points[1:], _LINE_TO)
+
+    def add_ring(points, exterior):
+        points = _dedupe(points[:-1])
+        if len(points) < 3:
+            return False
+        area = _signed_area(points)
+        if area == 0:
+            return False
+        # Exterior rings wind clockwise on screen, interior rings counterclockwise
+        if (area > 0) != exterior:
+            points = points[::-1]
+        add_points(points[:1], _MOVE_TO)
+        add_points(points[1:], _LINE_TO)
+        commands.append(_command(_CLOSE_PATH, 1))
+        return True
+
+    geom_type = geometry.geom_type
+    if geom_type in ("Point", "MultiPoint"):
+        points = geometry.geoms if geom_type == "MultiPoint" else [geometry]
+        add_points([_integer_coordinates(point.coords)[0] for point in points], _MOVE_TO)
+        return _GEOM_POINT, commands
+    if geom_type in ("LineString", "LinearRing", "MultiLineString"):
+        lines = geometry.geoms if geom_type == "MultiLineString" else [geometry]
+        for line in lines:
+            add_line(_integer_coordinates(line.coords))
+        return _GEOM_LINESTRING, commands
+    if geom_type in ("Polygon", "MultiPolygon"):
+        polygons = geometry.geoms if geom_type == "MultiPolygon" else [geometry]
+        for polygon in polygons:
+            if add_ring(_integer_coordinates(polygon.exterior.coords), exterior=True):
+                for interior in polygon.interiors:
+                    add_ring(_integer_coordinates(interior.coords), exterior=False)
+        return _GEOM_POLYGON, commands
+    return None, []
+
+
+def _integer_coordinates(coordinates):
+    return [(int(round(x)), int(round(y))) for x, y, *_ in coordinates]
+
+
+def _dedupe(points):
+    return [point for index, point in enumerate(points) if index == 0 or point != points[index - 1]]
+
+
+def _signed_area(points):
+    return sum(x1 * y2 - x2 * y1 for (x1, y1), (x2, y2) in zip(points, points[1:] + points[:1]))
+
+
+def _command(command, count):
+    return (command & 0x7) | (count << 3)
+
+
+def _zigzag(value):
+    return (value << 1) ^ (value >> 63)
+
+
+def _varint(value):
+    encoded = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            encoded.append(byte | 0x80)
+        else:
+            encoded.append(byte)
+            return bytes(encoded)
+
+
+def _key(field, wire_type):
+    return _varint((field << 3) | wire_type)
+
+
+def _varint_field(field, value):
+    return _key(field, _WIRE_VARINT) + _varint(value)
+
+
+def _field_bytes(field, data):
+    return _key(field, _WIRE_LENGTH_DELIMITED) + _varint(len(data)) + data
+
+
+def _packed(values):
+    return b"".join(_varint(value) for value in values)
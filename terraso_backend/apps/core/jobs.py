@@ -0,0 +1,271 @@
+# Copyright © 2026 Technology Matters
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see https://www.gnu.org/licenses/.
+
+"""Durable background jobs stored in the core.Job table.
+
+Tasks are plain module level functions taking JSON serializable arguments.
+``enqueue`` stores a job in the same transaction as the caller's other
+changes, and workers started with the run_jobs management command claim
+queued jobs with SELECT ... FOR UPDATE SKIP LOCKED, so any number of workers
+can share the queue. Failed attempts are retried with exponential backoff
+until the job runs out of attempts. Workers refresh the locked_at of their
+running jobs every JOB_QUEUE_HEARTBEAT_SECONDS, so jobs left running by a
+worker that died are the ones not refreshed for JOB_QUEUE_STALE_SECONDS, and
+are picked up again.
+"""
+
+import random
+import socket
+import threading
+import traceback
+import uuid
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import timedelta
+
+import structlog
+from django.conf import settings
+from django.db import IntegrityError, connections, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from apps.core.models import Job
+
+logger = structlog.get_logger(__name__)
+
+# How often a worker requeues stale jobs and deletes old finished ones
+MAINTENANCE_INTERVAL_SECONDS = 600
+
+
+def task_name(func):
+    return f"{func.__module__}.{func.__name__}"
+
+
+def enqueue(
+    func,
+    *args,
+    dedupe_key=None,
+    replace_queued=False,
+    delay_seconds=0,
+    max_attempts=None,
+    **kwargs,
+):
+    """
+    Queues func(*args, **kwargs) to run in a worker. When a queued job with
+    the same dedupe_key exists, that job is returned instead of queueing
+    another one, with its arguments replaced by these if replace_queued is
+    set (for tasks where the latest call wins).
+    """
+    job = Job(
+        task=task_name(func),
+        args=list(args),
+        kwargs=kwargs,
+        dedupe_key=dedupe_key,
+        max_attempts=max_attempts or settings.JOB_QUEUE_MAX_ATTEMPTS,
+        run_after=timezone.now() + timedelta(seconds=delay_seconds),
+    )
+    for attempt in range(2):
+        try:
+            with transaction.atomic():
+                job.save()
+            break
+        except IntegrityError:
+            queued_jobs = Job.objects.filter(dedupe_key=dedupe_key, status=Job.Status.QUEUED)
+            if replace_queued:
+                queued_jobs.update(args=job.args, kwargs=job.kwargs)
+            existing_job = queued_jobs.first()
+            if existing_job is not None:
+                logger.info(
+                    "Job already queued", extra={"task": job.task, "dedupe_key": dedupe_key}
+                )
+                return existing_job
+            # The queued job was claimed since the insert, so it no longer blocks this one
+            if attempt:
+                raise
+
+    logger.info("Job queued", extra={"job_id": str(job.id), "task": job.task})
+
+    if settings.JOB_QUEUE_RUN_INLINE:
+        _mark_running(job, "inline")
+        run_job(job)
+        job.refresh_from_db()
+    return job
+
+
+def _mark_running(job, worker_id):
+    now = timezone.now()
+    Job.objects.filter(id=job.id).update(
+        status=Job.Status.RUNNING,
+        locked_at=now,
+        locked_by=worker_id,
+        attempts=F("attempts") + 1,
+    )
+    job.status = Job.Status.RUNNING
+    job.locked_at = now
+    job.locked_by = worker_id
+    job.attempts += 1
+
+
+def claim_jobs(limit, worker_id):
+    """Marks up to limit due jobs as running by worker_id and returns them"""
+    with transaction.atomic():
+        jobs = list(
+            Job.objects.select_for_update(skip_locked=True)
+            .filter(status=Job.Status.QUEUED, run_after__lte=timezone.now())
+            .order_by("run_after")[:limit]
+        )
+        for job in jobs:
+            _mark_running(job, worker_id)
+    return jobs
+
+
+def retry_delay_seconds(attempts):
+    delay = min(
+        settings.JOB_QUEUE_RETRY_BACKOFF_SECONDS * 2 ** (attempts - 1),
+        settings.JOB_QUEUE_RETRY_MAX_BACKOFF_SECONDS,
+    )
+    # Jitter, so jobs that failed together aren't all retried at the same time
+    return delay * random.uniform(1, 1.2)
+
+
+def _finish_job(job, status, error=None):
+    Job.objects.filter(id=job.id).update(
+        status=status, finished_at=timezone.now(), locked_at=None, last_error=error
+    )
+
+
+def _retry_or_fail_job(job, error):
+    if job.attempts >= job.max_attempts:
+        logger.error(
+            "Job failed",
+            extra={"job_id": str(job.id), "task": job.task, "attempts": job.attempts},
+        )
+        _finish_job(job, Job.Status.FAILED, error)
+        return
+
+    delay_seconds = retry_delay_seconds(job.attempts)
+    try:
+        with transaction.atomic():
+            Job.objects.filter(id=job.id).update(
+                status=Job.Status.QUEUED,
+                run_after=timezone.now() + timedelta(seconds=delay_seconds),
+                locked_at=None,
+                last_error=error,
+            )
+    except IntegrityError:
+        # A newer job with the same dedupe key is queued and will do the work
+        _finish_job(job, Job.Status.FAILED, f"{error}\nSuperseded by a newer queued job")
+        return
+    logger.warning(
+        "Job will be retried",
+        extra={"job_id": str(job.id), "task": job.task, "delay_seconds": delay_seconds},
+    )
+
+
+def run_job(job):
+    """Runs a claimed job and records the outcome"""
+    logger.info("Running job", extra={"job_id": str(job.id), "task": job.task})
+    try:
+        func = import_string(job.task)
+        func(*job.args, **job.kwargs)
+    except Exception:
+        logger.exception("Job attempt failed", extra={"job_id": str(job.id), "task": job.task})
+        _retry_or_fail_job(job, traceback.format_exc())
+    else:
+        _finish_job(job, Job.Status.SUCCEEDED)
+
+
+def heartbeat_jobs(worker_id):
+    """Refreshes the lock of the jobs running in worker_id, so they aren't taken as stale"""
+    return Job.objects.filter(status=Job.Status.RUNNING, locked_by=worker_id).update(
+        locked_at=timezone.now()
+    )
+
+
+def requeue_stale_jobs():
+    stale_before = timezone.now() - timedelta(seconds=settings.JOB_QUEUE_STALE_SECONDS)
+    stale_jobs = Job.objects.filter(status=Job.Status.RUNNING, locked_at__lt=stale_before)
+    for job in stale_jobs:
+        logger.warning(
+            "Job worker lost, retrying job",
+            extra={"job_id": str(job.id), "task": job.task, "locked_by": job.locked_by},
+        )
+        _retry_or_fail_job(job, f"Worker {job.locked_by} stopped while running the job")
+
+
+def purge_finished_jobs():
+    finished_before = timezone.now() - timedelta(days=settings.JOB_QUEUE_RETENTION_DAYS)
+    deleted, _ = Job.objects.filter(
+        status__in=[Job.Status.SUCCEEDED, Job.Status.FAILED], finished_at__lt=finished_before
+    ).delete()
+    return deleted
+
+
+class JobWorker:
+    """Claims and runs jobs in up to concurrency threads until stopped"""
+
+    def __init__(self, concurrency=None, poll_seconds=None):
+        self.concurrency = concurrency or settings.JOB_QUEUE_CONCURRENCY
+        self.poll_seconds = poll_seconds or settings.JOB_QUEUE_POLL_SECONDS
+        self.worker_id = f"{socket.gethostname()}:{uuid.uuid4().hex[:8]}"
+        self._stopping = threading.Event()
+
+    def stop(self):
+        """Stops claiming jobs, the jobs already running are finished"""
+        self._stopping.set()
+
+    def _run_job(self, job):
+        try:
+            run_job(job)
+        finally:
+            connections.close_all()
+
+    def run(self, burst=False):
+        """Runs jobs until stopped, or until no job is due when burst is set"""
+        logger.info(
+            "Job worker started",
+            extra={"worker_id": self.worker_id, "concurrency": self.concurrency},
+        )
+        last_maintenance = None
+        last_heartbeat = timezone.now()
+        running = set()
+        with ThreadPoolExecutor(self.concurrency) as executor:
+            while not self._stopping.is_set():
+                now = timezone.now()
+                if last_maintenance is None or (now - last_maintenance).total_seconds() > (
+                    MAINTENANCE_INTERVAL_SECONDS
+                ):
+                    requeue_stale_jobs()
+                    purge_finished_jobs()
+                    last_maintenance = now
+
+                running = {future for future in running if not future.done()}
+                if (now - last_heartbeat).total_seconds() > settings.JOB_QUEUE_HEARTBEAT_SECONDS:
+                    if running:
+                        heartbeat_jobs(self.worker_id)
+                    last_heartbeat = now
+                free_slots = self.concurrency - len(running)
+                jobs = claim_jobs(free_slots, self.worker_id) if free_slots else []
+                for job in jobs:
+                    running.add(executor.submit(self._run_job, job))
+
+                if burst and not jobs and not running:
+                    break
+                if not jobs:
+                    if running:
+                        wait(running, timeout=self.poll_seconds, return_when=FIRST_COMPLETED)
+                    else:
+                        self._stopping.wait(self.poll_seconds)
+        logger.info("Job worker stopped", extra={"worker_id": self.worker_id})
@@ -0,0 +1,230 @@
+# Copyright © 2026 Technology Matters
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see https://www.gnu.org/licenses/.
+
+"""Backups with a compressed file per model, dumped in parallel.
+
+A backup is a directory (a prefix on S3) named like the single file backups,
+with a <app_label>.<model_name>.jsonl.gz fixture per model and a manifest.
+Every model is read through a server side cursor in its own thread and
+written compressed as it's read, all of them from the same snapshot of the
+database. The manifest is written last, so backups without one are
+incomplete. Fixtures are in the jsonl format, so loaddata reads them as
+they are.
+
+Incremental backups only hold the rows whose updated_at is after the
+watermark of the previous backup (minus an overlap, for rows saved before and
+committed after that backup's snapshot), and the primary keys of all the rows.
+Like dumpdata, backups leave out soft deleted rows, so rows deleted (softly or
+not) since the previous backup are the ones missing from the primary keys.
+Models whose changes don't always touch updated_at (with many to many fields
+or natural keys, or no updated_at at all) are dumped whole, and so is every
+model when migrations were applied since the previous backup. Rows changed with QuerySet.update()
+without setting updated_at are missed, so full backups should still be made
+regularly.
+"""
+
+import gzip
+import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+
+from django.apps import apps
+from django.core import serializers
+from django.core.exceptions import FieldDoesNotExist
+from django.db import connection, connections, transaction
+
+MANIFEST_FILE_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+FIXTURE_SUFFIX = ".jsonl.gz"
+PKS_SUFFIX = ".pks.gz"
+
+# Models left out of backups, and not loaded from them
+EXCLUDED_MODELS = [
+    "core.BackgroundTask",
+    "core.Job",
+    "core.FinalizedUpload",
+    "contenttypes.contenttype",
+    "auth.Permission",
+    "sessions.Session",
+]
+
+
+def get_backup_models():
+    excluded = {label.lower() for label in EXCLUDED_MODELS}
+    return [
+        model
+        for model in apps.get_models()
+        if model._meta.managed and not model._meta.proxy and model._meta.label_lower not in excluded
+    ]
+
+
+def get_fixture_name(model):
+    return f"{model._meta.label_lower}{FIXTURE_SUFFIX}"
+
+
+def get_pks_name(model):
+    return f"{model._meta.label_lower}{PKS_SUFFIX}"
+
+
+def is_incremental_model(model):
+    """Whether the changed rows of the model can be found by updated_at"""
+    try:
+        model._meta.get_field("updated_at")
+    except FieldDoesNotExist:
+        return False
+    return not model._meta.many_to_many and not hasattr(model, "natural_key")
+
+
+def list_backups(storage):
+    """Names of the complete parallel backups in storage, oldest first"""
+    dirs, _files = storage.listdir(".")
+    return sorted(
+        name
+        for name in dirs
+        if name.startswith("backup") and storage.exists(f"{name}/{MANIFEST_FILE_NAME}")
+    )
+
+
+def read_manifest(storage, name):
+    with storage.open(f"{name}/{MANIFEST_FILE_NAME}", "rb") as fp:
+        return json.load(fp)
+
+
+def get_backup_chain(storage, name):
+    """Manifests of the backup and the ones it's incremental to, the full backup first"""
+    chain = []
+    while name is not None:
+        manifest = read_manifest(storage, name)
+        chain.insert(0, (name, manifest))
+        name = manifest.get("previous")
+    return chain
+
+
+def _set_snapshot(snapshot):
+    # Has to be run first in the transaction
+    with connection.cursor() as cursor:
+        cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ")
+        if snapshot is None:
+            cursor.execute("SELECT pg_export_snapshot()")
+            return cursor.fetchone()[0]
+        cursor.execute("SET TRANSACTION SNAPSHOT %s", [snapshot])
+        return snapshot
+
+
+def dump_model(model, directory, snapshot, chunk_size, since=None):
+    """
+    Writes the objects of the model to a compressed fixture, only the ones
+    changed since the given time if set. Returns the part of the manifest.
+    """
+    incremental = since is not None and is_incremental_model(model)
+    count = 0
+
+    def counted(objects):
+        nonlocal count
+        for obj in objects:
+            count += 1
+            yield obj
+
+    serializer = serializers.get_serializer("jsonl")()
+    try:
+        with transaction.atomic():
+            _set_snapshot(snapshot)
+            # Like dumpdata, with the default manager ordered by primary key
+            queryset = model._default_manager.order_by(model._meta.pk.name)
+            objects = queryset.filter(updated_at__gte=since) if incremental else queryset
+
+            with gzip.open(directory / get_fixture_name(model), "wt", encoding="utf-8") as stream:
+                serializer.serialize(
+                    counted(objects.iterator(chunk_size=chunk_size)),
+                    stream=stream,
+                    use_natural_foreign_keys=True,
+                    use_natural_primary_keys=True,
+                )
+            if incremental:
+                pks = queryset.values_list("pk", flat=True).iterator(chunk_size=chunk_size)
+                with gzip.open(directory / get_pks_name(model), "wt", encoding="utf-8") as stream:
+                    for pk in pks:
+                        stream.write(f"{pk}\n")
+    finally:
+        # Each thread has its own connection
+        connections.close_all()
+
+    return {
+        "model": model._meta.label_lower,
+        "file": get_fixture_name(model),
+        "objects": count,
+        "pks": get_pks_name(model) if incremental else None,
+    }
+
+
+def run_parallel_backup(
+    directory,
+    workers,
+    chunk_size,
+    query_migration_versions,
+    on_part=None,
+    previous=None,
+    overlap=timedelta(0),
+):
+    """
+    Dumps every model to directory with up to workers threads, calling
+    on_part(path) as each file is written, and returns the manifest. Only
+    the changes since the previous backup are dumped when its (name,
+    manifest) is given.
+    """
+    models = get_backup_models()
+    parts = []
+    with transaction.atomic():
+        # The threads read from the snapshot of this transaction, which is
+        # kept open until they finish
+        snapshot = _set_snapshot(None)
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT now()")
+            watermark = cursor.fetchone()[0]
+        migrations = query_migration_versions()
+        if previous is not None and (
+            "watermark" not in previous[1] or previous[1]["migrations"] != migrations
+        ):
+            # Rows of the previous backups may not load with the current schema
+            previous = None
+        since = None
+        if previous is not None:
+            since = datetime.fromisoformat(previous[1]["watermark"]) - overlap
+
+        with ThreadPoolExecutor(workers) as executor:
+            futures = [
+                executor.submit(dump_model, model, directory, snapshot, chunk_size, since)
+                for model in models
+            ]
+            for future in as_completed(futures):
+                part = future.result()
+                parts.append(part)
+                if on_part is not None:
+                    on_part(directory / part["file"])
+                    if part["pks"]:
+                        on_part(directory / part["pks"])
+
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "created_at": datetime.now().isoformat(),
+        "watermark": watermark.isoformat(),
+        "previous": None if previous is None else previous[0],
+        "since": None if since is None else since.isoformat(),
+        "migrations": migrations,
+        "parts": sorted(parts, key=lambda part: part["model"]),
+    }
+    with open(directory / MANIFEST_FILE_NAME, "w") as fp:
+        json.dump(manifest, fp)
+    return manifest
@@ -16,15 +16,23 @@
 import json
 import os
 import traceback
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
 from tempfile import TemporaryDirectory
 
 from django.core import management
-from django.core.management.base import BaseCommand
+from django.core.files.storage import FileSystemStorage
+from django.core.management.base import BaseCommand, CommandError
 from django.db import connection
 
 from ._backup_storage import S3BackupStorage
+from ._parallel_backup import (
+    EXCLUDED_MODELS,
+    MANIFEST_FILE_NAME,
+    list_backups,
+    read_manifest,
+    run_parallel_backup,
+)
 
 
 class Command(BaseCommand):
@@ -32,8 +40,53 @@ class Command(BaseCommand):
 
     help = "Back up database to JSON files"
 
+    # Defaults of the options that only apply to --parallel backups
+    PARALLEL_OPTIONS = {
+        "workers": 4,
+        "chunk_size": 2000,
+        "directory": Path("."),
+        "incremental": False,
+        "overlap_minutes": 60,
+    }
+
     def add_arguments(self, parser):
         parser.add_argument("--s3", action="store_true", help="Store backup in S3 bucket")
+        parser.add_argument(
+            "--parallel",
+            action="store_true",
+            help="Back up each model to its own compressed file, in parallel",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=self.PARALLEL_OPTIONS["workers"],
+            help="Models backed up at the same time (--parallel)",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=self.PARALLEL_OPTIONS["chunk_size"],
+            help="Rows fetched at a time from the database (--parallel)",
+        )
+        parser.add_argument(
+            "-d",
+            "--directory",
+            type=Path,
+            default=self.PARALLEL_OPTIONS["directory"],
+            help="Directory where the backup is written, when not stored in S3 (--parallel)",
+        )
+        parser.add_argument(
+            "--incremental",
+            action="store_true",
+            default=self.PARALLEL_OPTIONS["incremental"],
+            help="Only back up the rows changed since the latest backup (--parallel)",
+        )
+        parser.add_argument(
+            "--overlap-minutes",
+            type=int,
+            default=self.PARALLEL_OPTIONS["overlap_minutes"],
+            help="Also back up the rows changed this long before the latest backup (--incremental)",
+        )
 
     @staticmethod
     def _query_migration_versions():
@@ -59,8 +112,71 @@ class Command(BaseCommand):
         base = "backup_" + datetime.now().isoformat()
         return (base + "_data.json.gz", base + "_migrations.json")
 
+    def _handle_parallel(self, options):
+        backup_name = "backup_" + datetime.now().isoformat()
+        storage = S3BackupStorage() if options["s3"] else None
+
+        previous = None
+        if options["incremental"]:
+            backups_storage = storage or FileSystemStorage(location=options["directory"])
+            if backups := list_backups(backups_storage):
+                previous = (backups[-1], read_manifest(backups_storage, backups[-1]))
+            else:
+                self.stdout.write("No previous backup, backing up everything")
+
+        def store_part(path):
+            if storage is not None:
+                with open(path, "rb") as fp:
+                    storage.save(f"{backup_name}/{path.name}", fp)
+                path.unlink()
+            self.stdout.write(f"Backed up {path.name}")
+
+        with TemporaryDirectory() as tempdir:
+            directory = Path(tempdir) if storage else options["directory"] / backup_name
+            directory.mkdir(parents=True, exist_ok=True)
+            manifest = run_parallel_backup(
+                directory,
+                options["workers"],
+                options["chunk_size"],
+                self._query_migration_versions,
+                on_part=store_part,
+                previous=previous,
+                overlap=timedelta(minutes=options["overlap_minutes"]),
+            )
+            if storage is not None:
+                # Stored last, backups without a manifest are incomplete
+                with open(directory / MANIFEST_FILE_NAME, "rb") as fp:
+                    storage.save(f"{backup_name}/{MANIFEST_FILE_NAME}", fp)
+
+        objects = sum(part["objects"] for part in manifest["parts"])
+        incremental = f", incremental to {manifest['previous']}" if manifest["previous"] else ""
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Backed up {objects} objects of {len(manifest['parts'])} models to {backup_name}"
+                f"{incremental}"
+            )
+        )
+
     def handle(self, *args, **options):
         """Command "main method"."""
+        if not options["parallel"]:
+            ignored = [
+                "--" + name.replace("_", "-")
+                for name, default in self.PARALLEL_OPTIONS.items()
+                if options[name] != default
+            ]
+            if ignored:
+                raise CommandError(f"{', '.join(ignored)} can only be used with --parallel")
+
+        if options["parallel"]:
+            try:
+                self._handle_parallel(options)
+            except Exception:
+                traceback.print_exc()
+                return 1
+            return 0
+
+        tempdir = None
         data_file, migration_file = self._generate_filenames()
         if options["s3"]:
             # don't need to keep local copy if uploaded to bucket
@@ -81,12 +197,7 @@ class Command(BaseCommand):
                 "dumpdata",
                 output=data_file,
                 verbosity=0,
-                exclude=[
-                    "core.BackgroundTask",
-                    "contenttypes.contenttype",
-                    "auth.Permission",
-                    "sessions.Session",
-                ],
+                exclude=EXCLUDED_MODELS,
                 natural_foreign=True,
                 natural_primary=True,
             )
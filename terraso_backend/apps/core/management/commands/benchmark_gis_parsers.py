@@ -0,0 +1,139 @@
+# Copyright © 2026 Technology Matters
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see https://www.gnu.org/licenses/.
+
+import os
+import random
+import statistics
+import tempfile
+import time
+import zipfile
+
+import geopandas as gpd
+from django.core.management.base import BaseCommand
+from shapely.geometry import Polygon
+
+from apps.core.gis.parsers import parse_file_to_geojson
+from apps.core.gis.utils import DEFAULT_CRS
+
+FORMATS = ["kml", "shp", "gpx"]
+
+
+def _random_location():
+    return random.uniform(-120, -70), random.uniform(-50, 50)
+
+
+def _write_kml(path, feature_count):
+    with open(path, "w") as file:
+        file.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        file.write('<kml xmlns="http://www.opengis.net/kml/2.2"><Document>\n')
+        for index in range(feature_count):
+            longitude, latitude = _random_location()
+            file.write(
+                f"<Placemark><name>Placemark {index}</name>"
+                f"<description>Description {index}</description>"
+                f'<ExtendedData><Data name="elevation"><value>{index % 500}</value></Data>'
+                f"</ExtendedData>"
+                f"<Point><coordinates>{longitude},{latitude},0</coordinates></Point>"
+                f"</Placemark>\n"
+            )
+        file.write("</Document></kml>\n")
+
+
+def _write_shapefile_zip(path, feature_count):
+    geometries = []
+    for _ in range(feature_count):
+        longitude, latitude = _random_location()
+        geometries.append(
+            Polygon(
+                [
+                    (longitude, latitude),
+                    (longitude + 0.01, latitude),
+                    (longitude + 0.01, latitude + 0.01),
+                    (longitude, latitude + 0.01),
+                ]
+            )
+        )
+    gdf = gpd.GeoDataFrame(
+        {
+            "name": [f"Area {index}" for index in range(feature_count)],
+            "value": [random.random() for _ in range(feature_count)],
+            "geometry": geometries,
+        },
+        crs=DEFAULT_CRS,
+    )
+
+    with tempfile.TemporaryDirectory() as shapefile_dir:
+        gdf.to_file(os.path.join(shapefile_dir, "benchmark.shp"))
+        with zipfile.ZipFile(path, "w") as zip_file:
+            for file_name in os.listdir(shapefile_dir):
+                zip_file.write(os.path.join(shapefile_dir, file_name), file_name)
+
+
+def _write_gpx(path, feature_count):
+    with open(path, "w") as file:
+        file.write('<?xml version="1.0" standalone="yes"?>\n')
+        file.write('<gpx xmlns="http://www.topografix.com/GPX/1/1" version="1.1">\n')
+        for index in range(feature_count):
+            longitude, latitude = _random_location()
+            file.write(
+                f'<wpt lat="{latitude}" lon="{longitude}"><ele>{index % 500}</ele>'
+                f"<time>2024-01-01T00:00:00Z</time><name>Waypoint {index}</name></wpt>\n"
+            )
+        file.write("</gpx>\n")
+
+
+FIXTURE_WRITERS = {
+    "kml": ("benchmark.kml", _write_kml),
+    "shp": ("benchmark.zip", _write_shapefile_zip),
+    "gpx": ("benchmark.gpx", _write_gpx),
+}
+
+
+class Command(BaseCommand):
+    help = "Time parse_file_to_geojson on large generated KML, shapefile and GPX files"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--features", type=int, default=20000)
+        parser.add_argument("--repeat", type=int, default=3)
+        parser.add_argument("--formats", nargs="+", choices=FORMATS, default=FORMATS)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        feature_count = options["features"]
+        random.seed(options["seed"])
+
+        with tempfile.TemporaryDirectory() as fixtures_dir:
+            for file_format in options["formats"]:
+                file_name, write_fixture = FIXTURE_WRITERS[file_format]
+                path = os.path.join(fixtures_dir, file_name)
+                write_fixture(path, feature_count)
+
+                durations = []
+                for _ in range(options["repeat"]):
+                    with open(path, "rb") as file:
+                        started_at = time.perf_counter()
+                        geojson = parse_file_to_geojson(file)
+                        durations.append(time.perf_counter() - started_at)
+
+                parsed_count = len(geojson["features"])
+                median = statistics.median(durations)
+                self.stdout.write(
+                    f"{file_format}: {parsed_count} features, "
+                    f"{os.path.getsize(path) / 1024 / 1024:.1f} MB, "
+                    f"min {min(durations):.3f}s, median {median:.3f}s, "
+                    f"{parsed_count / median:.0f} features/s"
+                )
+
+        self.stdout.write(self.style.SUCCESS("Benchmark finished"))
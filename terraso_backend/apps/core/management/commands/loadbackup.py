@@ -13,9 +13,11 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program. If not, see https://www.gnu.org/licenses/.
 
+import gzip
 import json
 import os
 import re
+from itertools import batched
 from pathlib import Path
 from tempfile import mkstemp
 from urllib.parse import urlsplit, urlunsplit
@@ -25,8 +27,10 @@ from django.apps import apps
 from django.conf import settings
 from django.contrib.sessions.models import Session
 from django.core import management
+from django.core.files.storage import FileSystemStorage
 from django.core.management.base import BaseCommand, CommandError
 from django.db import connection
+from django.db.models import Q
 from django.db.models.fields import URLField
 from django.db.models.fields.related import ForeignKey, ManyToManyField
 from psycopg import sql
@@ -34,6 +38,14 @@ from psycopg import sql
 from apps.core.models import User
 
 from ._backup_storage import S3BackupStorage
+from ._parallel_backup import (
+    EXCLUDED_MODELS,
+    FIXTURE_SUFFIX,
+    MANIFEST_FILE_NAME,
+    PKS_SUFFIX,
+    get_backup_chain,
+    list_backups,
+)
 
 logger = structlog.get_logger(__name__)
 
@@ -70,10 +82,29 @@ class Command(BaseCommand):
         parser.add_argument(
             "--save-session", help="Primary key of session data that should be saved."
         )
+        parser.add_argument(
+            "--only-rewrite-urls",
+            action="store_true",
+            help="Don't load a backup, only point the URLs in the database at this instance.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report the URLs that would be rewritten without saving them"
+            " (--only-rewrite-urls).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Objects whose URLs are rewritten at a time.",
+        )
 
     @staticmethod
     def _convert_url(url, patterns):
         url_parts = urlsplit(url)
+        if not url_parts.hostname:
+            return
         matches = [new_url for new_url, pattern in patterns if pattern.match(url_parts.hostname)]
         if not matches:
             return
@@ -93,25 +124,57 @@ class Command(BaseCommand):
             patterns.append((dest_host, source_host))
         return patterns
 
-    @classmethod
-    def _rewrite_urls(cls, patterns):
-        models = apps.get_models()
-        for model in models:
+    def _rewrite_urls(self, patterns, batch_size, dry_run=False):
+        """
+        Points the URLs of the restored objects at the destination host.
+
+        Only the rows with URLs that may match are read, and the ones rewritten
+        are updated in batches with bulk_update, without saving each object.
+        Returns the number of objects rewritten.
+        """
+        verb = "Would rewrite" if dry_run else "Rewrote"
+        total = 0
+        for model in apps.get_models():
+            if not model._meta.managed or model._meta.proxy:
+                continue
             url_fields = [
-                field for field in model._meta.get_fields() if isinstance(field, URLField)
+                field.attname
+                for field in model._meta.concrete_fields
+                if isinstance(field, URLField)
             ]
             if not url_fields:
                 continue
-            objects = model.objects.all().only(*[field.name for field in url_fields])
-            for obj in objects:
-                for field in url_fields:
-                    url = getattr(obj, field.name)
-                    if not url:
-                        continue
-                    if new_url := cls._convert_url(url, patterns):
-                        setattr(obj, field.name, new_url)
-                if not obj.clean():
-                    obj.save()
+
+            # A superset of the URLs with matching hostnames, checked by _convert_url
+            may_match = Q()
+            for field in url_fields:
+                for _new_host, pattern in patterns:
+                    may_match |= Q(**{f"{field}__iregex": pattern.pattern})
+            # Including soft deleted objects, which can be restored
+            rows = (
+                model._base_manager.filter(may_match)
+                .order_by()
+                .values_list("pk", *url_fields)
+                .iterator(chunk_size=batch_size)
+            )
+
+            rewritten = 0
+            for batch in batched(rows, batch_size):
+                objects = []
+                for pk, *urls in batch:
+                    new_urls = [(url and self._convert_url(url, patterns)) or url for url in urls]
+                    if new_urls != urls:
+                        objects.append(model(pk=pk, **dict(zip(url_fields, new_urls))))
+                if objects and not dry_run:
+                    model._base_manager.bulk_update(objects, url_fields)
+                rewritten += len(objects)
+                if objects:
+                    self.stdout.write(f"{verb} URLs of {rewritten} {model._meta.label_lower}")
+            total += rewritten
+
+        logger.info("Rewrote URLs", extra={"objects": total, "dry_run": dry_run})
+        self.stdout.write(self.style.SUCCESS(f"{verb} URLs of {total} objects"))
+        return total
 
     @staticmethod
     def _reset_user_id(old_user_id, new_user_id):
@@ -146,17 +209,65 @@ class Command(BaseCommand):
             connection.commit()
 
     @staticmethod
-    def _find_latest_backup_dir(directory):
+    def _is_newer_backup(backup_dir_name, files):
+        """Whether a backup directory is newer than the latest single file backup"""
+        return len(files) < 2 or backup_dir_name > files[-2].split("/")[-1]
+
+    @staticmethod
+    def _get_chain_files(chain, get_file):
+        """
+        Files to load a backup made with backup --parallel, given the (name,
+        manifest) of it and of the backups it's incremental to.
+
+        Returns the (model, fixture) to load in order, so the latest version
+        of each row is the one kept, and the primary keys of each model backed
+        up incrementally, to drop the rows deleted since the full backup.
+        Models are only loaded from their latest full dump on.
+        """
+        first_full = {}
+        for index, (_name, manifest) in enumerate(chain):
+            for part in manifest["parts"]:
+                if not part.get("pks"):
+                    first_full[part["model"]] = index
+
+        fixtures = []
+        for index, (name, manifest) in enumerate(chain):
+            fixtures.extend(
+                (part["model"], get_file(name, part["file"], FIXTURE_SUFFIX))
+                for part in manifest["parts"]
+                if index >= first_full.get(part["model"], 0)
+            )
+        latest_name, latest_manifest = chain[-1]
+        pks_files = {
+            part["model"]: get_file(latest_name, part["pks"], PKS_SUFFIX)
+            for part in latest_manifest["parts"]
+            if part.get("pks")
+        }
+        return fixtures, pks_files
+
+    @classmethod
+    def _find_latest_backup_dir(cls, directory):
         """Find the latest backup in a directory.
 
-        Backups are named according to the date they are created.
+        Backups are named according to the date they are created. Returns the
+        fixtures to load, the file with the migration versions, which is the
+        manifest of backups made with backup --parallel, and the primary key
+        files of incremental backups.
         """
         files = sorted([f for f in directory.glob("backup*") if f.is_file()])
+        backup_dirs = list_backups(FileSystemStorage(location=directory))
+        if backup_dirs and cls._is_newer_backup(backup_dirs[-1], [f.name for f in files]):
+            chain = get_backup_chain(FileSystemStorage(location=directory), backup_dirs[-1])
+            fixtures, pks_files = cls._get_chain_files(
+                chain, lambda name, file, suffix: directory / name / file
+            )
+            return fixtures, directory / backup_dirs[-1] / MANIFEST_FILE_NAME, pks_files
+
         if len(files) < 2:
             raise RuntimeError(f"Couldn't find any backup files in {directory}")
         # default is to sort ascending, so latest files at end
         data_file, migrations_file = files[-2:]
-        return data_file, migrations_file
+        return [(None, data_file)], migrations_file, {}
 
     @staticmethod
     def _copy_s3_file(storage, path, suffix):
@@ -172,13 +283,66 @@ class Command(BaseCommand):
         storage = S3BackupStorage()
         _dirs, files = storage.listdir(".")
         files.sort()
+        backup_dirs = list_backups(storage)
+        if backup_dirs and cls._is_newer_backup(backup_dirs[-1], files):
+            chain = get_backup_chain(storage, backup_dirs[-1])
+            fixtures, pks_files = cls._get_chain_files(
+                chain,
+                lambda name, file, suffix: cls._copy_s3_file(storage, f"{name}/{file}", suffix),
+            )
+            manifest_file = cls._copy_s3_file(
+                storage, f"{backup_dirs[-1]}/{MANIFEST_FILE_NAME}", ".json"
+            )
+            return fixtures, manifest_file, pks_files
+
         data_file, migrations_file = [
             cls._copy_s3_file(storage, path, suffix)
             for path, suffix in zip(files[-2:], (".json.gz", ".json"))
         ]
-        return data_file, migrations_file
+        return [(None, data_file)], migrations_file, {}
+
+    @staticmethod
+    def _drop_deleted_rows(fixtures, pks_files):
+        """
+        Copies the fixtures of the models backed up incrementally without the
+        rows missing from the latest backup. Rows deleted since the full
+        backup are then never loaded, so they can't clash with the rows
+        created since with the same unique values. Returns the fixtures to
+        load and the copies made.
+        """
+        copies = {}
+        for label, pks_file in pks_files.items():
+            with gzip.open(pks_file, "rt", encoding="utf-8") as fp:
+                pks = {line.rstrip("\n") for line in fp}
+            for model, fixture in fixtures:
+                if model != label:
+                    continue
+                _, copy = mkstemp(suffix=FIXTURE_SUFFIX)
+                dropped = 0
+                with (
+                    gzip.open(fixture, "rt", encoding="utf-8") as source,
+                    gzip.open(copy, "wt", encoding="utf-8", compresslevel=1) as target,
+                ):
+                    for line in source:
+                        if line.strip() and str(json.loads(line)["pk"]) not in pks:
+                            dropped += 1
+                            continue
+                        target.write(line)
+                copies[fixture] = copy
+                if dropped:
+                    logger.info(
+                        "Dropped rows missing from the backup",
+                        extra={"model": label, "fixture": str(fixture), "count": dropped},
+                    )
+        return [copies.get(fixture, fixture) for _model, fixture in fixtures], list(copies.values())
 
     def handle(self, *args, **options):
+        if options["only_rewrite_urls"]:
+            self._rewrite_urls(self._load_config(), options["batch_size"], options["dry_run"])
+            return
+        if options["dry_run"]:
+            raise CommandError("--dry-run can only be used with --only-rewrite-urls")
+
         try:
             if user_id := options.get("save_user"):
                 user = User.objects.get(id=user_id)
@@ -197,19 +361,28 @@ class Command(BaseCommand):
 
         try:
             if options["s3"]:
-                data, migrations_file = self._find_last_backup_s3()
+                fixtures, migrations_file, pks_files = self._find_last_backup_s3()
             else:
-                data, migrations_file = self._find_latest_backup_dir(options["directory"])
+                fixtures, migrations_file, pks_files = self._find_latest_backup_dir(
+                    options["directory"]
+                )
             with open(migrations_file, "rb") as fp:
                 migrations = json.load(fp)
+            if "parts" in migrations:
+                # Manifest of a parallel backup
+                migrations = migrations["migrations"]
+            fixtures_to_load, fixture_copies = self._drop_deleted_rows(fixtures, pks_files)
         except Exception:
             msg = "Failure loading backup files"
             logger.exception(msg)
             raise CommandError(msg)
 
         def cleanup():
+            for path in fixture_copies:
+                os.unlink(path)
             if options["s3"]:
-                for path in data, migrations_file:
+                backup_files = [fixture for _model, fixture in fixtures]
+                for path in [*backup_files, migrations_file, *pks_files.values()]:
                     os.unlink(path)
 
         with connection.cursor() as cursor:
@@ -256,16 +429,15 @@ class Command(BaseCommand):
             # finish off any other projects
             management.call_command("migrate", verbosity=0)
 
+            # Loaded at once, so fixtures of different models can refer to each other, and in
+            # the order of the backups, so the rows changed by incremental backups are updated
             management.call_command(
                 "loaddata",
-                str(data.resolve()) if isinstance(data, Path) else data,
-                exclude=[
-                    "core.BackgroundTask",
-                    "contenttypes.contenttype",
-                    "auth.Permission",
-                    "sessions.Session",
-                    "admin.LogEntry",
+                *[
+                    str(fixture.resolve()) if isinstance(fixture, Path) else fixture
+                    for fixture in fixtures_to_load
                 ],
+                exclude=[*EXCLUDED_MODELS, "admin.LogEntry"],
             )
 
             if user:
@@ -295,7 +467,7 @@ class Command(BaseCommand):
             cleanup()
 
             patterns = self._load_config()
-            self._rewrite_urls(patterns)
+            self._rewrite_urls(patterns, options["batch_size"])
 
         except Exception:
             msg = "Exception triggered in restore"
@@ -0,0 +1,118 @@
+# Copyright © 2026 Technology Matters
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see https://www.gnu.org/licenses/.
+
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Imports the same modules as a web worker does before serving its first request
+STARTUP_SCRIPT = (
+    "import django; django.setup(); "
+    "from django.urls import get_resolver; get_resolver().url_patterns"
+)
+
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( +)(\S+)$")
+
+
+def parse_import_times(output):
+    """(module, self_us, cumulative_us, depth) for each line of python -X importtime output"""
+    imports = []
+    for line in output.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match is None:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        imports.append((module, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return imports
+
+
+class Command(BaseCommand):
+    help = (
+        "Report how long the Django startup imports take, per app module and per "
+        "third party package, to catch heavy dependencies loaded by every worker"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=20, help="Rows per table")
+        parser.add_argument(
+            "--prefix",
+            default="apps.",
+            help="Only list project modules starting with this prefix",
+        )
+        parser.add_argument(
+            "--forbid",
+            nargs="+",
+            default=[],
+            help="Fail if any of these packages is imported at startup, e.g. geopandas fiona",
+        )
+        parser.add_argument(
+            "--max-total-ms",
+            type=float,
+            default=None,
+            help="Fail if the total startup import time exceeds this",
+        )
+
+    def handle(self, *args, **options):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", STARTUP_SCRIPT],
+            env={**os.environ, "DJANGO_SETTINGS_MODULE": settings.SETTINGS_MODULE},
+            capture_output=True,
+            text=True,
+            # Checked below, so the error output of the failed startup is reported
+            check=False,
+        )
+        if result.returncode != 0:
+            raise CommandError(f"Startup failed:\n{result.stderr[-2000:]}")
+
+        imports = parse_import_times(result.stderr)
+        total_ms = sum(self_us for _, self_us, _, _ in imports) / 1000
+
+        app_modules = sorted(
+            (
+                (module, cumulative_us)
+                for module, _, cumulative_us, _ in imports
+                if module.startswith(options["prefix"])
+            ),
+            key=lambda row: row[1],
+            reverse=True,
+        )
+        self.stdout.write(f"Modules starting with {options['prefix']!r} (cumulative):")
+        for module, cumulative_us in app_modules[: options["limit"]]:
+            self.stdout.write(f"  {cumulative_us / 1000:9.1f} ms  {module}")
+
+        # Time spent in each third party package itself, wherever it was imported from
+        package_self_us = defaultdict(int)
+        for module, self_us, _, _ in imports:
+            if not module.startswith(("apps.", "config.")):
+                package_self_us[module.split(".")[0]] += self_us
+        packages = sorted(package_self_us.items(), key=lambda row: row[1], reverse=True)
+        self.stdout.write("Third party packages (self):")
+        for package, self_us in packages[: options["limit"]]:
+            self.stdout.write(f"  {self_us / 1000:9.1f} ms  {package}")
+
+        self.stdout.write(f"Total startup import time: {total_ms:.1f} ms, {len(imports)} modules")
+
+        forbidden = [package for package in options["forbid"] if package in package_self_us]
+        if forbidden:
+            raise CommandError(f"Imported at startup: {', '.join(forbidden)}")
+        if options["max_total_ms"] is not None and total_ms > options["max_total_ms"]:
+            raise CommandError(
+                f"Startup imports took {total_ms:.1f} ms, more than {options['max_total_ms']} ms"
+            )
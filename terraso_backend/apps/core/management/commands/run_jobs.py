@@ -0,0 +1,51 @@
+# Copyright © 2026 Technology Matters
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see https://www.gnu.org/licenses/.
+
+import signal
+
+from django.core.management.base import BaseCommand
+
+from apps.core.jobs import JobWorker
+
+
+class Command(BaseCommand):
+    help = "Run queued background jobs"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=None,
+            help="Jobs run at the same time, JOB_QUEUE_CONCURRENCY by default",
+        )
+        parser.add_argument("--poll-seconds", type=float, default=None)
+        parser.add_argument(
+            "--burst",
+            action="store_true",
+            help="Exit once there are no more due jobs instead of waiting for new ones",
+        )
+
+    def handle(self, *args, **options):
+        worker = JobWorker(concurrency=options["concurrency"], poll_seconds=options["poll_seconds"])
+
+        # Finish the running jobs on deploys instead of leaving them for the stale job check
+        def stop(signum, frame):
+            self.stdout.write("Stopping, waiting for running jobs to finish")
+            worker.stop()
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+
+        worker.run(burst=options["burst"])
@@ -0,0 +1,98 @@
+# Copyright © 2026 Technology Matters
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see https://www.gnu.org/licenses/.
+
+import structlog
+from django.core.management.base import BaseCommand
+
+from apps.core.gis.utils import calculate_geojson_metrics_batch
+from apps.core.models import Landscape
+
+logger = structlog.get_logger(__name__)
+
+METRICS_FIELDS = [
+    "area_scalar_m2",
+    "center_coordinates",
+    "area_bbox",
+    "area_vertex_count",
+    "area_polygon_simplified",
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Calculate the area, centroid, bounding box, vertex count and simplified "
+        "variants of landscape boundaries"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=100)
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Recalculate every landscape, not only the ones missing metrics",
+        )
+
+    def _calculate_metrics(self, landscapes):
+        try:
+            return calculate_geojson_metrics_batch(
+                [landscape.area_polygon for landscape in landscapes]
+            )
+        except Exception as error:
+            if len(landscapes) == 1:
+                logger.error(
+                    "Invalid landscape boundary",
+                    extra={"landscape_id": str(landscapes[0].id), "error": str(error)},
+                )
+                return [None]
+            # Find the invalid boundaries and calculate the rest one by one
+            return [
+                metrics
+                for landscape in landscapes
+                for metrics in self._calculate_metrics([landscape])
+            ]
+
+    def handle(self, *args, **options):
+        landscapes = Landscape.objects.filter(area_polygon__isnull=False).order_by("id")
+        if not options["all"]:
+            landscapes = landscapes.filter(area_vertex_count__isnull=True)
+        landscapes = landscapes.only("id", "area_polygon", *METRICS_FIELDS)
+
+        total_updated = 0
+        total_failed = 0
+        last_id = None
+        while True:
+            batch_queryset = landscapes if last_id is None else landscapes.filter(id__gt=last_id)
+            batch = list(batch_queryset[: options["batch_size"]])
+            if not batch:
+                break
+            last_id = batch[-1].id
+
+            updated = []
+            for landscape, metrics in zip(batch, self._calculate_metrics(batch)):
+                if metrics is None:
+                    total_failed += 1
+                    continue
+                landscape.update_area_polygon_metrics(metrics)
+                updated.append(landscape)
+            Landscape.objects.bulk_update(updated, METRICS_FIELDS)
+
+            total_updated += len(updated)
+            self.stdout.write(f"Updated {total_updated} landscapes")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Updated {total_updated} landscapes successfully, {total_failed} failed"
+            )
+        )
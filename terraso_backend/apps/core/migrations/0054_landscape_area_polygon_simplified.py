@@ -0,0 +1,61 @@
+# Copyright © 2026 Technology Matters
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see https://www.gnu.org/licenses/.
+
+import structlog
+from django.db import migrations, models
+
+from apps.core.gis.utils import calculate_geojson_simplified_levels
+
+logger = structlog.get_logger(__name__)
+
+
+def calculate_simplified_area_polygons(apps, schema_editor):
+    Landscape = apps.get_model("core", "Landscape")
+    missing_simplified = Landscape.objects.filter(
+        area_polygon__isnull=False, area_polygon_simplified__isnull=True
+    ).only("id", "area_polygon")
+
+    batch = []
+    for landscape in missing_simplified.iterator(chunk_size=100):
+        try:
+            landscape.area_polygon_simplified = calculate_geojson_simplified_levels(
+                landscape.area_polygon
+            )
+        except Exception:
+            # Invalid boundary, served at full detail
+            logger.exception(
+                "Error simplifying landscape boundary", extra={"landscape_id": landscape.id}
+            )
+            continue
+        batch.append(landscape)
+        if len(batch) == 100:
+            Landscape.objects.bulk_update(batch, ["area_polygon_simplified"])
+            batch = []
+    Landscape.objects.bulk_update(batch, ["area_polygon_simplified"])
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0053_backgroundtask"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="landscape",
+            name="area_polygon_simplified",
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.RunPython(calculate_simplified_area_polygons),
+    ]
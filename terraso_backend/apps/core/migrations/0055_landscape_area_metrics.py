@@ -0,0 +1,74 @@
+# Copyright © 2026 Technology Matters
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see https://www.gnu.org/licenses/.
+
+from django.db import migrations, models
+
+from apps.core.gis.utils import calculate_geojson_metrics_batch
+
+BATCH_SIZE = 100
+
+
+def _calculate_batch_metrics(batch):
+    try:
+        return calculate_geojson_metrics_batch([landscape.area_polygon for landscape in batch])
+    except Exception:
+        if len(batch) == 1:
+            # Invalid boundary, left for the update_landscape_metrics command to report
+            return [None]
+        return [metrics for landscape in batch for metrics in _calculate_batch_metrics([landscape])]
+
+
+def _update_batch(Landscape, batch):
+    for landscape, metrics in zip(batch, _calculate_batch_metrics(batch)):
+        if metrics is not None:
+            landscape.area_bbox = metrics["bbox"]
+            landscape.area_vertex_count = metrics["vertex_count"]
+    Landscape.objects.bulk_update(batch, ["area_bbox", "area_vertex_count"])
+
+
+def calculate_area_metrics(apps, schema_editor):
+    Landscape = apps.get_model("core", "Landscape")
+    missing_metrics = Landscape.objects.filter(
+        area_polygon__isnull=False, area_vertex_count__isnull=True
+    ).only("id", "area_polygon")
+
+    batch = []
+    for landscape in missing_metrics.iterator(chunk_size=BATCH_SIZE):
+        batch.append(landscape)
+        if len(batch) == BATCH_SIZE:
+            _update_batch(Landscape, batch)
+            batch = []
+    if batch:
+        _update_batch(Landscape, batch)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0054_landscape_area_polygon_simplified"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="landscape",
+            name="area_bbox",
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="landscape",
+            name="area_vertex_count",
+            field=models.IntegerField(blank=True, null=True),
+        ),
+        migrations.RunPython(calculate_area_metrics),
+    ]
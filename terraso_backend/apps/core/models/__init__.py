@@ -15,7 +15,9 @@
 
 from .background_tasks import BackgroundTask
 from .commons import BaseModel, SlugModel
+from .finalized_uploads import FinalizedUpload
 from .groups import Group, GroupAssociation, Membership
+from .jobs import Job
 from .landscapes import Landscape, LandscapeDevelopmentStrategy, LandscapeGroup
 from .shared_resources import SharedResource
 from .taxonomy_terms import TaxonomyTerm
@@ -23,8 +25,10 @@ from .users import User, UserPreference
 
 __all__ = [
     "BackgroundTask",
+    "FinalizedUpload",
     "Group",
     "GroupAssociation",
+    "Job",
     "Landscape",
     "LandscapeGroup",
     "LandscapeDevelopmentStrategy",
@@ -0,0 +1,33 @@
+# Copyright © 2026 Technology Matters
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see https://www.gnu.org/licenses/.
+
+from django.db import models
+from safedelete.models import HARD_DELETE
+
+from .commons import BaseModel
+
+
+class FinalizedUpload(BaseModel):
+    """
+    Direct uploads already finalized, see apps.storage.direct_uploads. The id
+    is the one of the upload token, so each token is only used once.
+    """
+
+    _safedelete_policy = HARD_DELETE
+
+    path = models.CharField(max_length=1024)
+
+    def __str__(self):
+        return self.path
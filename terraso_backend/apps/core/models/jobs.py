@@ -0,0 +1,65 @@
+# Copyright © 2026 Technology Matters
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see https://www.gnu.org/licenses/.
+
+from django.db import models
+from django.utils import timezone
+from safedelete.models import HARD_DELETE
+
+from .commons import BaseModel
+
+
+class Job(BaseModel):
+    """
+    Background work stored in the database, so it survives restarts and
+    deploys. Jobs are enqueued with apps.core.jobs.enqueue and run by the
+    run_jobs management command.
+    """
+
+    _safedelete_policy = HARD_DELETE
+
+    class Status(models.TextChoices):
+        QUEUED = "queued"
+        RUNNING = "running"
+        SUCCEEDED = "succeeded"
+        FAILED = "failed"
+
+    # Dotted path of the function to run
+    task = models.CharField(max_length=255)
+    args = models.JSONField(default=list, blank=True)
+    kwargs = models.JSONField(default=dict, blank=True)
+    # Only one queued job can have the same key, later enqueues reuse it
+    dedupe_key = models.CharField(max_length=255, null=True, blank=True)
+
+    status = models.CharField(max_length=16, choices=Status.choices, default=Status.QUEUED)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=1)
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    locked_by = models.CharField(max_length=255, null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["dedupe_key"],
+                condition=models.Q(status="queued"),
+                name="unique_queued_job_dedupe_key",
+            )
+        ]
+        indexes = [models.Index(fields=["status", "run_after"], name="job_status_run_after")]
+
+    def __str__(self):
+        return f"{self.task} ({self.status})"
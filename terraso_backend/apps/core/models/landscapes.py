@@ -20,8 +20,8 @@ from django.db import models, transaction
 
 from apps.core import permission_rules as perm_rules
 from apps.core.gis.utils import (
-    calculate_geojson_centroid,
-    calculate_geojson_feature_area,
+    calculate_geojson_metrics,
+    calculate_geojson_simplified_levels,
 )
 from apps.core.landscape_collaboration_roles import ROLE_MANAGER
 from apps.core.models.taxonomy_terms import TaxonomyTerm
@@ -54,8 +54,13 @@ class Landscape(SlugModel, DirtyFieldsMixin):
     website = models.URLField(max_length=500, blank=True, default="")
     location = models.CharField(max_length=128, blank=True, default="")
     area_polygon = models.JSONField(blank=True, null=True)
+    # Simplified area_polygon keyed by level of detail, see calculate_geojson_simplified_levels
+    area_polygon_simplified = models.JSONField(blank=True, null=True)
     email = models.EmailField(blank=True, default="")
     area_scalar_m2 = models.FloatField(blank=True, null=True)
+    # [min longitude, min latitude, max longitude, max latitude] of area_polygon
+    area_bbox = models.JSONField(blank=True, null=True)
+    area_vertex_count = models.IntegerField(blank=True, null=True)
 
     created_by = models.ForeignKey(
         User,
@@ -114,11 +119,8 @@ class Landscape(SlugModel, DirtyFieldsMixin):
 
     def save(self, *args, **kwargs):
         dirty_fields = self.get_dirty_fields()
-        if self.area_polygon and "area_polygon" in dirty_fields:
-            area_scalar_m2 = calculate_geojson_feature_area(self.area_polygon)
-            if area_scalar_m2 is not None:
-                self.area_scalar_m2 = round(area_scalar_m2, 3)
-            self.center_coordinates = calculate_geojson_centroid(self.area_polygon)
+        if "area_polygon" in dirty_fields:
+            self.update_area_polygon_metrics()
 
         with transaction.atomic():
             from apps.collaboration.models import Membership, MembershipList
@@ -136,6 +138,27 @@ class Landscape(SlugModel, DirtyFieldsMixin):
 
             super().save(*args, **kwargs)
 
+    def update_area_polygon_metrics(self, metrics=None):
+        """
+        Sets the fields derived from area_polygon. metrics can be passed in when
+        they were already calculated with calculate_geojson_metrics_batch.
+        """
+        if not self.area_polygon:
+            self.area_bbox = None
+            self.area_vertex_count = None
+            self.area_polygon_simplified = None
+            return
+
+        if metrics is None:
+            metrics = calculate_geojson_metrics(self.area_polygon)
+        self.area_scalar_m2 = metrics["area_scalar_m2"]
+        self.center_coordinates = metrics["center_coordinates"]
+        self.area_bbox = metrics["bbox"]
+        self.area_vertex_count = metrics["vertex_count"]
+        self.area_polygon_simplified = calculate_geojson_simplified_levels(
+            self.area_polygon, vertex_count=metrics["vertex_count"]
+        )
+
     def delete(self, *args, **kwargs):
         membership_list = self.membership_list
 
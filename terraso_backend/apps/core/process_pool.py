@@ -0,0 +1,171 @@
+# Copyright © 2026 Technology Matters
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see https://www.gnu.org/licenses/.
+
+"""Bounded pool of long-lived worker processes with per-call timeouts.
+
+Unlike concurrent.futures.ProcessPoolExecutor, a call that exceeds its timeout
+is cancelled by killing the worker process running it (and spawning a
+replacement later), so a single runaway call can't keep a worker busy forever
+or take the rest of the pool down with it.
+
+Functions (and their arguments and results) must be picklable, so they have
+to be defined at module level in a module that can be imported without
+setting up Django.
+"""
+
+import atexit
+import multiprocessing
+import threading
+import time
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+
+class WorkerTimeout(Exception):
+    pass
+
+
+class WorkerCrashed(Exception):
+    pass
+
+
+def _worker_main(connection, initializer, initargs):
+    if initializer is not None:
+        initializer(*initargs)
+
+    while True:
+        try:
+            task = connection.recv()
+        except (EOFError, KeyboardInterrupt):
+            break
+        if task is None:
+            break
+
+        func, args, kwargs = task
+        try:
+            result = ("ok", func(*args, **kwargs))
+        except Exception as error:
+            result = ("error", error)
+
+        try:
+            connection.send(result)
+        except Exception as error:
+            # The result or the exception could not be pickled
+            connection.send(("error", RuntimeError(f"Unpicklable worker result: {error!r}")))
+
+
+class _Worker:
+    def __init__(self, context, initializer, initargs):
+        self.connection, child_connection = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main, args=(child_connection, initializer, initargs), daemon=True
+        )
+        self.process.start()
+        child_connection.close()
+
+    def is_alive(self):
+        return self.process.is_alive()
+
+    def stop(self):
+        try:
+            self.connection.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout=1)
+        self.kill()
+
+    def kill(self):
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.connection.close()
+
+
+class ProcessWorkerPool:
+    def __init__(self, size, initializer=None, initargs=(), start_method="spawn"):
+        self.size = size
+        self._initializer = initializer
+        self._initargs = initargs
+        self._context = multiprocessing.get_context(start_method)
+        self._slots = threading.BoundedSemaphore(size)
+        self._idle_workers = []
+        self._lock = threading.Lock()
+        atexit.register(self.shutdown)
+
+    def run(self, func, *args, timeout=None, **kwargs):
+        """
+        Runs func(*args, **kwargs) in a worker process and returns its result.
+        Exceptions raised by func are re-raised here. Raises WorkerTimeout if
+        the call (including waiting for a free worker) takes longer than
+        timeout seconds, and WorkerCrashed if the worker process dies.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        if not self._slots.acquire(timeout=timeout):
+            raise WorkerTimeout(f"No worker available after {timeout}s")
+
+        worker = None
+        try:
+            worker = self._get_worker()
+            worker.connection.send((func, args, kwargs))
+
+            remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+            if not worker.connection.poll(remaining):
+                logger.warning(
+                    "Worker process timed out, killing it",
+                    extra={"function": func.__qualname__, "timeout": timeout},
+                )
+                worker.kill()
+                worker = None
+                raise WorkerTimeout(f"{func.__qualname__} did not finish after {timeout}s")
+
+            status, value = worker.connection.recv()
+        except (EOFError, OSError) as error:
+            if worker is not None:
+                worker.kill()
+                worker = None
+            raise WorkerCrashed(f"Worker process running {func.__qualname__} died") from error
+        finally:
+            self._release_worker(worker)
+
+        if status == "error":
+            raise value
+        return value
+
+    def shutdown(self):
+        with self._lock:
+            workers, self._idle_workers = self._idle_workers, []
+        for worker in workers:
+            worker.stop()
+
+    def _get_worker(self):
+        with self._lock:
+            while self._idle_workers:
+                worker = self._idle_workers.pop()
+                if worker.is_alive():
+                    return worker
+                worker.kill()
+        return _Worker(self._context, self._initializer, self._initargs)
+
+    def _release_worker(self, worker):
+        if worker is not None:
+            if worker.is_alive():
+                with self._lock:
+                    self._idle_workers.append(worker)
+            else:
+                worker.kill()
+        self._slots.release()
@@ -21,6 +21,7 @@ from apps.core.views import (
     HealthView,
     ParseGeoFileView,
     check_restore_job_status,
+    circuit_breakers_status,
     create_restore_job,
 )
 
@@ -32,6 +33,7 @@ urlpatterns = [
     path("healthz/", HealthView.as_view(), name="healthz"),
     path("admin/restore", create_restore_job),
     path("admin/restore/jobs/<int:task_id>", check_restore_job_status),
+    path("admin/circuit-breakers", circuit_breakers_status),
     path("gis/parse/", csrf_exempt(ParseGeoFileView.as_view()), name="parse"),
     path(
         "landscapes/<str:slug>/<str:format>",
@@ -38,7 +38,8 @@ from django.views import View
 from django.views.generic.edit import FormView
 
 from apps.auth.mixins import AuthenticationRequiredMixin
-from apps.core.gis.parsers import parse_file_to_geojson
+from apps.core.circuit_breaker import circuit_breaker_stats
+from apps.core.gis.parsing import parse_file_to_geojson
 from apps.core.models import BackgroundTask, Group, Landscape, User
 
 logger = structlog.get_logger(__name__)
@@ -80,6 +81,13 @@ def check_db_access():
     User.objects.count()
 
 
+@staff_member_required
+def circuit_breakers_status(request):
+    if request.method != "GET":
+        return HttpResponseNotAllowed(permitted_methods=["GET"])
+    return JsonResponse({"pid": os.getpid(), "circuitBreakers": circuit_breaker_stats()})
+
+
 @staff_member_required
 def create_restore_job(request):
     if request.method != "POST":
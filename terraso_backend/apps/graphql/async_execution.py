@@ -0,0 +1,75 @@
+# Copyright © 2026 Technology Matters
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see https://www.gnu.org/licenses/.
+
+"""Helpers for running I/O-bound GraphQL resolvers concurrently.
+
+When a query is served by ``TerrasoAsyncGraphQLView``, resolvers decorated
+with ``async_capable`` return an awaitable that runs the original (blocking)
+resolver in a worker thread. GraphQL execution then awaits all of them
+together, so slow upstream calls (soil ID, S3, Mapbox) overlap instead of
+running one after another. Under the regular synchronous view the decorated
+resolvers behave exactly like the undecorated ones.
+
+Async-capable resolvers must return plain values (scalars, JSON or graphene
+object types built from plain data): their results are completed on the event
+loop, where the Django ORM cannot be used.
+"""
+
+import functools
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+from graphql.language import OperationType
+
+ASYNC_EXECUTION_ATTRIBUTE = "graphql_async_execution"
+
+
+def enable_async_execution(request):
+    setattr(request, ASYNC_EXECUTION_ATTRIBUTE, True)
+
+
+def is_async_execution(info):
+    # Mutations keep running synchronously so they stay inside their transaction
+    return (
+        getattr(info.context, ASYNC_EXECUTION_ATTRIBUTE, False)
+        and info.operation.operation == OperationType.QUERY
+    )
+
+
+def _with_db_connection_cleanup(func):
+    # Worker threads are not tied to a request, so Django won't close their
+    # database connections for us when the request finishes.
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        close_old_connections()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            close_old_connections()
+
+    return wrapper
+
+
+def async_capable(resolver):
+    @functools.wraps(resolver)
+    def wrapper(root, info, *args, **kwargs):
+        if not is_async_execution(info):
+            return resolver(root, info, *args, **kwargs)
+
+        return sync_to_async(_with_db_connection_cleanup(resolver), thread_sensitive=False)(
+            root, info, *args, **kwargs
+        )
+
+    return wrapper
@@ -26,15 +26,21 @@ from graphene import relay
 from graphene_django import DjangoObjectType
 
 from apps.collaboration.models import Membership as CollaborationMembership
-from apps.core.gis.parsers import parse_file_to_geojson
 from apps.core.models import Group, Landscape
+from apps.graphql.async_execution import async_capable
 from apps.graphql.exceptions import GraphQLNotAllowedException, GraphQLNotFoundException
-from apps.shared_data.models import DataEntry, VisualizationConfig
-from apps.shared_data.services import data_entry_upload_service
+from apps.shared_data.models import (
+    DataEntry,
+    DataEntryGeoJsonCache,
+    DataEntryPreviewCache,
+    VisualizationConfig,
+)
+from apps.shared_data.tasks import start_cache_data_entry_preview_task
 from apps.story_map.models.story_maps import StoryMap
 
 from .commons import BaseDeleteMutation, BaseWriteMutation, TerrasoConnection
 from .constants import MutationTypes
+from .gis import GeometryLevelOfDetail
 from .shared_resources_mixin import SharedResourcesMixin
 
 logger = structlog.get_logger(__name__)
@@ -76,7 +82,10 @@ class DataEntryFilterSet(django_filters.FilterSet):
 
 class DataEntryNode(DjangoObjectType, SharedResourcesMixin):
     id = graphene.ID(source="pk", required=True)
-    geojson = graphene.JSONString()
+    geojson = graphene.JSONString(level_of_detail=GeometryLevelOfDetail())
+    # Columns, inferred column types, candidate coordinate columns and sample rows of
+    # spreadsheets, see apps.shared_data.datasets
+    preview = graphene.JSONString()
 
     class Meta:
         model = DataEntry
@@ -132,20 +141,34 @@ class DataEntryNode(DjangoObjectType, SharedResourcesMixin):
             .distinct()
         )
 
+    @async_capable
     def resolve_url(self, info):
         if self.entry_type == DataEntry.ENTRY_TYPE_FILE:
             return self.signed_url
         return self.url
 
-    def resolve_geojson(self, info):
+    @async_capable
+    def resolve_geojson(self, info, level_of_detail=None):
         if f".{self.resource_type}" not in settings.DATA_ENTRY_GIS_TYPES.keys():
             return None
-        file = data_entry_upload_service.get_file(self.s3_object_name, "rb")
         try:
-            return parse_file_to_geojson(file)
+            return DataEntryGeoJsonCache.get_geojson(
+                self.s3_object_name, level_of_detail.value if level_of_detail else None
+            )
         except ValidationError:
             return None
 
+    @async_capable
+    def resolve_preview(self, info):
+        if not self.is_dataset_file:
+            return None
+        entry = DataEntryPreviewCache.get_cached(self.s3_object_name)
+        if entry is None:
+            # Reading the file is left to a worker, the preview is available once cached
+            start_cache_data_entry_preview_task(self.s3_object_name, self.resource_type)
+            return None
+        return entry.preview
+
 
 class DataEntryAddMutation(BaseWriteMutation):
     data_entry = graphene.Field(DataEntryNode)
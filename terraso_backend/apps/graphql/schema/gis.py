@@ -19,3 +19,12 @@ import graphene
 class Point(graphene.ObjectType):
     lat = graphene.Float()
     lng = graphene.Float()
+
+
+class GeometryLevelOfDetail(graphene.Enum):
+    """Simplification level of a geometry, FULL being the geometry as uploaded"""
+
+    FULL = "full"
+    HIGH = "high"
+    MEDIUM = "medium"
+    LOW = "low"
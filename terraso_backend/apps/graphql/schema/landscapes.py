@@ -20,10 +20,15 @@ from django.db import transaction
 from django.db.models import Count, Prefetch, Q
 from graphene import relay
 from graphene_django import DjangoObjectType
+from graphql import FragmentSpreadNode, InlineFragmentNode, VariableNode
 
 from apps.collaboration.models import Membership as CollaborationMembership
 from apps.collaboration.models import MembershipList
-from apps.core.gis.utils import m2_to_hectares
+from apps.core.gis.utils import (
+    LEVEL_OF_DETAIL_FULL,
+    get_simplified_geojson,
+    m2_to_hectares,
+)
 from apps.core.models import (
     Group,
     Landscape,
@@ -35,7 +40,7 @@ from apps.graphql.exceptions import GraphQLNotAllowedException
 
 from .commons import BaseDeleteMutation, BaseWriteMutation, TerrasoConnection
 from .constants import MutationTypes
-from .gis import Point
+from .gis import GeometryLevelOfDetail, Point
 from .shared_resources_mixin import SharedResourcesMixin
 
 logger = structlog.get_logger(__name__)
@@ -63,10 +68,45 @@ class LandscapeFilterSet(django_filters.FilterSet):
         )
 
 
+def _get_area_polygon_levels(info):
+    """Levels of detail of the areaPolygon fields selected in the query"""
+    levels = set()
+
+    def visit(selection_set):
+        for selection in selection_set.selections if selection_set else []:
+            if isinstance(selection, FragmentSpreadNode):
+                visit(info.fragments[selection.name.value].selection_set)
+            elif isinstance(selection, InlineFragmentNode):
+                visit(selection.selection_set)
+            elif selection.name.value == "areaPolygon":
+                levels.add(_get_level_of_detail_argument(info, selection))
+            else:
+                visit(selection.selection_set)
+
+    for field_node in info.field_nodes:
+        visit(field_node.selection_set)
+    return levels
+
+
+def _get_level_of_detail_argument(info, field_node):
+    for argument in field_node.arguments:
+        if argument.name.value != "levelOfDetail":
+            continue
+        if isinstance(argument.value, VariableNode):
+            level = info.variable_values.get(argument.value.name.value)
+        else:
+            level = GeometryLevelOfDetail[argument.value.value]
+        if level is not None:
+            return level.value
+    return LEVEL_OF_DETAIL_FULL
+
+
 class LandscapeNode(DjangoObjectType, SharedResourcesMixin):
     id = graphene.ID(source="pk", required=True)
     area_types = graphene.List(graphene.String)
     center_coordinates = graphene.Field(Point)
+    area_polygon = graphene.JSONString(level_of_detail=GeometryLevelOfDetail())
+    area_bbox = graphene.List(graphene.Float)
 
     class Meta:
         model = Landscape
@@ -123,9 +163,17 @@ class LandscapeNode(DjangoObjectType, SharedResourcesMixin):
                 )
             )
 
-            # Fetch all fields from Landscape, except for area_polygon
+            # Fetch all fields from Landscape, except for the area polygons
+            # that aren't requested. Simplified levels fall back to the full
+            # polygon, so it is loaded for them too.
+            levels = _get_area_polygon_levels(info)
+            deferred_fields = []
+            if not levels:
+                deferred_fields.append("area_polygon")
+            if levels <= {LEVEL_OF_DETAIL_FULL}:
+                deferred_fields.append("area_polygon_simplified")
             result = (
-                queryset.defer("area_polygon")
+                queryset.defer(*deferred_fields)
                 .prefetch_related(
                     Prefetch(
                         "membership_list",
@@ -140,6 +188,13 @@ class LandscapeNode(DjangoObjectType, SharedResourcesMixin):
             raise e
         return result
 
+    def resolve_area_polygon(self, info, level_of_detail=None):
+        if level_of_detail is None or level_of_detail.value == LEVEL_OF_DETAIL_FULL:
+            # Without loading the simplified levels, deferred unless requested
+            return self.area_polygon
+        simplified = get_simplified_geojson(self.area_polygon_simplified, level_of_detail.value)
+        return self.area_polygon if simplified is None else simplified
+
     def resolve_area_scalar_ha(self, info):
         area = self.area_scalar_m2
         return None if area is None else round(m2_to_hectares(area), 3)
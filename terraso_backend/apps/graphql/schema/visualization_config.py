@@ -27,11 +27,16 @@ from graphene_django import DjangoObjectType
 from apps.collaboration.models import Membership as CollaborationMembership
 from apps.core.gis.mapbox import get_publish_status
 from apps.core.models import Group, Landscape, SharedResource
+from apps.graphql.async_execution import async_capable
 from apps.graphql.exceptions import GraphQLNotAllowedException
 from apps.graphql.schema.data_entries import DataEntryNode
 from apps.graphql.schema.story_maps import StoryMapNode
 from apps.shared_data.models.data_entries import DataEntry
 from apps.shared_data.models.visualization_config import VisualizationConfig
+from apps.shared_data.visualization_tiles import (
+    get_tiles_url,
+    start_remove_visualization_tiles_task,
+)
 from apps.shared_data.visualization_tileset_tasks import (
     get_geojson_from_data_entry,
     start_create_mapbox_tileset_task,
@@ -100,6 +105,7 @@ class VisualizationConfigNode(DjangoObjectType):
     owner = graphene.Field(OwnerNode)
     data_entry = graphene.Field(DataEntryNode)
     geojson = graphene.JSONString()
+    tiles_url = graphene.String()
 
     class Meta:
         model = VisualizationConfig
@@ -181,6 +187,7 @@ class VisualizationConfigNode(DjangoObjectType):
     def resolve_data_entry(self, info):
         return self.data_entry
 
+    @async_capable
     def resolve_mapbox_tileset_id(self, info):
         if self.mapbox_tileset_id is None:
             return None
@@ -196,6 +203,7 @@ class VisualizationConfigNode(DjangoObjectType):
 
         return self.mapbox_tileset_id
 
+    @async_capable
     def resolve_geojson(self, info):
         if (
             self.mapbox_tileset_id is not None
@@ -205,6 +213,9 @@ class VisualizationConfigNode(DjangoObjectType):
 
         return get_geojson_from_data_entry(self.data_entry, self)
 
+    def resolve_tiles_url(self, info):
+        return get_tiles_url(self)
+
 
 class VisualizationConfigAddMutation(BaseWriteMutation):
     visualization_config = graphene.Field(VisualizationConfigNode)
@@ -306,6 +317,8 @@ class VisualizationConfigUpdateMutation(BaseWriteMutation):
 
         # Create mapbox tileset
         start_create_mapbox_tileset_task(result.visualization_config.id)
+        # Tiles of the previous version are no longer served
+        start_remove_visualization_tiles_task(result.visualization_config.id)
 
         return cls(visualization_config=result.visualization_config)
 
@@ -334,5 +347,6 @@ class VisualizationConfigDeleteMutation(BaseDeleteMutation):
 
         # Delete mapbox tileset
         start_remove_mapbox_tileset_task(visualization_config.mapbox_tileset_id)
+        start_remove_visualization_tiles_task(visualization_config.id)
 
         return super().mutate_and_get_payload(root, info, **kwargs)
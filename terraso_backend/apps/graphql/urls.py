@@ -19,17 +19,21 @@ from django.views.decorators.csrf import csrf_exempt
 
 from apps.auth.middleware import auth_optional
 
-from .views import TerrasoGraphQLDocs, TerrasoGraphQLView
+from .views import TerrasoAsyncGraphQLView, TerrasoGraphQLDocs, TerrasoGraphQLView
 
 app_name = "apps.graphql"
 
+graphql_view_class = (
+    TerrasoAsyncGraphQLView if settings.GRAPHQL_ASYNC_EXECUTION else TerrasoGraphQLView
+)
+
 urlpatterns = [
     path("docs", TerrasoGraphQLDocs.as_view()),
 ]
 
 if settings.DEBUG:
     urlpatterns.append(
-        path("", csrf_exempt(auth_optional(TerrasoGraphQLView.as_view(graphiql=True))))
+        path("", csrf_exempt(auth_optional(graphql_view_class.as_view(graphiql=True))))
     )
 else:
-    urlpatterns.append(path("", csrf_exempt(auth_optional(TerrasoGraphQLView.as_view()))))
+    urlpatterns.append(path("", csrf_exempt(auth_optional(graphql_view_class.as_view()))))
@@ -13,16 +13,47 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program. If not, see https://www.gnu.org/licenses/.
 
+from inspect import isawaitable
+
+from asgiref.sync import async_to_sync, sync_to_async
 from django.views.generic import TemplateView
 from graphene_django.views import GraphQLView
 
 from apps.auth.mixins import AuthenticationRequiredMixin
 
+from .async_execution import enable_async_execution
+
 
 class TerrasoGraphQLView(AuthenticationRequiredMixin, GraphQLView):
     def get_auth_enabled(self):
         return False
 
 
+class TerrasoAsyncGraphQLView(TerrasoGraphQLView):
+    """
+    GraphQL view for ASGI deployments. Regular resolvers still run
+    synchronously in the request thread, while resolvers marked with
+    `async_capable` are awaited together on the event loop, so slow upstream
+    calls made by a single query overlap.
+    """
+
+    view_is_async = True
+
+    async def dispatch(self, request, *args, **kwargs):
+        enable_async_execution(request)
+        return await sync_to_async(super().dispatch)(request, *args, **kwargs)
+
+    def execute_graphql_request(self, *args, **kwargs):
+        result = super().execute_graphql_request(*args, **kwargs)
+        if isawaitable(result):
+            # Hand the pending resolvers back to the event loop and wait for them
+            result = async_to_sync(self._await_execution_result)(result)
+        return result
+
+    @staticmethod
+    async def _await_execution_result(result):
+        return await result
+
+
 class TerrasoGraphQLDocs(TemplateView):
     template_name = "docs.html"
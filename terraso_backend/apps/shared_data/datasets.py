@@ -0,0 +1,182 @@
+# Copyright © 2026 Technology Matters
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see https://www.gnu.org/licenses/.
+
+"""Reading of spreadsheet (CSV and Excel) data entries, and their previews.
+
+A preview holds the header, the inferred type of each column, the columns
+that could be the coordinates of the rows and a sample of rows. It's
+computed from the first DATA_ENTRY_PREVIEW_ROWS rows, so clients can
+configure visualizations without downloading the whole file.
+"""
+
+import csv
+import re
+from contextlib import contextmanager
+from datetime import datetime
+from itertools import islice
+from zipfile import BadZipFile
+
+from django.conf import settings
+
+from .services import data_entry_upload_service
+
+COLUMN_TYPE_NUMBER = "number"
+COLUMN_TYPE_BOOLEAN = "boolean"
+COLUMN_TYPE_DATE = "date"
+COLUMN_TYPE_TEXT = "text"
+COLUMN_TYPE_EMPTY = "empty"
+
+BOOLEAN_VALUES = {"true", "false", "yes", "no"}
+
+# Column names (lowercase letters only) usually given to coordinates
+LATITUDE_COLUMN_NAMES = {"lat", "latitude", "latitud", "latdd", "decimallatitude", "y"}
+LONGITUDE_COLUMN_NAMES = {
+    "lon",
+    "lng",
+    "long",
+    "longitude",
+    "longitud",
+    "londd",
+    "decimallongitude",
+    "x",
+}
+
+
+class InvalidSpreadsheetError(Exception):
+    """The file can't be read as a spreadsheet of its type"""
+
+
+@contextmanager
+def _parse_errors(*errors):
+    try:
+        yield
+    except errors as error:
+        raise InvalidSpreadsheetError(str(error)) from error
+
+
+def iter_rows(object_name, resource_type):
+    """
+    Rows of a spreadsheet, header first, read incrementally from storage.
+    Raises InvalidSpreadsheetError when the file can't be parsed, errors
+    reading it from storage are raised as they are.
+    """
+    if resource_type.startswith("csv"):
+        with data_entry_upload_service.get_file(object_name, "rt") as file:
+            with _parse_errors(csv.Error, UnicodeDecodeError):
+                yield from csv.reader(file)
+    elif resource_type == "xlsx":
+        from openpyxl import load_workbook
+        from openpyxl.utils.exceptions import InvalidFileException
+
+        with data_entry_upload_service.get_file(object_name, "rb") as file:
+            with _parse_errors(BadZipFile, InvalidFileException, KeyError, ValueError):
+                workbook = load_workbook(file, read_only=True, data_only=True)
+                try:
+                    for row in workbook.worksheets[0].iter_rows(values_only=True):
+                        yield [None if value is None else str(value) for value in row]
+                finally:
+                    workbook.close()
+    elif resource_type.startswith("xls"):
+        # The legacy binary format can't be read incrementally
+        import pandas
+
+        with data_entry_upload_service.get_file(object_name, "rb") as file:
+            with _parse_errors(ValueError):
+                df = pandas.read_excel(file, dtype=str)
+        yield df.columns.tolist()
+        yield from df.values.tolist()
+    else:
+        raise ValueError(f"Invalid spreadsheet file type: {resource_type}")
+
+
+def iter_rows_from_file(data_entry):
+    return iter_rows(data_entry.s3_object_name, data_entry.resource_type)
+
+
+def _is_empty(value):
+    return value is None or (isinstance(value, float) and value != value) or not str(value).strip()
+
+
+def _is_number(value):
+    try:
+        float(value)
+    except (TypeError, ValueError):
+        return False
+    return True
+
+
+def _is_date(value):
+    try:
+        datetime.fromisoformat(str(value).strip())
+    except ValueError:
+        return False
+    return True
+
+
+def get_column_type(values):
+    values = [value for value in values if not _is_empty(value)]
+    if not values:
+        return COLUMN_TYPE_EMPTY
+    if all(_is_number(value) for value in values):
+        return COLUMN_TYPE_NUMBER
+    if all(str(value).strip().lower() in BOOLEAN_VALUES for value in values):
+        return COLUMN_TYPE_BOOLEAN
+    if all(_is_date(value) for value in values):
+        return COLUMN_TYPE_DATE
+    return COLUMN_TYPE_TEXT
+
+
+def _get_coordinate_columns(columns, values_per_column, names, limit):
+    """Numeric columns within the coordinate limit, the usually named first"""
+    candidates = [
+        column["name"]
+        for column, values in zip(columns, values_per_column)
+        if column["type"] == COLUMN_TYPE_NUMBER
+        and all(abs(float(value)) <= limit for value in values if not _is_empty(value))
+    ]
+    return sorted(
+        candidates, key=lambda name: re.sub(r"[^a-z]", "", str(name).lower()) not in names
+    )
+
+
+def get_dataset_preview(rows):
+    """Preview of a spreadsheet from its rows, header first (see module docstring)"""
+    rows = iter(rows)
+    header = next(rows, None)
+    if header is None:
+        return None
+    header = ["" if name is None else str(name) for name in header]
+
+    inspected = [
+        [None if _is_empty(value) else value for value in row[: len(header)]]
+        for row in islice(rows, settings.DATA_ENTRY_PREVIEW_ROWS)
+    ]
+    values_per_column = [
+        [row[index] for row in inspected if index < len(row)] for index in range(len(header))
+    ]
+    columns = [
+        {"name": name, "type": get_column_type(values)}
+        for name, values in zip(header, values_per_column)
+    ]
+    return {
+        "columns": columns,
+        "latitudeColumns": _get_coordinate_columns(
+            columns, values_per_column, LATITUDE_COLUMN_NAMES, 90
+        ),
+        "longitudeColumns": _get_coordinate_columns(
+            columns, values_per_column, LONGITUDE_COLUMN_NAMES, 180
+        ),
+        "sampleRows": inspected[: settings.DATA_ENTRY_PREVIEW_SAMPLE_ROWS],
+    }
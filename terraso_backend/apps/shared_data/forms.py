@@ -22,7 +22,9 @@ from django import forms
 from django.conf import settings
 from django.core.exceptions import ValidationError
 
-from apps.core.gis.parsers import is_shape_file_zip
+from apps.core.gis.file_types import is_shape_file_zip
+from apps.core.gis.parsing import parse_file_to_geojson
+from apps.storage.upload_handlers import MIME_SNIFF_SIZE
 
 from .models import DataEntry
 from .services import data_entry_upload_service
@@ -31,6 +33,40 @@ mimetypes.init()
 logger = structlog.get_logger(__name__)
 
 
+def validate_file_content_type(file_name, file_mime_type):
+    """Checks the file extension is accepted and matches the MIME type sniffed from the content"""
+    file_extension = pathlib.Path(file_name).suffix
+    extensions_for_mimetype = mimetypes.guess_all_extensions(file_mime_type)
+
+    if file_extension not in settings.DATA_ENTRY_ACCEPTED_TYPES.keys():
+        raise ValidationError(file_extension[1:], code="invalid_not_accepted_extension")
+
+    is_valid_extension_for_mimetype = (
+        file_mime_type and extensions_for_mimetype and file_extension in extensions_for_mimetype
+    )
+
+    allowed_types = settings.DATA_ENTRY_ACCEPTED_TYPES[file_extension]
+    if allowed_types and file_mime_type not in allowed_types:
+        raise ValidationError(file_extension[1:], code="invalid_extension")
+
+    if not allowed_types and not is_valid_extension_for_mimetype:
+        raise ValidationError(file_extension[1:], code="invalid_extension")
+
+
+def validate_file_type(data_file):
+    """
+    Checks the file extension is accepted and matches the content. Only reads
+    the start of the file, and the central directory of zip files.
+    """
+    file_mime_type = magic.from_buffer(data_file.read(MIME_SNIFF_SIZE), mime=True)
+    validate_file_content_type(data_file.name, file_mime_type)
+
+    # Shapefile validation
+    file_extension = pathlib.Path(data_file.name).suffix
+    if file_extension == ".zip" and not is_shape_file_zip(data_file):
+        raise ValidationError(file_extension[1:], code="invalid_shapefile")
+
+
 class DataEntryForm(forms.ModelForm):
     data_file = forms.FileField()
     # TODO: Remove assume_scheme='https' when Django 6.0 is released.
@@ -39,6 +75,9 @@ class DataEntryForm(forms.ModelForm):
     resource_type = forms.CharField(max_length=255, required=False)
     size = forms.IntegerField(required=False)
 
+    # Set by validate_file for GIS files
+    geojson = None
+
     class Meta:
         model = DataEntry
         fields = (
@@ -53,27 +92,14 @@ class DataEntryForm(forms.ModelForm):
         )
 
     def validate_file(self, data_file):
-        file_extension = pathlib.Path(data_file.name).suffix
-        file_mime_type = magic.from_buffer(data_file.read(2048), mime=True)
-        extensions_for_mimetype = mimetypes.guess_all_extensions(file_mime_type)
-
-        if file_extension not in settings.DATA_ENTRY_ACCEPTED_TYPES.keys():
-            raise ValidationError(file_extension[1:], code="invalid_not_accepted_extension")
-
-        is_valid_extension_for_mimetype = (
-            file_mime_type and extensions_for_mimetype and file_extension in extensions_for_mimetype
-        )
+        validate_file_type(data_file)
 
-        allowed_types = settings.DATA_ENTRY_ACCEPTED_TYPES[file_extension]
-        if allowed_types and file_mime_type not in allowed_types:
-            raise ValidationError(file_extension[1:], code="invalid_extension")
-
-        if not allowed_types and not is_valid_extension_for_mimetype:
-            raise ValidationError(file_extension[1:], code="invalid_extension")
-
-        # Shapefile validation
-        if file_extension == ".zip" and not is_shape_file_zip(data_file):
-            raise ValidationError(file_extension[1:], code="invalid_shapefile")
+        file_extension = pathlib.Path(data_file.name).suffix
+        if file_extension in settings.DATA_ENTRY_GIS_TYPES.keys():
+            try:
+                self.geojson = parse_file_to_geojson(data_file)
+            except ValidationError as error:
+                raise ValidationError(file_extension[1:], code=error.message)
 
     def clean_data_file(self):
         data_file = self.cleaned_data["data_file"]
@@ -103,3 +129,23 @@ class DataEntryForm(forms.ModelForm):
                 raise ValidationError(error_msg, code="error")
 
         return data
+
+
+class DirectUploadDataEntryForm(forms.ModelForm):
+    """Data entry of a file the client uploaded to storage, see apps.storage.direct_uploads"""
+
+    # TODO: Remove assume_scheme='https' when Django 6.0 is released.
+    # At that point, https will be the default.
+    url = forms.URLField(assume_scheme="https")
+
+    class Meta:
+        model = DataEntry
+        fields = (
+            "name",
+            "description",
+            "entry_type",
+            "resource_type",
+            "size",
+            "url",
+            "created_by",
+        )
@@ -13,20 +13,59 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program. If not, see https://www.gnu.org/licenses/.
 
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
 from django.core.management.base import BaseCommand
+from django.db import connections
 from django.utils import timezone
 
 from apps.shared_data.models import DataEntry
 
 
 class Command(BaseCommand):
+    help = "Remove the files of data entries deleted more than --days ago from storage"
+
     def add_arguments(self, parser):
         parser.add_argument("--days", type=int, default=7)
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Files removed with each storage request and database update",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=4,
+            help="Batches removed at the same time",
+        )
+
+    def _iter_batches(self, data_entries, batch_size):
+        # Entries sharing a file are kept in the same batch, so the file is
+        # removed with the last of them (see DataEntry.delete_files_on_storage)
+        batch = []
+        for data_entry in data_entries:
+            if len(batch) >= batch_size and data_entry.url != batch[-1].url:
+                yield batch
+                batch = []
+            batch.append(data_entry)
+        if batch:
+            yield batch
+
+    def _remove_batch(self, batch):
+        try:
+            return batch, DataEntry.delete_files_on_storage(batch)
+        finally:
+            connections.close_all()
 
     def handle(self, *args, **kwargs):
         past_days = kwargs.get("days")
+        concurrency = max(kwargs["concurrency"], 1)
 
         total_files_removed = 0
+        total_failed = 0
+        started = time.monotonic()
         older_than_date = timezone.now() - timezone.timedelta(days=past_days)
         data_entries = (
             DataEntry.objects.deleted_only()
@@ -34,16 +73,40 @@ class Command(BaseCommand):
                 deleted_at__date__lt=older_than_date,
                 file_removed_at__isnull=True,
             )
+            .only("id", "url", "deleted_at", "file_removed_at")
+            .order_by("url")
             .iterator()
         )
 
-        for data_entry in data_entries:
-            try:
-                data_entry.delete_file_on_storage()
-                total_files_removed += 1
-            except RuntimeError as exc:
-                self.stdout.write(self.style.WARNING(f"Couldn't delete file: {exc}"))
+        def report(batch, failed):
+            nonlocal total_files_removed, total_failed
+            for data_entry, error in failed.items():
+                self.stdout.write(
+                    self.style.WARNING(f"Couldn't delete file of {data_entry.id}: {error}")
+                )
+            total_files_removed += len(batch) - len(failed)
+            total_failed += len(failed)
+            rate = total_files_removed / max(time.monotonic() - started, 0.001)
+            self.stdout.write(f"Removed {total_files_removed} files ({rate:.1f} files/s)")
+
+        batches = self._iter_batches(data_entries, kwargs["batch_size"])
+        if concurrency == 1:
+            for batch in batches:
+                report(batch, DataEntry.delete_files_on_storage(batch))
+        else:
+            running = set()
+            with ThreadPoolExecutor(concurrency) as executor:
+                for batch in batches:
+                    if len(running) >= concurrency:
+                        done, running = wait(running, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            report(*future.result())
+                    running.add(executor.submit(self._remove_batch, batch))
+                for future in wait(running).done:
+                    report(*future.result())
 
         self.stdout.write(
-            self.style.SUCCESS(f"Removed {total_files_removed} successfully"),
+            self.style.SUCCESS(
+                f"Removed {total_files_removed} successfully, {total_failed} failed"
+            ),
         )
@@ -0,0 +1,58 @@
+# Copyright © 2026 Technology Matters
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see https://www.gnu.org/licenses/.
+
+import uuid
+
+import rules.contrib.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("shared_data", "0019_alter_dataentry_created_by_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DataEntryGeoJsonCache",
+            fields=[
+                ("deleted_at", models.DateTimeField(db_index=True, editable=False, null=True)),
+                ("deleted_by_cascade", models.BooleanField(default=False, editable=False)),
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4, editable=False, primary_key=True, serialize=False
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("object_name", models.CharField(max_length=1024)),
+                ("file_version", models.CharField(max_length=64)),
+                ("geojson", models.JSONField(null=True)),
+                ("error_code", models.CharField(max_length=64, null=True)),
+            ],
+            options={
+                "verbose_name": "Data Entry GeoJSON Cache",
+                "verbose_name_plural": "Data Entry GeoJSON Cache",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("object_name", "file_version"),
+                        name="data_entry_geojson_cache_version",
+                    )
+                ],
+            },
+            bases=(rules.contrib.models.RulesModelMixin, models.Model),
+        ),
+    ]
@@ -14,6 +14,13 @@
 # along with this program. If not, see https://www.gnu.org/licenses/.
 
 from .data_entries import DataEntry
+from .data_entry_geojson_cache import DataEntryGeoJsonCache
+from .data_entry_preview_cache import DataEntryPreviewCache
 from .visualization_config import VisualizationConfig
 
-__all__ = ["DataEntry", "VisualizationConfig"]
+__all__ = [
+    "DataEntry",
+    "DataEntryGeoJsonCache",
+    "DataEntryPreviewCache",
+    "VisualizationConfig",
+]
@@ -13,9 +13,11 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program. If not, see https://www.gnu.org/licenses/.
 
+from django.conf import settings
 from django.contrib.contenttypes.fields import GenericRelation
-from django.db import models
+from django.db import models, transaction
 from django.utils import timezone
+from django.utils.http import content_disposition_header
 from django.utils.translation import gettext_lazy as _
 from safedelete.models import SOFT_DELETE
 
@@ -23,9 +25,17 @@ from apps.core.models import BaseModel, SharedResource, User
 from apps.core.models.groups import Group
 from apps.core.models.landscapes import Landscape
 from apps.shared_data import permission_rules as perm_rules
-from apps.shared_data.services import DataEntryFileStorage
+from apps.shared_data.services import (
+    DataEntryFileStorage,
+    data_entry_upload_service,
+    lock_object_names,
+)
+from apps.storage.signed_urls import get_signed_url
 from apps.story_map.models.story_maps import StoryMap
 
+from .data_entry_geojson_cache import DataEntryGeoJsonCache
+from .data_entry_preview_cache import DataEntryPreviewCache
+
 VALID_TARGET_TYPES = [(Group, "group"), (Landscape, "landscape"), (StoryMap, "story_map")]
 
 data_entry_file_storage = DataEntryFileStorage(custom_domain=None)
@@ -101,9 +111,39 @@ class DataEntry(BaseModel):
         object_name = object_name.replace("%20", " ")
         return object_name
 
+    @property
+    def is_gis_file(self):
+        return (
+            self.entry_type == self.ENTRY_TYPE_FILE
+            and f".{self.resource_type}" in settings.DATA_ENTRY_GIS_TYPES.keys()
+        )
+
+    @property
+    def is_dataset_file(self):
+        return (
+            self.entry_type == self.ENTRY_TYPE_FILE
+            and f".{self.resource_type}" in settings.DATA_ENTRY_SPREADSHEET_TYPES.keys()
+        )
+
+    @property
+    def download_file_name(self):
+        suffix = f".{self.resource_type}" if self.resource_type else ""
+        if self.name.lower().endswith(suffix.lower()):
+            return self.name
+        return f"{self.name}{suffix}"
+
     @property
     def signed_url(self):
-        return data_entry_file_storage.url(self.s3_object_name)
+        # Identical uploads share their object, so each entry names its download
+        return get_signed_url(
+            data_entry_file_storage,
+            self.s3_object_name,
+            {
+                "ResponseContentDisposition": content_disposition_header(
+                    True, self.download_file_name
+                )
+            },
+        )
 
     def delete_file_on_storage(self):
         if not self.deleted_at:
@@ -114,10 +154,79 @@ class DataEntry(BaseModel):
         if self.file_removed_at:
             return
 
-        storage = DataEntryFileStorage(custom_domain=None)
-        storage.delete(self.s3_object_name)
-        self.file_removed_at = timezone.now()
-        self.save(keep_deleted=True)
+        # Identical uploads share their storage object (see
+        # DataEntryUploadService), which is kept until no entry needs it
+        with transaction.atomic():
+            lock_object_names([self.s3_object_name])
+            shared = (
+                DataEntry.all_objects.filter(url=self.url, file_removed_at__isnull=True)
+                .exclude(pk=self.pk)
+                .exists()
+            )
+            if not shared:
+                storage = DataEntryFileStorage(custom_domain=None)
+                storage.delete(self.s3_object_name)
+                DataEntryGeoJsonCache.invalidate(self.s3_object_name)
+                DataEntryPreviewCache.invalidate(self.s3_object_name)
+            self.file_removed_at = timezone.now()
+            self.save(keep_deleted=True)
+
+    @classmethod
+    def delete_files_on_storage(cls, data_entries):
+        """
+        delete_file_on_storage for many entries at once, with multi-object
+        storage deletes and a single update of the entries. Returns the
+        entries whose file couldn't be deleted mapped to the error.
+
+        Entries sharing a file should be in the same call, otherwise each
+        call keeps the file for the others.
+        """
+        data_entries = [entry for entry in data_entries if not entry.file_removed_at]
+        for data_entry in data_entries:
+            if not data_entry.deleted_at:
+                raise RuntimeError(
+                    "Storage object cannot be deleted if its DataEntry "
+                    f"({data_entry.id}) is not deleted."
+                )
+        if not data_entries:
+            return {}
+
+        ids = [data_entry.id for data_entry in data_entries]
+        # Locked so identical files uploaded meanwhile are seen as sharing the object
+        with transaction.atomic():
+            lock_object_names({data_entry.s3_object_name for data_entry in data_entries})
+            shared_urls = set(
+                cls.all_objects.filter(
+                    url__in={data_entry.url for data_entry in data_entries},
+                    file_removed_at__isnull=True,
+                )
+                .exclude(pk__in=ids)
+                .values_list("url", flat=True)
+            )
+            object_names = list(
+                dict.fromkeys(
+                    data_entry.s3_object_name
+                    for data_entry in data_entries
+                    if data_entry.url not in shared_urls
+                )
+            )
+            failed_object_names = data_entry_upload_service.delete_files(object_names)
+            deleted_object_names = [
+                name for name in object_names if name not in failed_object_names
+            ]
+            DataEntryGeoJsonCache.invalidate_many(deleted_object_names)
+            DataEntryPreviewCache.invalidate_many(deleted_object_names)
+
+            failed = {
+                data_entry: failed_object_names[data_entry.s3_object_name]
+                for data_entry in data_entries
+                if data_entry.s3_object_name in failed_object_names
+            }
+            now = timezone.now()
+            cls.all_objects.filter(pk__in=ids, file_removed_at__isnull=True).exclude(
+                pk__in=[data_entry.id for data_entry in failed]
+            ).update(file_removed_at=now, updated_at=now)
+        return failed
 
     def to_dict(self):
         return dict(
@@ -0,0 +1,125 @@
+# Copyright © 2026 Technology Matters
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see https://www.gnu.org/licenses/.
+
+from typing import Optional
+
+import structlog
+from django.core.exceptions import ValidationError
+from django.db import models
+from safedelete.models import HARD_DELETE
+
+from apps.core.gis.parsing import TRANSIENT_ERROR_CODES, parse_file_to_geojson
+from apps.core.gis.utils import calculate_geojson_simplified_levels, get_simplified_geojson
+from apps.core.models import BaseModel
+from apps.shared_data.services import data_entry_upload_service
+
+logger = structlog.get_logger(__name__)
+
+
+class DataEntryGeoJsonCache(BaseModel):
+    """
+    GeoJSON parsed from a GIS data entry file, so each version of a file is
+    only downloaded and parsed once. Files that fail to parse store the
+    validation error code instead, unless the parsing worker timed out or
+    crashed.
+    """
+
+    _safedelete_policy = HARD_DELETE
+
+    object_name = models.CharField(max_length=1024)
+    file_version = models.CharField(max_length=64)
+
+    geojson = models.JSONField(null=True)
+    # Simplified geojson keyed by level of detail, see calculate_geojson_simplified_levels
+    simplified_geojson = models.JSONField(null=True)
+    error_code = models.CharField(max_length=64, null=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["object_name", "file_version"], name="data_entry_geojson_cache_version"
+            )
+        ]
+        verbose_name = "Data Entry GeoJSON Cache"
+        verbose_name_plural = "Data Entry GeoJSON Cache"
+
+    @classmethod
+    def get_geojson(cls, object_name: str, level_of_detail: Optional[str] = None) -> dict:
+        """
+        GeoJSON for the current version of the file, parsing it if it isn't
+        cached yet. Raises ValidationError like parse_file_to_geojson.
+        """
+        file_version = data_entry_upload_service.get_file_version(object_name)
+        entry = cls.objects.filter(object_name=object_name, file_version=file_version).first()
+        if entry is None:
+            entry = cls._parse(object_name, file_version)
+
+        if entry.error_code is not None:
+            raise ValidationError(entry.error_code)
+
+        if level_of_detail and entry.simplified_geojson is None:
+            # Cached before simplification was added
+            entry.simplified_geojson = calculate_geojson_simplified_levels(entry.geojson)
+            entry.save(update_fields=["simplified_geojson", "updated_at"])
+        simplified = get_simplified_geojson(entry.simplified_geojson, level_of_detail)
+        return entry.geojson if simplified is None else simplified
+
+    @classmethod
+    def _parse(cls, object_name: str, file_version: str) -> "DataEntryGeoJsonCache":
+        with data_entry_upload_service.get_file(object_name, "rb") as file:
+            try:
+                geojson, error_code = parse_file_to_geojson(file), None
+            except ValidationError as error:
+                if error.message in TRANSIENT_ERROR_CODES:
+                    # Not cached, the next request tries again
+                    raise
+                geojson, error_code = None, error.message
+
+        return cls.save_geojson(object_name, file_version, geojson=geojson, error_code=error_code)
+
+    @classmethod
+    def save_geojson(
+        cls,
+        object_name: str,
+        file_version: str,
+        geojson: Optional[dict] = None,
+        error_code: Optional[str] = None,
+    ) -> "DataEntryGeoJsonCache":
+        # Older versions of the file are no longer needed
+        cls.objects.filter(object_name=object_name).exclude(file_version=file_version).delete()
+        entry, _ = cls.objects.update_or_create(
+            object_name=object_name,
+            file_version=file_version,
+            defaults={
+                "geojson": geojson,
+                "simplified_geojson": (
+                    None if geojson is None else calculate_geojson_simplified_levels(geojson)
+                ),
+                "error_code": error_code,
+            },
+        )
+        logger.info(
+            "Cached data entry GeoJSON",
+            extra={"object_name": object_name, "file_version": file_version},
+        )
+        return entry
+
+    @classmethod
+    def invalidate(cls, object_name: str):
+        cls.objects.filter(object_name=object_name).delete()
+
+    @classmethod
+    def invalidate_many(cls, object_names):
+        cls.objects.filter(object_name__in=object_names).delete()
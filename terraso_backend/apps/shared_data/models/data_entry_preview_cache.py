@@ -0,0 +1,114 @@
+# Copyright © 2026 Technology Matters
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see https://www.gnu.org/licenses/.
+
+from typing import Optional
+
+import structlog
+from django.db import models
+from safedelete.models import HARD_DELETE
+
+from apps.core.models import BaseModel
+from apps.shared_data.datasets import InvalidSpreadsheetError, get_dataset_preview, iter_rows
+from apps.shared_data.services import data_entry_upload_service
+
+logger = structlog.get_logger(__name__)
+
+CONTENT_ADDRESSED_VERSION = "content-addressed"
+
+
+class DataEntryPreviewCache(BaseModel):
+    """
+    Preview of a spreadsheet data entry file (see apps.shared_data.datasets),
+    so each version of a file is only read once. Files that can't be read
+    store an error code instead.
+    """
+
+    _safedelete_policy = HARD_DELETE
+
+    object_name = models.CharField(max_length=1024)
+    file_version = models.CharField(max_length=64)
+
+    preview = models.JSONField(null=True)
+    error_code = models.CharField(max_length=64, null=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["object_name", "file_version"], name="data_entry_preview_cache_version"
+            )
+        ]
+        verbose_name = "Data Entry Preview Cache"
+        verbose_name_plural = "Data Entry Preview Cache"
+
+    @classmethod
+    def get_preview(cls, object_name: str, resource_type: str) -> Optional[dict]:
+        """
+        Preview of the current version of the file, reading it if it isn't
+        cached yet. None when the file can't be read.
+        """
+        entry = cls.get_cached(object_name)
+        if entry is None:
+            entry = cls._read(object_name, resource_type, cls._get_file_version(object_name))
+        return entry.preview
+
+    @classmethod
+    def get_cached(cls, object_name: str) -> Optional["DataEntryPreviewCache"]:
+        """Cached preview of the current version of the file, without reading it."""
+        file_version = cls._get_file_version(object_name)
+        return cls.objects.filter(object_name=object_name, file_version=file_version).first()
+
+    @staticmethod
+    def _get_file_version(object_name: str) -> str:
+        # Content addressed files are never replaced, so their name already
+        # identifies the content and storage doesn't have to be asked
+        if data_entry_upload_service.content_addressed:
+            return CONTENT_ADDRESSED_VERSION
+        return data_entry_upload_service.get_file_version(object_name)
+
+    @classmethod
+    def _read(cls, object_name: str, resource_type: str, file_version: str):
+        rows = iter_rows(object_name, resource_type)
+        try:
+            preview, error_code = get_dataset_preview(rows), None
+        except InvalidSpreadsheetError as error:
+            # Storage errors are raised instead, so the caching job is retried
+            logger.warning(
+                "Unable to read data entry preview",
+                extra={"object_name": object_name, "error": str(error)},
+            )
+            preview, error_code = None, "invalid_file"
+        finally:
+            rows.close()
+
+        # Older versions of the file are no longer needed
+        cls.objects.filter(object_name=object_name).exclude(file_version=file_version).delete()
+        entry, _ = cls.objects.update_or_create(
+            object_name=object_name,
+            file_version=file_version,
+            defaults={"preview": preview, "error_code": error_code},
+        )
+        logger.info(
+            "Cached data entry preview",
+            extra={"object_name": object_name, "file_version": file_version},
+        )
+        return entry
+
+    @classmethod
+    def invalidate(cls, object_name: str):
+        cls.objects.filter(object_name=object_name).delete()
+
+    @classmethod
+    def invalidate_many(cls, object_names):
+        cls.objects.filter(object_name__in=object_names).delete()
@@ -14,11 +14,26 @@
 # along with this program. If not, see https://www.gnu.org/licenses/.
 
 from django.conf import settings
+from django.db import connection
 from storages.backends.s3boto3 import S3Boto3Storage
 
 from apps.storage.services import UploadService
 
 
+def lock_object_names(object_names):
+    """
+    Locks the storage objects until the end of the transaction. Uploads hold
+    the lock until their data entry is saved, and the removal of unused files
+    while checking that no entry refers to them and deleting them.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT pg_advisory_xact_lock(hashtextextended(name, 0))"
+            " FROM (SELECT DISTINCT unnest(%s::text[]) AS name ORDER BY 1) AS names",
+            [list(object_names)],
+        )
+
+
 class DataEntryFileStorage(S3Boto3Storage):
     bucket_name = settings.DATA_ENTRY_FILE_S3_BUCKET
 
@@ -26,6 +41,10 @@ class DataEntryFileStorage(S3Boto3Storage):
 class DataEntryUploadService(UploadService):
     storage = DataEntryFileStorage()
     base_url = settings.DATA_ENTRY_FILE_BASE_URL
+    content_addressed = True
+
+    def lock_path(self, path):
+        lock_object_names([path])
 
 
 data_entry_upload_service = DataEntryUploadService()
@@ -0,0 +1,69 @@
+# Copyright © 2026 Technology Matters
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see https://www.gnu.org/licenses/.
+
+import structlog
+from django.core.exceptions import ValidationError
+
+from apps.core.gis.parsing import TRANSIENT_ERROR_CODES
+from apps.core.jobs import enqueue
+
+from .models import DataEntryGeoJsonCache, DataEntryPreviewCache
+from .services import data_entry_upload_service
+
+logger = structlog.get_logger(__name__)
+
+
+def start_cache_data_entry_geojson_task(object_name, geojson=None):
+    if geojson is None:
+        enqueue(
+            cache_data_entry_geojson,
+            object_name,
+            dedupe_key=f"cache_data_entry_geojson:{object_name}",
+        )
+        return
+
+    # Already parsed when the upload was validated, so only needs storing
+    try:
+        DataEntryGeoJsonCache.save_geojson(
+            object_name,
+            data_entry_upload_service.get_file_version(object_name),
+            geojson=geojson,
+        )
+    except Exception:
+        logger.exception("Failed to cache data entry GeoJSON", extra={"object_name": object_name})
+
+
+def cache_data_entry_geojson(object_name):
+    """Parses the file and caches its GeoJSON."""
+    try:
+        DataEntryGeoJsonCache.get_geojson(object_name)
+    except ValidationError as error:
+        # Invalid files are cached with their error code, the job is retried otherwise
+        if error.message in TRANSIENT_ERROR_CODES:
+            raise
+
+
+def start_cache_data_entry_preview_task(object_name, resource_type):
+    enqueue(
+        cache_data_entry_preview,
+        object_name,
+        resource_type,
+        dedupe_key=f"cache_data_entry_preview:{object_name}",
+    )
+
+
+def cache_data_entry_preview(object_name, resource_type):
+    """Reads the first rows of the spreadsheet and caches its preview."""
+    DataEntryPreviewCache.get_preview(object_name, resource_type)
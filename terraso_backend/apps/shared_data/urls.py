@@ -18,15 +18,36 @@ from django.views.decorators.csrf import csrf_exempt
 
 from apps.auth.middleware import auth_optional
 
-from .views import DataEntryFileDownloadView, DataEntryFileUploadView
+from .views import (
+    DataEntryFileDownloadView,
+    DataEntryFileUploadFinalizeView,
+    DataEntryFileUploadTargetView,
+    DataEntryFileUploadView,
+    VisualizationTileView,
+)
 
 app_name = "apps.shared_data"
 
 urlpatterns = [
     path("upload/", csrf_exempt(DataEntryFileUploadView.as_view()), name="upload"),
+    path(
+        "upload/target/",
+        csrf_exempt(DataEntryFileUploadTargetView.as_view()),
+        name="upload-target",
+    ),
+    path(
+        "upload/finalize/",
+        csrf_exempt(DataEntryFileUploadFinalizeView.as_view()),
+        name="upload-finalize",
+    ),
     path(
         "download/<str:shared_resource_uuid>",
         csrf_exempt(auth_optional(DataEntryFileDownloadView.as_view())),
         name="download",
     ),
+    path(
+        "visualizations/<uuid:visualization_id>/tiles/<int:z>/<int:x>/<int:y>.mvt",
+        auth_optional(VisualizationTileView.as_view()),
+        name="visualization-tile",
+    ),
 ]
@@ -13,6 +13,7 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program. If not, see https://www.gnu.org/licenses/.
 
+import json
 import mimetypes
 from dataclasses import asdict
 from pathlib import Path
@@ -20,18 +21,40 @@ from pathlib import Path
 import rules
 import structlog
 from config.settings import DATA_ENTRY_ACCEPTED_EXTENSIONS, MEDIA_UPLOAD_MAX_FILE_SIZE
+from django.conf import settings
+from django.core.exceptions import ValidationError
 from django.db import transaction
 from django.http import HttpResponse, HttpResponseRedirect, JsonResponse
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
 from django.views import View
 from django.views.generic.edit import FormView
 
 from apps.auth.mixins import AuthenticationRequiredMixin
 from apps.core.exceptions import ErrorContext, ErrorMessage
+from apps.core.gis import vector_tiles
 from apps.core.models import SharedResource
+from apps.storage.direct_uploads import (
+    FILE_SIZE_EXCEEDED,
+    DirectUploadError,
+    create_upload,
+    finalize_upload,
+    open_uploaded_file,
+)
 from apps.storage.file_utils import has_multiple_files, is_file_upload_oversized
-
-from .forms import DataEntryForm
-from .models import DataEntry
+from apps.storage.upload_handlers import UploadValidationMixin
+from apps.story_map.models import StoryMap
+
+from .forms import (
+    DataEntryForm,
+    DirectUploadDataEntryForm,
+    validate_file_content_type,
+    validate_file_type,
+)
+from .models import DataEntry, VisualizationConfig
+from .services import data_entry_upload_service
+from .tasks import start_cache_data_entry_geojson_task, start_cache_data_entry_preview_task
+from .visualization_tiles import TooManyFeatures, get_tile, get_tiles_version
 
 logger = structlog.get_logger(__name__)
 
@@ -70,50 +93,87 @@ class DataEntryFileDownloadView(View):
         return HttpResponseRedirect(signed_url)
 
 
-class DataEntryFileUploadView(AuthenticationRequiredMixin, FormView):
+class VisualizationTileView(View):
+    def get(self, request, visualization_id, z, x, y, *args, **kwargs):
+        if not settings.VISUALIZATION_TILES_ENABLED:
+            return HttpResponse("Not Found", status=404)
+
+        if z > settings.VISUALIZATION_TILES_MAX_ZOOM or not vector_tiles.is_valid_tile(z, x, y):
+            return HttpResponse("Not Found", status=404)
+
+        visualization = (
+            VisualizationConfig.objects.select_related("data_entry")
+            .filter(pk=visualization_id)
+            .first()
+        )
+        if visualization is None or not is_visualization_tile_allowed(request.user, visualization):
+            return HttpResponse("Not Found", status=404)
+
+        # Tiles only change with the visualization, so the version identifies them
+        etag = f'"{get_tiles_version(visualization)}"'
+        if_none_match = parse_etags(request.headers.get("If-None-Match", ""))
+        if etag in if_none_match or "*" in if_none_match:
+            response = HttpResponse(status=304)
+        else:
+            try:
+                tile = get_tile(visualization, z, x, y)
+            except TooManyFeatures:
+                logger.info(
+                    "Visualization too large for self-hosted tiles",
+                    extra={"visualization_id": str(visualization_id)},
+                )
+                return HttpResponse("Not Found", status=404)
+            response = HttpResponse(tile, content_type=vector_tiles.CONTENT_TYPE)
+
+        response["ETag"] = etag
+        patch_cache_control(
+            response, private=True, max_age=settings.VISUALIZATION_TILES_CACHE_MAX_AGE
+        )
+        return response
+
+
+def is_visualization_tile_allowed(user, visualization):
+    # Maps in published story maps are public, like their Mapbox tilesets
+    owner = visualization.owner
+    if isinstance(owner, StoryMap) and owner.is_published:
+        return True
+    return user.has_perm(VisualizationConfig.get_perm("view"), obj=visualization)
+
+
+class DataEntryFileUploadView(AuthenticationRequiredMixin, UploadValidationMixin, FormView):
+    upload_max_size = MEDIA_UPLOAD_MAX_FILE_SIZE
+    upload_max_files = 1
+
+    def validate_upload_start(self, field_name, file_name, mime_type):
+        if field_name != "data_file":
+            return
+        if not is_valid_shared_data_type([file_name]):
+            raise ValidationError(file_name, code="invalid_media_type")
+        validate_file_content_type(file_name, mime_type)
+
+    def get_upload_error_response(self, error):
+        if error.code == FILE_SIZE_EXCEEDED:
+            error_message = ErrorMessage(
+                code=FILE_SIZE_EXCEEDED,
+                context=ErrorContext(model="DataEntry", field="data_file"),
+            )
+        elif error.code == "invalid_media_type":
+            error_message = ErrorMessage(
+                code="invalid_media_type",
+                context=ErrorContext(model="Shared Data", field="context_type"),
+            )
+        else:
+            return get_json_response_error(get_error_messages({"data_file": [error]}))
+        return get_json_response_error([error_message])
+
     @transaction.atomic
     def post(self, request, **kwargs):
         form_data = request.POST.copy()
         form_data["created_by"] = str(request.user.id)
         form_data["entry_type"] = DataEntry.ENTRY_TYPE_FILE
-        target_type = form_data.pop("target_type")[0]
-        target_slug = form_data.pop("target_slug")[0] if "target_slug" in form_data else None
-        target_id = form_data.pop("target_id")[0] if "target_id" in form_data else None
-
-        model_class = DataEntry.get_target_model_class_from_type_name(target_type)
-        if model_class is None:
-            logger.error("Invalid target_type provided when adding dataEntry")
-            return get_json_response_error(
-                [
-                    ErrorMessage(
-                        code="Invalid target_type provided when adding dataEntry",
-                        context=ErrorContext(model="DataEntry", field="target_type"),
-                    )
-                ]
-            )
-
-        try:
-            if target_slug is not None:
-                target = model_class.objects.get(slug=target_slug)
-            elif target_id is not None:
-                target = model_class.objects.get(id=target_id)
-            else:
-                return get_json_response_error(
-                    [ErrorMessage(code="Clients must provide a slug or ID to identify target.")]
-                )
-        except Exception:
-            logger.error(
-                "Target not found when adding dataEntry",
-                extra={"target_type": target_type, "target_slug": target_slug},
-            )
-            return get_json_response_error(
-                [
-                    ErrorMessage(
-                        code="Target not found when adding dataEntry",
-                        context=ErrorContext(model="DataEntry", field="target"),
-                    )
-                ]
-            )
+        target, error_response = get_target(form_data)
+        if error_response is not None:
+            return error_response
 
         if has_multiple_files(request.FILES.getlist("data_file")):
             error_message = ErrorMessage(
@@ -146,9 +206,175 @@ class DataEntryFileUploadView(AuthenticationRequiredMixin, FormView):
             target=target,
         )
 
+        if data_entry.is_gis_file:
+            object_name = data_entry.s3_object_name
+            geojson = entry_form.geojson
+            transaction.on_commit(
+                lambda: start_cache_data_entry_geojson_task(object_name, geojson=geojson)
+            )
+        if data_entry.is_dataset_file:
+            object_name, resource_type = data_entry.s3_object_name, data_entry.resource_type
+            transaction.on_commit(
+                lambda: start_cache_data_entry_preview_task(object_name, resource_type)
+            )
+
         return JsonResponse(data_entry.to_dict(), status=201)
 
 
+class DataEntryFileUploadTargetView(AuthenticationRequiredMixin, View):
+    """First step of a direct upload, see apps.storage.direct_uploads"""
+
+    def post(self, request, **kwargs):
+        file_name = request.POST.get("file_name", "")
+        try:
+            size = int(request.POST.get("size", ""))
+        except ValueError:
+            size = None
+
+        if not file_name or size is None or size <= 0:
+            error_message = ErrorMessage(
+                code="invalid_upload",
+                context=ErrorContext(model="DataEntry", field="data_file"),
+            )
+            return get_json_response_error([error_message])
+        if size > MEDIA_UPLOAD_MAX_FILE_SIZE:
+            error_message = ErrorMessage(
+                code=FILE_SIZE_EXCEEDED,
+                context=ErrorContext(model="DataEntry", field="data_file"),
+            )
+            return get_json_response_error([error_message])
+        if not is_valid_shared_data_type([file_name]):
+            error_message = ErrorMessage(
+                code="invalid_media_type",
+                context=ErrorContext(model="Shared Data", field="context_type"),
+            )
+            return get_json_response_error([error_message])
+
+        path = data_entry_upload_service.get_available_path(str(request.user.id), file_name)
+        upload = create_upload(
+            data_entry_upload_service,
+            request.user.id,
+            path,
+            file_name,
+            size,
+            MEDIA_UPLOAD_MAX_FILE_SIZE,
+        )
+        return JsonResponse(upload, status=201)
+
+
+class DataEntryFileUploadFinalizeView(AuthenticationRequiredMixin, View):
+    """
+    Second step of a direct upload. Validates the uploaded file reading only
+    the byte ranges needed, and creates its data entry. GIS files are parsed
+    afterwards by the GeoJSON cache job.
+    """
+
+    @transaction.atomic
+    def post(self, request, **kwargs):
+        form_data = request.POST.copy()
+        form_data["created_by"] = str(request.user.id)
+        form_data["entry_type"] = DataEntry.ENTRY_TYPE_FILE
+        upload_token = form_data.pop("upload_token", [""])[0]
+        parts = form_data.pop("parts", [None])[0]
+
+        target, error_response = get_target(form_data)
+        if error_response is not None:
+            return error_response
+
+        try:
+            uploaded_object = finalize_upload(
+                data_entry_upload_service,
+                request.user.id,
+                upload_token,
+                MEDIA_UPLOAD_MAX_FILE_SIZE,
+                parts=json.loads(parts) if parts else None,
+            )
+        except (DirectUploadError, json.JSONDecodeError) as error:
+            error_message = ErrorMessage(
+                code=getattr(error, "code", "invalid_upload"),
+                context=ErrorContext(model="DataEntry", field="data_file"),
+            )
+            return get_json_response_error([error_message])
+
+        try:
+            with open_uploaded_file(data_entry_upload_service, uploaded_object) as file:
+                validate_file_type(file)
+        except ValidationError as error:
+            data_entry_upload_service.delete_file(uploaded_object.path)
+            return get_json_response_error(get_error_messages({"data_file": [error]}))
+
+        form_data["url"] = data_entry_upload_service.get_uploaded_file_url(uploaded_object.path)
+        form_data["resource_type"] = Path(uploaded_object.file_name).suffix[1:]
+        form_data["size"] = uploaded_object.size
+        entry_form = DirectUploadDataEntryForm(data=form_data)
+
+        if not entry_form.is_valid():
+            data_entry_upload_service.delete_file(uploaded_object.path)
+            error_messages = get_error_messages(entry_form.errors.as_data())
+            return get_json_response_error(error_messages)
+
+        data_entry = entry_form.save()
+
+        data_entry.shared_resources.create(
+            target=target,
+        )
+
+        if data_entry.is_gis_file:
+            object_name = data_entry.s3_object_name
+            transaction.on_commit(lambda: start_cache_data_entry_geojson_task(object_name))
+        if data_entry.is_dataset_file:
+            object_name, resource_type = data_entry.s3_object_name, data_entry.resource_type
+            transaction.on_commit(
+                lambda: start_cache_data_entry_preview_task(object_name, resource_type)
+            )
+
+        return JsonResponse(data_entry.to_dict(), status=201)
+
+
+def get_target(form_data):
+    """Target of a new data entry, or the error response when it can't be found"""
+    target_type = form_data.pop("target_type")[0]
+    target_slug = form_data.pop("target_slug")[0] if "target_slug" in form_data else None
+    target_id = form_data.pop("target_id")[0] if "target_id" in form_data else None
+
+    model_class = DataEntry.get_target_model_class_from_type_name(target_type)
+    if model_class is None:
+        logger.error("Invalid target_type provided when adding dataEntry")
+        return None, get_json_response_error(
+            [
+                ErrorMessage(
+                    code="Invalid target_type provided when adding dataEntry",
+                    context=ErrorContext(model="DataEntry", field="target_type"),
+                )
+            ]
+        )
+
+    try:
+        if target_slug is not None:
+            target = model_class.objects.get(slug=target_slug)
+        elif target_id is not None:
+            target = model_class.objects.get(id=target_id)
+        else:
+            return None, get_json_response_error(
+                [ErrorMessage(code="Clients must provide a slug or ID to identify target.")]
+            )
+    except Exception:
+        logger.error(
+            "Target not found when adding dataEntry",
+            extra={"target_type": target_type, "target_slug": target_slug},
+        )
+        return None, get_json_response_error(
+            [
+                ErrorMessage(
+                    code="Target not found when adding dataEntry",
+                    context=ErrorContext(model="DataEntry", field="target"),
+                )
+            ]
+        )
+
+    return target, None
+
+
 def is_valid_shared_data_type(files):
     return all(Path(str(file)).suffix in DATA_ENTRY_ACCEPTED_EXTENSIONS for file in files)
 
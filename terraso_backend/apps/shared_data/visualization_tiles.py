@@ -0,0 +1,183 @@
+# Copyright © 2026 Technology Matters
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see https://www.gnu.org/licenses/.
+
+"""Vector tiles of visualizations, served without a Mapbox tileset.
+
+Tiles are generated on demand from the visualization features and cached on
+the data entry storage, under a prefix that changes whenever the
+visualization is updated. Only datasets of up to
+VISUALIZATION_TILES_MAX_FEATURES features are served this way.
+"""
+
+import json
+from functools import lru_cache
+
+import structlog
+from django.conf import settings
+from django.core.files.base import ContentFile
+
+from apps.core.gis import vector_tiles
+from apps.core.jobs import enqueue
+
+from .models import VisualizationConfig
+from .services import data_entry_upload_service
+from .visualization_tileset_tasks import iter_features_from_data_entry
+
+logger = structlog.get_logger(__name__)
+
+TILES_PATH_PREFIX = "visualization-tiles"
+
+
+class TooManyFeatures(Exception):
+    pass
+
+
+def get_tiles_version(visualization):
+    """Changes whenever the visualization, and so its tiles, change"""
+    return visualization.updated_at.strftime("%Y%m%d%H%M%S%f")
+
+
+def get_layer_name(visualization):
+    # Same layer name as the Mapbox tilesets, so clients style both the same way
+    return str(visualization.id).replace("-", "")
+
+
+def get_tile_path(visualization, z, x, y):
+    return (
+        f"{TILES_PATH_PREFIX}/{visualization.id}/{get_tiles_version(visualization)}/{z}/{x}/{y}.mvt"
+    )
+
+
+def get_tiles_url(visualization):
+    """URL template of the visualization tiles, None when tiles aren't served"""
+    if not settings.VISUALIZATION_TILES_ENABLED:
+        return None
+    return (
+        f"{settings.API_ENDPOINT}/shared-data/visualizations/{visualization.id}"
+        f"/tiles/{{z}}/{{x}}/{{y}}.mvt?v={get_tiles_version(visualization)}"
+    )
+
+
+# Cached in place of the index of visualizations with too many features,
+# since lru_cache doesn't cache exceptions
+_TOO_MANY_FEATURES = object()
+
+
+@lru_cache(maxsize=16)
+def _get_cached_tile_index(visualization_id, version):
+    """
+    Features of a visualization projected to Web Mercator, with a spatial
+    index. version is part of the cache key so updates aren't served stale.
+    """
+    import shapely
+
+    visualization = VisualizationConfig.objects.get(pk=visualization_id)
+    geometries = []
+    properties = []
+    for feature in iter_features_from_data_entry(visualization.data_entry, visualization):
+        if len(geometries) >= settings.VISUALIZATION_TILES_MAX_FEATURES:
+            return _TOO_MANY_FEATURES
+        geometry = feature.get("geometry")
+        if not geometry:
+            continue
+        geometries.append(json.dumps(geometry))
+        properties.append(feature.get("properties"))
+
+    geometries = vector_tiles.project_to_web_mercator(shapely.from_geojson(geometries))
+    return geometries, properties, shapely.STRtree(geometries)
+
+
+def _get_tile_index(visualization_id, version):
+    tile_index = _get_cached_tile_index(visualization_id, version)
+    if tile_index is _TOO_MANY_FEATURES:
+        raise TooManyFeatures()
+    return tile_index
+
+
+def _render_tile(visualization, z, x, y):
+    import shapely
+
+    geometries, properties, tree = _get_tile_index(
+        visualization.id, get_tiles_version(visualization)
+    )
+    bounds = vector_tiles.tile_bounds(z, x, y)
+    # Query with the buffer the features are clipped to, so features
+    # crossing the tile edge render without seams
+    margin = (bounds[2] - bounds[0]) * vector_tiles.DEFAULT_BUFFER / vector_tiles.DEFAULT_EXTENT
+    indexes = sorted(
+        tree.query(
+            shapely.box(
+                bounds[0] - margin, bounds[1] - margin, bounds[2] + margin, bounds[3] + margin
+            )
+        )
+    )
+    return vector_tiles.encode_tile(
+        get_layer_name(visualization),
+        [geometries[index] for index in indexes],
+        [properties[index] for index in indexes],
+        bounds,
+    )
+
+
+def get_tile(visualization, z, x, y):
+    """Encoded tile, from the storage cache when it was already generated"""
+    path = get_tile_path(visualization, z, x, y)
+    storage = data_entry_upload_service.storage
+    try:
+        with storage.open(path, "rb") as file:
+            return file.read()
+    except FileNotFoundError:
+        pass
+
+    tile = _render_tile(visualization, z, x, y)
+    try:
+        storage.save(path, ContentFile(tile))
+    except Exception:
+        # Served anyway, and generated again next time
+        logger.exception("Failed to cache visualization tile", extra={"path": path})
+    return tile
+
+
+def start_remove_visualization_tiles_task(visualization_id):
+    if not settings.VISUALIZATION_TILES_ENABLED:
+        return
+    enqueue(
+        remove_visualization_tiles,
+        str(visualization_id),
+        dedupe_key=f"remove_visualization_tiles:{visualization_id}",
+    )
+
+
+def remove_visualization_tiles(visualization_id):
+    """
+    Removes the cached tiles of a visualization, but the ones of its current
+    version. All of them are removed once the visualization is deleted.
+    """
+    prefix = f"{TILES_PATH_PREFIX}/{visualization_id}/"
+    visualization = VisualizationConfig.objects.filter(pk=visualization_id).first()
+    current_prefix = f"{prefix}{get_tiles_version(visualization)}/" if visualization else None
+
+    bucket = data_entry_upload_service.storage.bucket
+    paths = [
+        obj.key
+        for obj in bucket.objects.filter(Prefix=prefix)
+        if current_prefix is None or not obj.key.startswith(current_prefix)
+    ]
+    failed = data_entry_upload_service.delete_files(paths)
+    if failed:
+        logger.error(
+            "Unable to delete visualization tiles",
+            extra={"visualization_id": visualization_id, "failed": failed},
+        )
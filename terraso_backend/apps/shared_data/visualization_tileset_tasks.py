@@ -13,56 +13,35 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program. If not, see https://www.gnu.org/licenses/.
 
-import csv
 import json
-import threading
 
-import pandas
 import structlog
 from django.conf import settings
 
 from apps.core.gis.mapbox import create_tileset, remove_tileset
-from apps.core.gis.parsers import parse_file_to_geojson
+from apps.core.jobs import enqueue
 from apps.core.models.groups import Group
 from apps.core.models.landscapes import Landscape
-from apps.shared_data.services import data_entry_upload_service
 from apps.story_map.models.story_maps import StoryMap
 
-from .models import VisualizationConfig
+from .datasets import iter_rows_from_file
+from .models import DataEntryGeoJsonCache, VisualizationConfig
 
 logger = structlog.get_logger(__name__)
 
 
-class AsyncTaskHandler:
-    def start_task(self, method, args):
-        t = threading.Thread(target=method, args=[*args], daemon=True)
-        t.start()
-
-
 def start_create_mapbox_tileset_task(visualization_id):
-    AsyncTaskHandler().start_task(create_mapbox_tileset, [visualization_id])
+    enqueue(
+        create_mapbox_tileset,
+        str(visualization_id),
+        dedupe_key=f"create_mapbox_tileset:{visualization_id}",
+    )
 
 
 def start_remove_mapbox_tileset_task(tileset_id):
-    AsyncTaskHandler().start_task(remove_mapbox_tileset, [tileset_id])
-
-
-def get_rows_from_file(data_entry):
-    type = data_entry.resource_type
-    if type.startswith("csv"):
-        file = data_entry_upload_service.get_file(data_entry.s3_object_name, "rt")
-        reader = csv.reader(file)
-        return [row for row in reader]
-    elif type.startswith("xls"):
-        file = data_entry_upload_service.get_file(data_entry.s3_object_name, "rb")
-        df = pandas.read_excel(file, dtype=str)
-        rows = df.values.tolist()
-        return [df.columns.tolist()] + rows
-    else:
-        raise Exception(
-            "Invalid file type for creating mapbox tileset",
-            extra={"file_type": type, "data_entry_id": data_entry.id},
-        )
+    if tileset_id is None:
+        return
+    enqueue(remove_mapbox_tileset, tileset_id, dedupe_key=f"remove_mapbox_tileset:{tileset_id}")
 
 
 def remove_mapbox_tileset(tileset_id):
@@ -87,10 +66,12 @@ def get_owner_name(visualization):
     return "Unknown"
 
 
-def _get_geojson_from_dataset(data_entry, visualization):
-    rows = get_rows_from_file(data_entry)
+def _iter_features_from_dataset(data_entry, visualization):
+    rows = iter_rows_from_file(data_entry)
 
-    first_row = rows[0]
+    first_row = next(rows, None)
+    if first_row is None:
+        return
 
     dataset_config = visualization.configuration["datasetConfig"]
     annotate_config = visualization.configuration["annotateConfig"]
@@ -118,46 +99,58 @@ def _get_geojson_from_dataset(data_entry, visualization):
         else None
     )
 
-    features = []
     for row in rows:
+        try:
+            longitude = float(row[longitude_index])
+            latitude = float(row[latitude_index])
+        except (IndexError, TypeError, ValueError):
+            # Rows without coordinates (blank or trailing rows included) are skipped
+            continue
+
         fields = [
             {
                 "label": data_point["label"],
-                "value": row[data_point["index"]],
+                "value": row[data_point["index"]] if data_point["index"] < len(row) else None,
             }
             for data_point in data_points_indexes
         ]
 
         properties = {
-            "title": row[title_index] if title_index else None,
+            "title": (
+                row[title_index] if title_index is not None and title_index < len(row) else None
+            ),
             "fields": json.dumps(fields),
         }
 
-        try:
-            longitude = float(row[longitude_index])
-            latitude = float(row[latitude_index])
-            feature = {
-                "type": "Feature",
-                "geometry": {
-                    "type": "Point",
-                    "coordinates": [longitude, latitude],
-                },
-                "properties": properties,
-            }
+        yield {
+            "type": "Feature",
+            "geometry": {
+                "type": "Point",
+                "coordinates": [longitude, latitude],
+            },
+            "properties": properties,
+        }
 
-            features.append(feature)
-        except ValueError:
-            continue
 
-    return {
-        "type": "FeatureCollection",
-        "features": features,
-    }
+def _get_geojson_from_gis(data_entry):
+    return DataEntryGeoJsonCache.get_geojson(data_entry.s3_object_name)
 
 
-def _get_geojson_from_gis(data_entry):
-    file = data_entry_upload_service.get_file(data_entry.s3_object_name, "rb")
-    return parse_file_to_geojson(file)
+def iter_features_from_data_entry(data_entry, visualization):
+    """
+    GeoJSON features of a data entry. Datasets are converted row by row as
+    the features are consumed, so they are never all held in memory.
+    """
+    is_dataset = f".{data_entry.resource_type}" in settings.DATA_ENTRY_SPREADSHEET_TYPES.keys()
+    is_gis = f".{data_entry.resource_type}" in settings.DATA_ENTRY_GIS_TYPES.keys()
+
+    if is_dataset:
+        return _iter_features_from_dataset(data_entry, visualization)
+
+    if is_gis:
+        return iter(_get_geojson_from_gis(data_entry)["features"])
+
+    return iter(())
 
 
 def get_geojson_from_data_entry(data_entry, visualization):
@@ -165,7 +158,10 @@ def get_geojson_from_data_entry(data_entry, visualization):
     is_gis = f".{data_entry.resource_type}" in settings.DATA_ENTRY_GIS_TYPES.keys()
 
     if is_dataset:
-        return _get_geojson_from_dataset(data_entry, visualization)
+        return {
+            "type": "FeatureCollection",
+            "features": list(_iter_features_from_dataset(data_entry, visualization)),
+        }
 
     if is_gis:
         return _get_geojson_from_gis(data_entry)
@@ -173,7 +169,14 @@ def get_geojson_from_data_entry(data_entry, visualization):
 
 def create_mapbox_tileset(visualization_id):
     logger.info("Creating mapbox tileset", visualization_id=visualization_id)
-    visualization = VisualizationConfig.objects.get(pk=visualization_id)
+    try:
+        visualization = VisualizationConfig.objects.get(pk=visualization_id)
+    except VisualizationConfig.DoesNotExist:
+        logger.info(
+            "Visualization deleted before its tileset was created",
+            visualization_id=visualization_id,
+        )
+        return
     data_entry = visualization.data_entry
     owner_name = get_owner_name(visualization)
 
@@ -181,12 +184,7 @@ def create_mapbox_tileset(visualization_id):
     remove_mapbox_tileset(visualization.mapbox_tileset_id)
 
     try:
-        geojson = get_geojson_from_data_entry(data_entry, visualization)
-        logger.info(
-            "Geojson generated for mapbox tileset",
-            visualization_id=visualization_id,
-            features=len(geojson["features"]),
-        )
+        features = iter_features_from_data_entry(data_entry, visualization)
 
         # Include the environment in the title and description when calling the Mapbox API.
         # Adding the environment to the title allows us to distinguish between environments
@@ -195,7 +193,7 @@ def create_mapbox_tileset(visualization_id):
         description = f"{settings.ENV} - {owner_name} - {visualization.title}"
 
         id = str(visualization.id).replace("-", "")
-        tileset_id = create_tileset(id, geojson, title, description)
+        tileset_id = create_tileset(id, features, title, description)
         logger.info(
             "Mapbox tileset created",
             visualization_id=visualization_id,
@@ -213,3 +211,5 @@ def create_mapbox_tileset(visualization_id):
             "Error creating mapbox tileset",
             extra={"data_entry_id": visualization.data_entry.id, "error": str(error)},
         )
+        # Raised so the job is retried
+        raise
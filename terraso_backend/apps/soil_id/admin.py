@@ -71,7 +71,7 @@ class SoilDataAdmin(admin.ModelAdmin):
 
 @admin.register(SoilIdCache)
 class SoilIdCacheAdmin(admin.ModelAdmin):
-    list_display = ["id", "latitude", "longitude"]
+    list_display = ["id", "latitude", "longitude", "data_region", "failure_reason", "updated_at"]
 
 
 @admin.register(SoilMetadata)
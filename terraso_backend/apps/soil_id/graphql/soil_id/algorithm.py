@@ -0,0 +1,126 @@
+# Copyright © 2026 Technology Matters
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see https://www.gnu.org/licenses/.
+
+"""Runs the soil ID algorithm list and rank steps.
+
+Both steps are CPU-heavy pandas/numpy code that holds the GIL. When
+SOIL_ID_PROCESS_POOL_SIZE is greater than zero they run in a pool of worker
+processes instead of the web worker, and calls that take longer than
+SOIL_ID_ALGORITHM_TIMEOUT_SECONDS are cancelled.
+
+This module is imported by the worker processes, so it must not import Django
+models.
+"""
+
+import threading
+
+import psycopg
+import structlog
+from config.settings import (
+    GLOBAL_SOIL_ID_BUFFER_DISTANCE,
+    SOIL_ID_ALGORITHM_TIMEOUT_SECONDS,
+    SOIL_ID_DATABASE_URL,
+    SOIL_ID_LIST_SOILS_TIMEOUT_SECONDS,
+    SOIL_ID_PROCESS_POOL_SIZE,
+)
+from soil_id import global_soil, us_soil
+
+from apps.core.process_pool import ProcessWorkerPool, WorkerTimeout
+
+logger = structlog.get_logger(__name__)
+
+# Values of SoilIdCache.DataRegion
+US_DATA_REGION = "US"
+GLOBAL_DATA_REGION = "GLOBAL"
+
+_soil_id_database_connection = None
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def soil_id_database_connection():
+    global _soil_id_database_connection
+    if _soil_id_database_connection is None:
+        _soil_id_database_connection = psycopg.connect(SOIL_ID_DATABASE_URL)
+
+    return _soil_id_database_connection
+
+
+def _list_soils(data_region: str, latitude: float, longitude: float):
+    if data_region == US_DATA_REGION:
+        return us_soil.list_soils(lat=latitude, lon=longitude)
+    elif data_region == GLOBAL_DATA_REGION:
+        return global_soil.list_soils_global(
+            lat=latitude,
+            lon=longitude,
+            connection=soil_id_database_connection(),
+            buffer_dist=GLOBAL_SOIL_ID_BUFFER_DISTANCE,
+        )
+    raise ValueError(f"Unknown data region: {data_region}")
+
+
+def _rank_soils(data_region: str, latitude: float, longitude: float, list_output_data, inputs):
+    if data_region == US_DATA_REGION:
+        return us_soil.rank_soils(
+            lat=latitude, lon=longitude, list_output_data=list_output_data, **inputs
+        )
+    elif data_region == GLOBAL_DATA_REGION:
+        return global_soil.rank_soils_global(
+            lat=latitude,
+            lon=longitude,
+            list_output_data=list_output_data,
+            connection=soil_id_database_connection(),
+            **inputs,
+        )
+    raise ValueError(f"Unknown data region: {data_region}")
+
+
+def _get_pool():
+    global _pool
+    if _pool is None:
+        # Request threads share the pool, so only one of them creates it
+        with _pool_lock:
+            if _pool is None:
+                _pool = ProcessWorkerPool(SOIL_ID_PROCESS_POOL_SIZE)
+    return _pool
+
+
+def _run(func, *args, timeout=SOIL_ID_ALGORITHM_TIMEOUT_SECONDS):
+    if SOIL_ID_PROCESS_POOL_SIZE <= 0:
+        return func(*args)
+
+    try:
+        return _get_pool().run(func, *args, timeout=timeout)
+    except WorkerTimeout:
+        logger.warning(
+            "Soil ID algorithm timed out",
+            extra={"step": func.__name__, "location": args[1:3]},
+        )
+        raise
+
+
+def list_soils(data_region, latitude: float, longitude: float):
+    # Pass the data region as a plain string, the worker can't unpickle model choices
+    return _run(
+        _list_soils,
+        str(data_region),
+        latitude,
+        longitude,
+        timeout=SOIL_ID_LIST_SOILS_TIMEOUT_SECONDS,
+    )
+
+
+def rank_soils(data_region, latitude: float, longitude: float, list_output_data, inputs: dict):
+    return _run(_rank_soils, str(data_region), latitude, longitude, list_output_data, inputs)
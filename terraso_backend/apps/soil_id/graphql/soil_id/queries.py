@@ -16,6 +16,7 @@
 
 import graphene
 
+from apps.graphql.async_execution import async_capable
 from apps.soil_id.graphql.soil_id.resolvers import resolve_data_based_result, resolve_soil_id_result
 from apps.soil_id.graphql.soil_id.types import DataBasedResult, SoilIdInputData, SoilIdResult
 
@@ -28,7 +29,7 @@ class SoilId(graphene.ObjectType):
         latitude=graphene.Float(required=True),
         longitude=graphene.Float(required=True),
         data=graphene.Argument(SoilIdInputData),
-        resolver=resolve_data_based_result,
+        resolver=async_capable(resolve_data_based_result),
         description="DEPRECATED",
     )
 
@@ -37,7 +38,7 @@ class SoilId(graphene.ObjectType):
         latitude=graphene.Float(required=True),
         longitude=graphene.Float(required=True),
         data=graphene.Argument(SoilIdInputData),
-        resolver=resolve_soil_id_result,
+        resolver=async_capable(resolve_soil_id_result),
     )
 
 
@@ -17,12 +17,14 @@ import math
 import traceback
 from typing import Optional
 
-import psycopg
 import structlog
-from config.settings import GLOBAL_SOIL_ID_BUFFER_DISTANCE, SOIL_ID_DATABASE_URL
+from django.conf import settings
 from soil_id import global_soil, us_soil
 from soil_id.utils import find_region_for_location
 
+from apps.core.circuit_breaker import CircuitBreaker, CircuitOpenError
+from apps.core.jobs import enqueue
+from apps.soil_id.graphql.soil_id import algorithm
 from apps.soil_id.graphql.soil_id.types import (
     DataBasedSoilMatch,
     DataBasedSoilMatches,
@@ -47,16 +49,6 @@ from apps.soil_id.models.soil_id_cache import SoilIdCache
 
 logger = structlog.get_logger(__name__)
 
-_soil_id_database_connection = None
-
-
-def soil_id_database_connection():
-    global _soil_id_database_connection
-    if _soil_id_database_connection is None:
-        _soil_id_database_connection = psycopg.connect(SOIL_ID_DATABASE_URL)
-
-    return _soil_id_database_connection
-
 
 def resolve_texture(texture: Optional[str | float]):
     if not isinstance(texture, str) or texture == "" or texture.upper() == "UNKNOWN":
@@ -193,41 +185,117 @@ def clean_soil_list_json(obj):
     return obj
 
 
-def get_list_soils_output(latitude, longitude):
-    cached_result = SoilIdCache.get_data(latitude=latitude, longitude=longitude)
-
-    if cached_result is None:
-        data_region = parse_data_region(find_region_for_location(lat=latitude, lon=longitude))
-        if data_region is None:
-            list_output = "DATA_UNAVAILABLE"
-        elif data_region == SoilIdCache.DataRegion.US:
-            list_output = us_soil.list_soils(lat=latitude, lon=longitude)
-        elif data_region == SoilIdCache.DataRegion.GLOBAL:
-            list_output = global_soil.list_soils_global(
-                lat=latitude,
-                lon=longitude,
-                connection=soil_id_database_connection(),
-                buffer_dist=GLOBAL_SOIL_ID_BUFFER_DISTANCE,
-            )
-        else:
-            raise ValueError(f"Unknown data region: {data_region}")
+list_soils_circuit_breakers = {
+    data_region: CircuitBreaker(
+        f"soil_id_list_soils_{data_region.lower()}",
+        failure_rate=settings.SOIL_ID_CIRCUIT_BREAKER_FAILURE_RATE,
+        min_calls=settings.SOIL_ID_CIRCUIT_BREAKER_MIN_CALLS,
+        window_seconds=settings.SOIL_ID_CIRCUIT_BREAKER_WINDOW_SECONDS,
+        slow_call_seconds=settings.SOIL_ID_CIRCUIT_BREAKER_SLOW_CALL_SECONDS,
+        open_seconds=settings.SOIL_ID_CIRCUIT_BREAKER_OPEN_SECONDS,
+    )
+    for data_region in SoilIdCache.DataRegion
+}
 
-        failure_reason = resolve_list_output_failure(list_output)
 
-        if failure_reason is not None:
-            list_output = failure_reason.value
-        else:
-            list_output.soil_list_json = clean_soil_list_json(list_output.soil_list_json)
+def fetch_list_soils_output(latitude, longitude):
+    data_region = parse_data_region(find_region_for_location(lat=latitude, lon=longitude))
+    if data_region is None:
+        list_output = "DATA_UNAVAILABLE"
+    elif data_region in (SoilIdCache.DataRegion.US, SoilIdCache.DataRegion.GLOBAL):
+        list_output = list_soils_circuit_breakers[data_region].call(
+            algorithm.list_soils, data_region, latitude=latitude, longitude=longitude
+        )
+    else:
+        raise ValueError(f"Unknown data region: {data_region}")
+
+    failure_reason = resolve_list_output_failure(list_output)
+
+    if failure_reason is not None:
+        # Cached for SOIL_ID_CACHE_FAILURE_TTL_SECONDS, but a successful
+        # result is kept so it can still be served as a fallback
+        cached_entry = SoilIdCache.get_entry(latitude=latitude, longitude=longitude)
+        if cached_entry is None or cached_entry.failure_reason is not None:
             SoilIdCache.save_data(
-                latitude=latitude, longitude=longitude, data=list_output, data_region=data_region
+                latitude=latitude,
+                longitude=longitude,
+                data=failure_reason.value,
+                data_region=data_region,
             )
+        return failure_reason.value
 
-        if failure_reason is not None:
-            return list_output
-        else:
-            return data_region, list_output
-    else:
-        return cached_result
+    list_output.soil_list_json = clean_soil_list_json(list_output.soil_list_json)
+    SoilIdCache.save_data(
+        latitude=latitude, longitude=longitude, data=list_output, data_region=data_region
+    )
+    return data_region, list_output
+
+
+def start_refresh_list_soils_output_task(latitude, longitude):
+    location = (SoilIdCache.round_coordinate(latitude), SoilIdCache.round_coordinate(longitude))
+    enqueue(
+        refresh_list_soils_output,
+        latitude,
+        longitude,
+        dedupe_key=f"refresh_list_soils_output:{location[0]},{location[1]}",
+        # Entries are only refreshed while they are served, later requests queue it again
+        max_attempts=1,
+    )
+
+
+def refresh_list_soils_output(latitude, longitude):
+    try:
+        fetch_list_soils_output(latitude=latitude, longitude=longitude)
+    except CircuitOpenError:
+        logger.info(
+            "Skipped soil ID cache refresh, upstream circuit is open",
+            extra={"latitude": latitude, "longitude": longitude},
+        )
+
+
+def get_list_soils_output(latitude, longitude):
+    cached_entry = SoilIdCache.get_entry(latitude=latitude, longitude=longitude)
+
+    if cached_entry is not None:
+        if cached_entry.is_fresh():
+            return cached_entry.cached_data
+        if cached_entry.is_servable_while_revalidating():
+            start_refresh_list_soils_output_task(latitude, longitude)
+            return cached_entry.cached_data
+
+    try:
+        return fetch_list_soils_output(latitude=latitude, longitude=longitude)
+    except Exception as error:
+        fallback_entry = get_fallback_list_soils_entry(latitude, longitude, cached_entry)
+        if fallback_entry is not None:
+            logger.warning(
+                "Serving fallback soil ID cache entry",
+                extra={
+                    "latitude": latitude,
+                    "longitude": longitude,
+                    "fallback_latitude": fallback_entry.latitude,
+                    "fallback_longitude": fallback_entry.longitude,
+                    "error": repr(error),
+                },
+            )
+            return fallback_entry.cached_data
+        if isinstance(error, CircuitOpenError):
+            return SoilIdFailureReason.DATA_UNAVAILABLE.value
+        raise
+
+
+def get_fallback_list_soils_entry(latitude, longitude, cached_entry):
+    """
+    Entry to serve when the list step can't run: the expired entry for the
+    location itself, otherwise the nearest successful entry around it.
+    """
+    if cached_entry is not None and cached_entry.failure_reason is None:
+        return cached_entry
+    return SoilIdCache.get_nearest_entry(
+        latitude=latitude,
+        longitude=longitude,
+        max_distance_degrees=settings.SOIL_ID_NEAREST_CACHE_DEGREES,
+    )
 
 
 # DEPRECATED
@@ -420,11 +488,12 @@ def resolve_data_based_result(
         data_region, list_output = list_result
 
         if data_region == SoilIdCache.DataRegion.US:
-            rank_output = us_soil.rank_soils(
-                lat=latitude,
-                lon=longitude,
+            rank_output = algorithm.rank_soils(
+                data_region,
+                latitude=latitude,
+                longitude=longitude,
                 list_output_data=list_output,
-                **parse_rank_soils_input_data(data, data_region),
+                inputs=parse_rank_soils_input_data(data, data_region),
             )
         elif data_region == SoilIdCache.DataRegion.GLOBAL:
             return SoilIdFailure(reason=SoilIdFailureReason.DATA_UNAVAILABLE)
@@ -453,20 +522,13 @@ def resolve_soil_id_result(
 
         data_region, list_output = list_result
 
-        if data_region == SoilIdCache.DataRegion.US:
-            rank_output = us_soil.rank_soils(
-                lat=latitude,
-                lon=longitude,
-                list_output_data=list_output,
-                **parse_rank_soils_input_data(data, data_region),
-            )
-        elif data_region == SoilIdCache.DataRegion.GLOBAL:
-            rank_output = global_soil.rank_soils_global(
-                lat=latitude,
-                lon=longitude,
+        if data_region in (SoilIdCache.DataRegion.US, SoilIdCache.DataRegion.GLOBAL):
+            rank_output = algorithm.rank_soils(
+                data_region,
+                latitude=latitude,
+                longitude=longitude,
                 list_output_data=list_output,
-                connection=soil_id_database_connection(),
-                **parse_rank_soils_input_data(data, data_region),
+                inputs=parse_rank_soils_input_data(data, data_region),
             )
         elif data_region is None:
             return SoilIdFailure(reason=SoilIdFailureReason.DATA_UNAVAILABLE)
@@ -0,0 +1,76 @@
+# Copyright © 2026 Technology Matters
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see https://www.gnu.org/licenses/.
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from soil_id.us_soil import SoilListOutputData
+
+from apps.soil_id.models import SoilIdCache
+
+PAYLOAD_FIELDS = [
+    "payload_format",
+    "soil_list_json",
+    "rank_data_csv",
+    "map_unit_component_data_csv",
+    "soil_list_zlib",
+    "rank_data_zlib",
+    "map_unit_component_data_zlib",
+]
+
+
+class Command(BaseCommand):
+    help = "Convert soil ID cache entries stored as text to the compressed payload format"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--limit", type=int, default=None, help="Stop after converting this many entries"
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        limit = options["limit"]
+
+        remaining = SoilIdCache.objects.filter(
+            payload_format=SoilIdCache.PayloadFormat.TEXT, failure_reason__isnull=True
+        ).order_by("id")
+        total_converted = 0
+
+        while limit is None or total_converted < limit:
+            size = batch_size if limit is None else min(batch_size, limit - total_converted)
+            with transaction.atomic():
+                entries = list(remaining.select_for_update(skip_locked=True)[:size])
+                if not entries:
+                    break
+
+                for entry in entries:
+                    data = SoilListOutputData(
+                        soil_list_json=entry.soil_list_json,
+                        rank_data_csv=entry.rank_data_csv,
+                        map_unit_component_data_csv=entry.map_unit_component_data_csv,
+                    )
+                    payload = SoilIdCache.encode_payload(
+                        data, payload_format=SoilIdCache.PayloadFormat.ZLIB
+                    )
+                    for field, value in payload.items():
+                        setattr(entry, field, value)
+
+                # bulk_update leaves updated_at alone, so entries keep their age
+                SoilIdCache.objects.bulk_update(entries, PAYLOAD_FIELDS)
+
+            total_converted += len(entries)
+            self.stdout.write(f"Converted {total_converted} entries")
+
+        self.stdout.write(self.style.SUCCESS(f"Converted {total_converted} entries successfully"))
@@ -0,0 +1,47 @@
+# Copyright © 2026 Technology Matters
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see https://www.gnu.org/licenses/.
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("soil_id", "0023_soilmetadata_user_ratings"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="soilidcache",
+            name="payload_format",
+            field=models.CharField(
+                choices=[("TEXT", "Text"), ("ZLIB", "Zlib")], default="TEXT"
+            ),
+        ),
+        migrations.AddField(
+            model_name="soilidcache",
+            name="soil_list_zlib",
+            field=models.BinaryField(null=True),
+        ),
+        migrations.AddField(
+            model_name="soilidcache",
+            name="rank_data_zlib",
+            field=models.BinaryField(null=True),
+        ),
+        migrations.AddField(
+            model_name="soilidcache",
+            name="map_unit_component_data_zlib",
+            field=models.BinaryField(null=True),
+        ),
+    ]
@@ -14,12 +14,20 @@
 # along with this program. If not, see https://www.gnu.org/licenses/.
 
 
+from datetime import timedelta
 from typing import Optional
 
+from django.conf import settings
 from django.db import models
+from django.utils import timezone
 from soil_id.us_soil import SoilListOutputData
 
 from apps.core.models.commons import BaseModel
+from apps.soil_id.payloads import (
+    LazySoilListOutputData,
+    compress_json,
+    compress_text,
+)
 
 
 class SoilIdCache(BaseModel):
@@ -33,10 +41,23 @@ class SoilIdCache(BaseModel):
     data_region = models.CharField(choices=DataRegion.choices, null=True)
 
     failure_reason = models.TextField(null=True)
+
+    class PayloadFormat(models.TextChoices):
+        TEXT = "TEXT"
+        ZLIB = "ZLIB"
+
+    payload_format = models.CharField(choices=PayloadFormat.choices, default=PayloadFormat.TEXT)
+
+    # PayloadFormat.TEXT
     soil_list_json = models.JSONField(null=True)
     rank_data_csv = models.TextField(null=True)
     map_unit_component_data_csv = models.TextField(null=True)
 
+    # PayloadFormat.ZLIB
+    soil_list_zlib = models.BinaryField(null=True)
+    rank_data_zlib = models.BinaryField(null=True)
+    map_unit_component_data_zlib = models.BinaryField(null=True)
+
     class Meta:
         constraints = [
             models.UniqueConstraint(fields=["latitude", "longitude"], name="coordinate_index")
@@ -57,13 +78,19 @@ class SoilIdCache(BaseModel):
         data_region: Optional[DataRegion],
     ):
         if isinstance(data, str):
-            data_to_save = {"failure_reason": data}
+            data_to_save = {"failure_reason": data, **cls.encode_payload(None)}
         else:
             data_to_save = {
-                "soil_list_json": data.soil_list_json,
-                "rank_data_csv": data.rank_data_csv,
-                "map_unit_component_data_csv": data.map_unit_component_data_csv,
+                "failure_reason": None,
                 "data_region": data_region,
+                **cls.encode_payload(
+                    data,
+                    payload_format=(
+                        cls.PayloadFormat.ZLIB
+                        if settings.SOIL_ID_CACHE_COMPRESS_PAYLOADS
+                        else cls.PayloadFormat.TEXT
+                    ),
+                ),
             }
 
         cls.objects.update_or_create(
@@ -73,18 +100,114 @@ class SoilIdCache(BaseModel):
         )
 
     @classmethod
-    def get_data(cls, latitude: float, longitude: float) -> SoilListOutputData | str:
+    def encode_payload(
+        cls,
+        data: Optional[SoilListOutputData],
+        payload_format: PayloadFormat = PayloadFormat.TEXT,
+    ) -> dict:
+        """Model field values storing data in the given format, clearing the other format."""
+        text_fields = {
+            "soil_list_json": None,
+            "rank_data_csv": None,
+            "map_unit_component_data_csv": None,
+        }
+        zlib_fields = {
+            "soil_list_zlib": None,
+            "rank_data_zlib": None,
+            "map_unit_component_data_zlib": None,
+        }
+
+        if data is None:
+            pass
+        elif payload_format == cls.PayloadFormat.ZLIB:
+            zlib_fields = {
+                "soil_list_zlib": compress_json(data.soil_list_json),
+                "rank_data_zlib": compress_text(data.rank_data_csv),
+                "map_unit_component_data_zlib": compress_text(data.map_unit_component_data_csv),
+            }
+        else:
+            text_fields = {
+                "soil_list_json": data.soil_list_json,
+                "rank_data_csv": data.rank_data_csv,
+                "map_unit_component_data_csv": data.map_unit_component_data_csv,
+            }
+
+        return {"payload_format": payload_format, **text_fields, **zlib_fields}
+
+    @classmethod
+    def get_entry(cls, latitude: float, longitude: float) -> Optional["SoilIdCache"]:
         try:
-            prev_result = cls.objects.get(
+            return cls.objects.get(
                 latitude=cls.round_coordinate(latitude), longitude=cls.round_coordinate(longitude)
             )
-            if prev_result.failure_reason is not None:
-                return prev_result.failure_reason
+        except cls.DoesNotExist:
+            return None
 
-            return prev_result.data_region, SoilListOutputData(
-                soil_list_json=prev_result.soil_list_json,
-                rank_data_csv=prev_result.rank_data_csv,
-                map_unit_component_data_csv=prev_result.map_unit_component_data_csv,
+    @classmethod
+    def get_nearest_entry(
+        cls, latitude: float, longitude: float, max_distance_degrees: float
+    ) -> Optional["SoilIdCache"]:
+        """Closest successful entry within max_distance_degrees on both axes, however old."""
+        return (
+            cls.objects.filter(
+                failure_reason__isnull=True,
+                latitude__range=(latitude - max_distance_degrees, latitude + max_distance_degrees),
+                longitude__range=(
+                    longitude - max_distance_degrees,
+                    longitude + max_distance_degrees,
+                ),
             )
-        except cls.DoesNotExist:
+            .annotate(
+                distance=(models.F("latitude") - latitude) ** 2
+                + (models.F("longitude") - longitude) ** 2
+            )
+            .order_by("distance")
+            .first()
+        )
+
+    @classmethod
+    def get_data(cls, latitude: float, longitude: float) -> SoilListOutputData | str:
+        entry = cls.get_entry(latitude=latitude, longitude=longitude)
+        if entry is None:
             return None
+        return entry.cached_data
+
+    @property
+    def cached_data(self):
+        if self.failure_reason is not None:
+            return self.failure_reason
+
+        if self.payload_format == self.PayloadFormat.ZLIB:
+            return self.data_region, LazySoilListOutputData(
+                soil_list_json=self.soil_list_zlib,
+                rank_data_csv=self.rank_data_zlib,
+                map_unit_component_data_csv=self.map_unit_component_data_zlib,
+            )
+
+        return self.data_region, SoilListOutputData(
+            soil_list_json=self.soil_list_json,
+            rank_data_csv=self.rank_data_csv,
+            map_unit_component_data_csv=self.map_unit_component_data_csv,
+        )
+
+    @property
+    def age(self) -> timedelta:
+        return timezone.now() - self.updated_at
+
+    @property
+    def ttl(self) -> Optional[timedelta]:
+        """How long the entry is fresh for. None means it never expires."""
+        if self.failure_reason is not None:
+            ttl_seconds = settings.SOIL_ID_CACHE_FAILURE_TTL_SECONDS
+        else:
+            ttl_seconds = settings.SOIL_ID_CACHE_TTL_SECONDS
+
+        return None if ttl_seconds is None else timedelta(seconds=ttl_seconds)
+
+    def is_fresh(self) -> bool:
+        return self.ttl is None or self.age <= self.ttl
+
+    def is_servable_while_revalidating(self) -> bool:
+        """Whether an expired entry is recent enough to be served while it is refreshed."""
+        stale_seconds = settings.SOIL_ID_CACHE_STALE_WHILE_REVALIDATE_SECONDS
+        return self.is_fresh() or self.age <= self.ttl + timedelta(seconds=stale_seconds)
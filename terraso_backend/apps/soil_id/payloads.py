@@ -0,0 +1,82 @@
+# Copyright © 2026 Technology Matters
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see https://www.gnu.org/licenses/.
+
+"""Compressed soil ID cache payloads.
+
+Cached list outputs are passed to the soil ID worker processes, which don't
+set up Django, so this module must not import Django models.
+"""
+
+import json
+import zlib
+
+from soil_id.us_soil import SoilListOutputData
+
+
+def compress_json(value):
+    return None if value is None else zlib.compress(json.dumps(value).encode())
+
+
+def decompress_json(value):
+    return None if value is None else json.loads(zlib.decompress(value))
+
+
+def compress_text(value):
+    return None if value is None else zlib.compress(value.encode())
+
+
+def decompress_text(value):
+    return None if value is None else zlib.decompress(value).decode()
+
+
+def _lazy_payload_property(name, decompress):
+    def getter(self):
+        if name not in self._decoded:
+            self._decoded[name] = decompress(self._compressed[name])
+        return self._decoded[name]
+
+    def setter(self, value):
+        self._decoded[name] = value
+
+    return property(getter, setter)
+
+
+class LazySoilListOutputData(SoilListOutputData):
+    """
+    SoilListOutputData read from compressed cache payloads. Each part is only
+    decompressed the first time it is accessed, and the compressed bytes are
+    what gets pickled when the data is sent to a soil ID worker process.
+    """
+
+    def __init__(self, soil_list_json, rank_data_csv, map_unit_component_data_csv):
+        # Binary fields are read from Postgres as memoryviews, which can't be pickled
+        self._compressed = {
+            name: None if value is None else bytes(value)
+            for name, value in (
+                ("soil_list_json", soil_list_json),
+                ("rank_data_csv", rank_data_csv),
+                ("map_unit_component_data_csv", map_unit_component_data_csv),
+            )
+        }
+        self._decoded = {}
+
+    def __getstate__(self):
+        return {"_compressed": self._compressed, "_decoded": {}}
+
+    soil_list_json = _lazy_payload_property("soil_list_json", decompress_json)
+    rank_data_csv = _lazy_payload_property("rank_data_csv", decompress_text)
+    map_unit_component_data_csv = _lazy_payload_property(
+        "map_unit_component_data_csv", decompress_text
+    )
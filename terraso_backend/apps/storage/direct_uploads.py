@@ -0,0 +1,254 @@
+# Copyright © 2026 Technology Matters
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see https://www.gnu.org/licenses/.
+
+"""Two-phase uploads, from clients straight to storage.
+
+create_upload gives the client a presigned target to upload a file to: a
+presigned POST, or a multipart upload with a presigned URL per part for files
+larger than DIRECT_UPLOAD_MULTIPART_THRESHOLD. It comes with a signed upload
+token, which the client sends back once the file is uploaded. finalize_upload
+then checks the stored object, and open_uploaded_file lets callers validate
+its content reading only the byte ranges they need. Each upload token can
+only be finalized once, so a replayed token can't make a second reference to
+the same object.
+"""
+
+import io
+import math
+import uuid
+from dataclasses import dataclass
+from datetime import timedelta
+
+import structlog
+from botocore.exceptions import ClientError
+from django.conf import settings
+from django.core import signing
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from apps.core.models import FinalizedUpload
+
+logger = structlog.get_logger(__name__)
+
+SIGNING_SALT = "apps.storage.direct_uploads"
+
+# Ranges read at a time when validating an uploaded file
+READ_BUFFER_SIZE = 64 * 1024
+
+# Form fields of a presigned POST setting the object parameters
+_POST_FIELDS = {"ContentDisposition": "Content-Disposition", "ContentType": "Content-Type"}
+
+# Same error code as the uploads through the backend
+FILE_SIZE_EXCEEDED = "File size exceeds 10 MB"
+
+
+class DirectUploadError(Exception):
+    def __init__(self, code):
+        super().__init__(code)
+        self.code = code
+
+
+@dataclass
+class UploadedObject:
+    path: str
+    file_name: str
+    size: int
+
+
+def _get_client(storage):
+    return storage.bucket.meta.client
+
+
+def create_upload(upload_service, user_id, path, file_name, size, max_size):
+    """Starts an upload of size bytes to path, returns the upload token and target"""
+    storage = upload_service.storage
+    client = _get_client(storage)
+    expires_in = settings.DIRECT_UPLOAD_EXPIRES_IN
+    token_data = {
+        "id": uuid.uuid4().hex,
+        "bucket": storage.bucket_name,
+        "path": path,
+        "user_id": str(user_id),
+        "file_name": file_name,
+    }
+
+    # Content-Disposition and such, as the uploads through the service
+    parameters = upload_service.get_upload_parameters(file_name)
+
+    if size <= settings.DIRECT_UPLOAD_MULTIPART_THRESHOLD:
+        fields = {_POST_FIELDS[name]: value for name, value in parameters.items()}
+        post = client.generate_presigned_post(
+            storage.bucket_name,
+            path,
+            Fields=fields,
+            Conditions=[["content-length-range", 1, max_size]]
+            + [{name: value} for name, value in fields.items()],
+            ExpiresIn=expires_in,
+        )
+        target = {"method": "POST", "url": post["url"], "fields": post["fields"]}
+    else:
+        part_size = settings.DIRECT_UPLOAD_PART_SIZE
+        upload_id = client.create_multipart_upload(Bucket=storage.bucket_name, Key=path)["UploadId"]
+        token_data["upload_id"] = upload_id
+        target = {
+            "method": "PUT",
+            "part_size": part_size,
+            "parts": [
+                {
+                    "part_number": part_number,
+                    "url": client.generate_presigned_url(
+                        "upload_part",
+                        Params={
+                            "Bucket": storage.bucket_name,
+                            "Key": path,
+                            "UploadId": upload_id,
+                            "PartNumber": part_number,
+                        },
+                        ExpiresIn=expires_in,
+                    ),
+                }
+                for part_number in range(1, math.ceil(size / part_size) + 1)
+            ],
+        }
+
+    return {"upload_token": signing.dumps(token_data, salt=SIGNING_SALT), **target}
+
+
+def finalize_upload(upload_service, user_id, upload_token, max_size, parts=None):
+    """
+    Completes an upload started by create_upload. parts are the
+    {"part_number", "etag"} of each part of a multipart upload.
+
+    The size of a multipart upload is only known, and checked against
+    max_size, once its parts are put together, since the client uploads the
+    parts straight to storage with sizes of its own choosing.
+    """
+    storage = upload_service.storage
+    client = _get_client(storage)
+    # Uploads started right before the presigned URLs expire may finish well after they do
+    token_max_age = settings.DIRECT_UPLOAD_EXPIRES_IN * 2
+    try:
+        token_data = signing.loads(upload_token, salt=SIGNING_SALT, max_age=token_max_age)
+    except signing.BadSignature:
+        raise DirectUploadError("invalid_upload_token")
+    if (
+        "id" not in token_data
+        or token_data["user_id"] != str(user_id)
+        or token_data["bucket"] != storage.bucket_name
+    ):
+        raise DirectUploadError("invalid_upload_token")
+
+    path = token_data["path"]
+    if "upload_id" in token_data:
+        try:
+            client.complete_multipart_upload(
+                Bucket=storage.bucket_name,
+                Key=path,
+                UploadId=token_data["upload_id"],
+                MultipartUpload={
+                    "Parts": [
+                        {"PartNumber": int(part["part_number"]), "ETag": part["etag"]}
+                        for part in parts or []
+                    ]
+                },
+            )
+        except (ClientError, KeyError, TypeError, ValueError) as error:
+            logger.warning("Failed to complete multipart upload", extra={"error": str(error)})
+            try:
+                client.abort_multipart_upload(
+                    Bucket=storage.bucket_name, Key=path, UploadId=token_data["upload_id"]
+                )
+            except ClientError:
+                pass
+            raise DirectUploadError("upload_incomplete")
+
+    try:
+        size = client.head_object(Bucket=storage.bucket_name, Key=path)["ContentLength"]
+    except ClientError:
+        raise DirectUploadError("upload_incomplete")
+
+    if size > max_size:
+        storage.delete(path)
+        raise DirectUploadError(FILE_SIZE_EXCEEDED)
+
+    _consume_token(token_data["id"], path, token_max_age)
+
+    return UploadedObject(path=path, file_name=token_data["file_name"], size=size)
+
+
+def _consume_token(token_id, path, token_max_age):
+    try:
+        with transaction.atomic():
+            FinalizedUpload.objects.create(id=uuid.UUID(token_id), path=path)
+    except IntegrityError:
+        raise DirectUploadError("upload_already_finalized")
+    # Records of expired tokens aren't needed anymore
+    FinalizedUpload.objects.filter(
+        created_at__lt=timezone.now() - timedelta(seconds=token_max_age)
+    ).delete()
+
+
+def open_uploaded_file(upload_service, uploaded_object):
+    """Seekable file of an uploaded object, fetched by byte ranges as it is read"""
+    storage = upload_service.storage
+    return io.BufferedReader(
+        _StorageRangeReader(
+            _get_client(storage),
+            storage.bucket_name,
+            uploaded_object.path,
+            uploaded_object.size,
+            uploaded_object.file_name,
+        ),
+        buffer_size=READ_BUFFER_SIZE,
+    )
+
+
+class _StorageRangeReader(io.RawIOBase):
+    def __init__(self, client, bucket_name, key, size, name):
+        self.client = client
+        self.bucket_name = bucket_name
+        self.key = key
+        self.size = size
+        self.name = name
+        self.position = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self.position
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_SET:
+            self.position = offset
+        elif whence == io.SEEK_CUR:
+            self.position += offset
+        elif whence == io.SEEK_END:
+            self.position = self.size + offset
+        return self.position
+
+    def readinto(self, buffer):
+        if self.position >= self.size or not len(buffer):
+            return 0
+        end = min(self.position + len(buffer), self.size) - 1
+        data = self.client.get_object(
+            Bucket=self.bucket_name, Key=self.key, Range=f"bytes={self.position}-{end}"
+        )["Body"].read()
+        buffer[: len(data)] = data
+        self.position += len(data)
+        return len(data)
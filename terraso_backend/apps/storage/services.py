@@ -13,6 +13,8 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program. If not, see https://www.gnu.org/licenses/.
 
+import hashlib
+import mimetypes
 import pathlib
 import urllib.request
 import uuid
@@ -21,9 +23,19 @@ from django.conf import settings
 from django.core.files.base import ContentFile
 
 from .s3 import ProfileImageStorage
+from .signed_urls import get_signed_url
+
+# Most keys S3 accepts in a single delete request
+DELETE_BATCH_SIZE = 1000
 
 
 class UploadService:
+    # Content addressed services name files after the hash of their content.
+    # They never have to check for existing files, and identical uploads of a
+    # user are stored once, so the name of each upload is set when signing
+    # its URL (see DataEntry.signed_url) rather than stored with the object.
+    content_addressed = False
+
     @property
     def storage(self):
         raise NotImplementedError()
@@ -37,32 +49,97 @@ class UploadService:
         return self.upload_file(user_id, ContentFile(file))
 
     def upload_file(self, user_id, file, file_name=None):
-        if not file_name:
-            file_name = uuid.uuid4().hex
-
-        path = self.get_path_on_storage(user_id, file_name)
+        path = self.upload_file_get_path(user_id, file, file_name=file_name)
+        return self.get_uploaded_file_url(path)
 
-        if self.storage.exists(path):
-            path = self._uniquify(path)
+    def upload_file_get_path(self, user_id, file, file_name=None):
+        if self.content_addressed:
+            return self._upload_content_addressed(user_id, file, file_name)
 
+        path = self.get_available_path(user_id, file_name)
         self.storage.save(path, file)
-        return self.get_uploaded_file_url(path)
+        return path
 
-    def upload_file_get_path(self, user_id, file, file_name=None):
+    def get_available_path(self, user_id, file_name=None):
+        """Path on storage for a new file, not used by any existing one"""
         if not file_name:
             file_name = uuid.uuid4().hex
 
+        if self.content_addressed:
+            # The content isn't known yet (direct uploads), so the name is random
+            return self.get_path_on_storage(
+                user_id, f"{uuid.uuid4().hex}{pathlib.Path(str(file_name)).suffix}"
+            )
+
         path = self.get_path_on_storage(user_id, file_name)
 
         if self.storage.exists(path):
             path = self._uniquify(path)
 
-        self.storage.save(path, file)
         return path
 
+    def get_upload_parameters(self, file_name):
+        """S3 object parameters of a new file named file_name by the user"""
+        if not self.content_addressed or not file_name:
+            return {}
+        content_type, _ = mimetypes.guess_type(str(file_name))
+        return {"ContentType": content_type} if content_type else {}
+
+    def _upload_content_addressed(self, user_id, file, file_name):
+        if not file_name:
+            file_name = getattr(file, "name", None)
+
+        # Uploads validated while received already have it, see apps.storage.upload_handlers
+        checksum = getattr(file, "sha256", None)
+        if checksum is None:
+            digest = hashlib.sha256()
+            file.seek(0)
+            for chunk in iter(lambda: file.read(1024 * 1024), b""):
+                digest.update(chunk)
+            checksum = digest.hexdigest()
+        file.seek(0)
+
+        suffix = pathlib.Path(str(file_name)).suffix if file_name else ""
+        path = self.get_path_on_storage(user_id, f"{checksum[:32]}{suffix}")
+        self.lock_path(path)
+
+        # Identical content gets the same path, so storing it again replaces
+        # the file with the same bytes
+        parameters = {
+            **self.storage.get_object_parameters(path),
+            **self.get_upload_parameters(file_name),
+        }
+        if self.storage.default_acl:
+            parameters["ACL"] = self.storage.default_acl
+        self.storage.bucket.upload_fileobj(file, path, ExtraArgs=parameters)
+        return path
+
+    def lock_path(self, path):
+        """
+        Called before storing a content addressed file at path, which may
+        already be used by other files. Services whose unused files are
+        removed lock it so the removal can't race the upload.
+        """
+
     def delete_file(self, path):
         self.storage.delete(path)
 
+    def delete_files(self, paths):
+        """
+        Deletes files with as few requests as possible, and returns the paths
+        that couldn't be deleted mapped to their error message
+        """
+        paths = list(dict.fromkeys(paths))
+        failed = {}
+        for start in range(0, len(paths), DELETE_BATCH_SIZE):
+            batch = paths[start : start + DELETE_BATCH_SIZE]
+            response = self.storage.bucket.delete_objects(
+                Delete={"Objects": [{"Key": path} for path in batch], "Quiet": True}
+            )
+            for error in response.get("Errors", []):
+                failed[error["Key"]] = error.get("Message", error.get("Code"))
+        return failed
+
     def get_path_on_storage(self, user_id, file_name):
         return f"{user_id}/{file_name}"
 
@@ -94,13 +171,16 @@ class UploadService:
 
         return str(given_path)
 
-    def get_signed_url(self, path):
-        signed_url = self.storage.url(path)
-        return signed_url
+    def get_signed_url(self, path, parameters=None):
+        return get_signed_url(self.storage, path, parameters)
 
     def get_file(self, path, mode="rb"):
         return self.storage.open(path, mode)
 
+    def get_file_version(self, path):
+        """Identifies the current content of the file, changes when the file is replaced."""
+        return self.storage.get_modified_time(path).isoformat()
+
 
 class ProfileImageService(UploadService):
     storage = ProfileImageStorage()
@@ -0,0 +1,75 @@
+# Copyright © 2026 Technology Matters
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see https://www.gnu.org/licenses/.
+
+"""Signed URLs of storage objects, reused while they are still valid.
+
+Signing is done per object on every request otherwise, which adds up when
+listing many files, and gives a different URL each time so responses can't
+be cached. URLs are kept per process until SIGNED_URL_CACHE_MARGIN_SECONDS
+before their signature expires, so clients always get some time to use them.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+
+class SignedUrlCache:
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._urls = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, storage, name, parameters=None):
+        """Signed URL of the object, with the given response parameters (such as
+        ResponseContentDisposition) which are part of the signature"""
+        if self.max_size <= 0:
+            return storage.url(name, parameters=parameters)
+
+        key = (storage.bucket_name, name, tuple(sorted((parameters or {}).items())))
+        now = time.monotonic()
+        with self._lock:
+            cached = self._urls.get(key)
+            if cached is not None and cached[1] > now:
+                self._urls.move_to_end(key)
+                return cached[0]
+
+        url = storage.url(name, parameters=parameters)
+        reuse_seconds = storage.querystring_expire - settings.SIGNED_URL_CACHE_MARGIN_SECONDS
+        if reuse_seconds <= 0:
+            return url
+
+        with self._lock:
+            self._urls[key] = (url, now + reuse_seconds)
+            self._urls.move_to_end(key)
+            while len(self._urls) > self.max_size:
+                self._urls.popitem(last=False)
+        return url
+
+    def clear(self):
+        with self._lock:
+            self._urls.clear()
+
+
+_cache = None
+
+
+def get_signed_url(storage, name, parameters=None):
+    global _cache
+    if _cache is None:
+        _cache = SignedUrlCache(settings.SIGNED_URL_CACHE_SIZE)
+    return _cache.get(storage, name, parameters)
@@ -13,11 +13,10 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program. If not, see https://www.gnu.org/licenses/.
 
-import threading
-
 import structlog
 from django.contrib.auth import get_user_model
 
+from apps.core.jobs import enqueue
 from apps.storage.services import ProfileImageService
 
 User = get_user_model()
@@ -25,14 +24,14 @@ User = get_user_model()
 logger = structlog.get_logger(__name__)
 
 
-class AsyncTaskHandler:
-    def start_task(self, method, args):
-        t = threading.Thread(target=method, args=[*args], daemon=True)
-        t.start()
-
-
 def start_update_profile_image_task(user_id, profile_image_url):
-    AsyncTaskHandler().start_task(_update_profile_image, [user_id, profile_image_url])
+    enqueue(
+        _update_profile_image,
+        str(user_id),
+        profile_image_url,
+        dedupe_key=f"update_profile_image:{user_id}",
+        replace_queued=True,
+    )
 
 
 def _update_profile_image(user_id, profile_image_url):
@@ -52,3 +51,5 @@ def _update_profile_image(user_id, profile_image_url):
         user.save()
     except Exception:
         logger.exception("Failed to upload profile image. User ID: {}".format(user_id))
+        # Raised so the job is retried
+        raise
@@ -0,0 +1,136 @@
+# Copyright © 2026 Technology Matters
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see https://www.gnu.org/licenses/.
+
+"""Validation of uploaded files while they are received.
+
+Django only hands uploaded files to views once the whole request has been
+read, buffering them in memory or in temporary files. Views using
+UploadValidationMixin reject a file as soon as it exceeds their maximum size,
+or as soon as its first chunk shows it isn't of an accepted type, and stop
+reading the request. Views accepting a known number of files reject requests
+whose declared length can't fit them before reading any data. The SHA-256 of accepted files is computed as they are
+received and set as their sha256 attribute.
+"""
+
+import hashlib
+
+import magic
+from django.core.exceptions import ValidationError
+from django.core.files.uploadhandler import FileUploadHandler, StopUpload
+from django.http import QueryDict
+from django.utils.datastructures import MultiValueDict
+
+from .direct_uploads import FILE_SIZE_EXCEEDED
+
+# Bytes of the start of a file used to sniff its MIME type
+MIME_SNIFF_SIZE = 2048
+
+# Bytes allowed besides the files in a request: boundaries, part headers and
+# the other form fields
+MULTIPART_OVERHEAD_SIZE = 64 * 1024
+
+
+class ValidatingUploadHandler(FileUploadHandler):
+    """
+    Passes the data on to the next handlers, stopping the upload on the first
+    invalid file. The ValidationError is left in error.
+    """
+
+    def __init__(self, request=None, max_size=None, validate_start=None, max_files=None):
+        super().__init__(request)
+        self.max_size = max_size
+        self.max_files = max_files
+        self.validate_start = validate_start
+        self.error = None
+        self.checksums = {}
+
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding=None):
+        if self.max_size is None or self.max_files is None:
+            return None
+        if content_length > self.max_size * self.max_files + MULTIPART_OVERHEAD_SIZE:
+            # Nothing is read, the declared length is enough to reject the request
+            self.error = ValidationError(FILE_SIZE_EXCEEDED, code=FILE_SIZE_EXCEEDED)
+            return QueryDict(encoding=encoding), MultiValueDict()
+        return None
+
+    def new_file(self, field_name, file_name, *args, **kwargs):
+        super().new_file(field_name, file_name, *args, **kwargs)
+        self.received = 0
+        self.digest = hashlib.sha256()
+
+    def _stop(self, error):
+        self.error = error
+        # The rest of the body is still drained, so the error response reaches the client
+        raise StopUpload()
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        if self.max_size is not None and self.received > self.max_size:
+            self._stop(ValidationError(FILE_SIZE_EXCEEDED, code=FILE_SIZE_EXCEEDED))
+
+        if start == 0 and self.validate_start is not None:
+            mime_type = magic.from_buffer(raw_data[:MIME_SNIFF_SIZE], mime=True)
+            try:
+                self.validate_start(self.field_name, self.file_name, mime_type)
+            except ValidationError as error:
+                self._stop(error)
+
+        self.digest.update(raw_data)
+        return raw_data
+
+    def file_complete(self, file_size):
+        # Nothing is returned, so the next handlers create the file
+        self.checksums.setdefault(self.field_name, []).append(self.digest.hexdigest())
+
+
+class UploadValidationMixin:
+    """
+    Validates the files uploaded to the view with ValidatingUploadHandler.
+    Invalid files are responded with get_upload_error_response. When
+    upload_max_files is set, requests too large for that many files are
+    rejected from their Content-Length.
+    """
+
+    upload_max_size = None
+    upload_max_files = None
+
+    def validate_upload_start(self, field_name, file_name, mime_type):
+        """Raises ValidationError when the file can't be accepted"""
+
+    def get_upload_error_response(self, error):
+        raise NotImplementedError()
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method != "POST":
+            return super().dispatch(request, *args, **kwargs)
+
+        handler = ValidatingUploadHandler(
+            request,
+            max_size=self.upload_max_size,
+            validate_start=self.validate_upload_start,
+            max_files=self.upload_max_files,
+        )
+        request.upload_handlers.insert(0, handler)
+
+        # Parses the request with the handler
+        files = request.FILES
+        if handler.error is not None:
+            return self.get_upload_error_response(handler.error)
+
+        for field_name, field_files in files.lists():
+            for file, checksum in zip(field_files, handler.checksums.get(field_name, [])):
+                file.sha256 = checksum
+
+        return super().dispatch(request, *args, **kwargs)
@@ -16,11 +16,16 @@
 from django.urls import path
 from django.views.decorators.csrf import csrf_exempt
 
-from .views import StoryMapAddView, StoryMapUpdateView
+from .views import StoryMapAddView, StoryMapMediaUploadTargetView, StoryMapUpdateView
 
 app_name = "apps.shared_data"
 
 urlpatterns = [
     path("update/", csrf_exempt(StoryMapUpdateView.as_view()), name="update"),
     path("add/", csrf_exempt(StoryMapAddView.as_view()), name="add"),
+    path(
+        "media/upload/target/",
+        csrf_exempt(StoryMapMediaUploadTargetView.as_view()),
+        name="media-upload-target",
+    ),
 ]
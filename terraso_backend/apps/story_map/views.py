@@ -16,21 +16,34 @@
 import json
 import secrets
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import asdict
 from datetime import datetime
+from functools import partial
 
+import magic
 import rules
 import structlog
 from config.settings import MEDIA_UPLOAD_MAX_FILE_SIZE
+from django.conf import settings
 from django.core.exceptions import NON_FIELD_ERRORS, ValidationError
-from django.db import IntegrityError
+from django.db import IntegrityError, connections
 from django.http import JsonResponse
 from django.utils import timezone
+from django.views import View
 from django.views.generic.edit import FormView
 
 from apps.auth.mixins import AuthenticationRequiredMixin
 from apps.core.exceptions import ErrorContext, ErrorMessage
+from apps.storage.direct_uploads import (
+    FILE_SIZE_EXCEEDED,
+    DirectUploadError,
+    create_upload,
+    finalize_upload,
+    open_uploaded_file,
+)
 from apps.storage.file_utils import is_file_upload_oversized
+from apps.storage.upload_handlers import UploadValidationMixin
 
 from .forms import StoryMapForm
 from .models import StoryMap
@@ -39,7 +52,16 @@ from .services import story_map_media_upload_service
 logger = structlog.get_logger(__name__)
 
 
-class StoryMapAddView(AuthenticationRequiredMixin, FormView):
+class StoryMapMediaUploadMixin(UploadValidationMixin):
+    # The kind of each media is declared in the configuration, so files are
+    # only checked for size while received
+    upload_max_size = MEDIA_UPLOAD_MAX_FILE_SIZE
+
+    def get_upload_error_response(self, error):
+        return direct_upload_error_response(error)
+
+
+class StoryMapAddView(AuthenticationRequiredMixin, StoryMapMediaUploadMixin, FormView):
     def post(self, request, **kwargs):
         form_data = request.POST.copy()
 
@@ -78,7 +100,10 @@ class StoryMapAddView(AuthenticationRequiredMixin, FormView):
 
         try:
             configuration = handle_config_media(config, None, request)
+        except DirectUploadError as error:
+            return direct_upload_error_response(error)
 
+        try:
             story_map = StoryMap.objects.create(
                 story_map_id=secrets.token_hex(4),
                 created_by=form_data["created_by"],
@@ -94,7 +119,7 @@ class StoryMapAddView(AuthenticationRequiredMixin, FormView):
         return JsonResponse(story_map.to_dict(), status=201)
 
 
-class StoryMapUpdateView(AuthenticationRequiredMixin, FormView):
+class StoryMapUpdateView(AuthenticationRequiredMixin, StoryMapMediaUploadMixin, FormView):
     def post(self, request, **kwargs):
         user = request.user
         form_data = request.POST.copy()
@@ -137,7 +162,10 @@ class StoryMapUpdateView(AuthenticationRequiredMixin, FormView):
             )
             return JsonResponse({"errors": [{"message": [asdict(error_message)]}]}, status=400)
 
-        story_map.configuration = handle_config_media(new_config, story_map, request)
+        try:
+            story_map.configuration = handle_config_media(new_config, story_map, request)
+        except DirectUploadError as error:
+            return direct_upload_error_response(error)
         if publish:
             story_map.published_configuration = story_map.configuration
 
@@ -169,19 +197,86 @@ class StoryMapUpdateView(AuthenticationRequiredMixin, FormView):
         return JsonResponse(story_map.to_dict(), status=201)
 
 
-def _upload_file(request, content_id):
-    """Upload a file and return its URL."""
-    matching_file = next(
+class StoryMapMediaUploadTargetView(AuthenticationRequiredMixin, View):
+    """
+    First step of a direct media upload, see apps.storage.direct_uploads. The
+    returned upload token replaces the contentId of the media in the
+    configuration sent to the add and update views.
+    """
+
+    def post(self, request, **kwargs):
+        try:
+            size = int(request.POST.get("size", ""))
+        except ValueError:
+            size = None
+
+        if size is None or size <= 0:
+            error_message = ErrorMessage(
+                code="invalid_upload",
+                context=ErrorContext(model="StoryMap", field="files"),
+            )
+            return JsonResponse({"errors": [{"message": [asdict(error_message)]}]}, status=400)
+        if size > MEDIA_UPLOAD_MAX_FILE_SIZE:
+            error_message = ErrorMessage(
+                code=FILE_SIZE_EXCEEDED,
+                context=ErrorContext(model="StoryMap", field="files"),
+            )
+            return JsonResponse({"errors": [{"message": [asdict(error_message)]}]}, status=400)
+
+        file_name = str(uuid.uuid4())
+        path = story_map_media_upload_service.get_path_on_storage(str(request.user.id), file_name)
+        upload = create_upload(
+            story_map_media_upload_service,
+            request.user.id,
+            path,
+            file_name,
+            size,
+            MEDIA_UPLOAD_MAX_FILE_SIZE,
+        )
+        return JsonResponse(upload, status=201)
+
+
+def direct_upload_error_response(error):
+    error_message = ErrorMessage(
+        code=error.code,
+        context=ErrorContext(model="StoryMap", field="files"),
+    )
+    return JsonResponse({"errors": [{"message": [asdict(error_message)]}]}, status=400)
+
+
+def _finalize_media_upload(request, upload_token, media_type):
+    """Completes a direct media upload and returns its path, see StoryMapMediaUploadTargetView"""
+    uploaded_object = finalize_upload(
+        story_map_media_upload_service,
+        request.user.id,
+        upload_token,
+        MEDIA_UPLOAD_MAX_FILE_SIZE,
+    )
+
+    # The content has to be of the declared kind of media (image, audio or video)
+    with open_uploaded_file(story_map_media_upload_service, uploaded_object) as file:
+        file_mime_type = magic.from_buffer(file.read(2048), mime=True)
+    if file_mime_type.split("/")[0] != media_type.split("/")[0]:
+        story_map_media_upload_service.delete_file(uploaded_object.path)
+        raise DirectUploadError("Invalid Media Type")
+
+    return uploaded_object.path
+
+
+def _get_uploaded_file(request, content_id):
+    return next(
         (file for file in request.FILES.getlist("files") if file.name == content_id),
         None,
     )
-    if matching_file:
-        return story_map_media_upload_service.upload_file_get_path(
-            str(request.user.id),
-            matching_file,
-            file_name=uuid.uuid4(),
-        )
-    return None
+
+
+def _upload_file(user_id, file):
+    """Upload a file and return its URL."""
+    return story_map_media_upload_service.upload_file_get_path(
+        str(user_id),
+        file,
+        file_name=uuid.uuid4(),
+    )
 
 
 def _extract_media_urls(config):
@@ -200,30 +295,103 @@ def _extract_media_urls(config):
     return chapter_urls + featured_url
 
 
-def _upload_chapter_media(config, request):
-    for chapter in config.get("chapters", []):
-        media = chapter.get("media")
-        if media and "contentId" in media:
-            url = _upload_file(request, media["contentId"])
-            if url:
-                chapter["media"] = {"url": url, "type": media["type"]}
+def _get_media_upload(request, media, media_type):
+    """
+    Function uploading new media and returning its URL, None when the media
+    is already stored or its file wasn't sent
+    """
+    if "contentId" in media:
+        file = _get_uploaded_file(request, media["contentId"])
+        return partial(_upload_file, request.user.id, file) if file else None
+    if "uploadToken" in media:
+        return partial(_finalize_media_upload, request, media["uploadToken"], media_type)
+    return None
 
 
-def _upload_featured_image(config, request):
-    featured_image = config.get("featuredImage")
-    if not featured_image or "contentId" not in featured_image:
-        return
+def _set_chapter_media(chapter, url):
+    chapter["media"] = {"url": url, "type": chapter["media"]["type"]}
 
-    url = _upload_file(request, featured_image["contentId"])
-    if not url:
-        return
 
+def _set_featured_image(config, url):
+    featured_image = config["featuredImage"]
     new_featured_image = {"url": url}
     if "description" in featured_image:
         new_featured_image["description"] = featured_image["description"]
     config["featuredImage"] = new_featured_image
 
 
+def _delete_media(media_paths):
+    if not media_paths:
+        return
+    try:
+        failed = story_map_media_upload_service.delete_files(media_paths)
+    except Exception as e:
+        logger.exception(
+            "Unable to delete media files",
+            extra={"media_paths": media_paths, "error": str(e)},
+        )
+        return
+
+    for media_path, error in failed.items():
+        logger.error(
+            "Unable to delete media file",
+            extra={"media_path": media_path, "error": error},
+        )
+
+
+def _run_media_upload_in_thread(upload):
+    try:
+        return upload()
+    finally:
+        # Uploads may query the database, from connections of this thread
+        connections.close_all()
+
+
+def _run_media_uploads(uploads):
+    """
+    Runs the uploads, up to STORY_MAP_MEDIA_UPLOAD_CONCURRENCY at the same
+    time, and returns their URLs in order. If any fails, the media that was
+    uploaded is deleted and the first error (in configuration order) is
+    raised once all of them have finished.
+    """
+    concurrency = min(settings.STORY_MAP_MEDIA_UPLOAD_CONCURRENCY, len(uploads))
+    if concurrency <= 1:
+        urls = []
+        for upload in uploads:
+            try:
+                urls.append(upload())
+            except Exception:
+                _delete_media(urls)
+                raise
+        return urls
+
+    with ThreadPoolExecutor(concurrency) as executor:
+        futures = [executor.submit(_run_media_upload_in_thread, upload) for upload in uploads]
+    errors = [future.exception() for future in futures if future.exception() is not None]
+    if errors:
+        _delete_media([future.result() for future in futures if future.exception() is None])
+        raise errors[0]
+    return [future.result() for future in futures]
+
+
+def _upload_config_media(config, request):
+    pending = []
+    for chapter in config.get("chapters", []):
+        media = chapter.get("media")
+        upload = _get_media_upload(request, media, media["type"]) if media else None
+        if upload:
+            pending.append((upload, partial(_set_chapter_media, chapter)))
+
+    featured_image = config.get("featuredImage")
+    upload = _get_media_upload(request, featured_image, "image") if featured_image else None
+    if upload:
+        pending.append((upload, partial(_set_featured_image, config)))
+
+    urls = _run_media_uploads([upload for upload, _ in pending])
+    for (_, set_url), url in zip(pending, urls):
+        set_url(url)
+
+
 def _cleanup_unused_media(current_config, new_config, published_config):
     current_media = _extract_media_urls(current_config)
 
@@ -235,27 +403,18 @@ def _cleanup_unused_media(current_config, new_config, published_config):
     for config in active_configs:
         new_media.extend(_extract_media_urls(config))
 
-    for media_path in current_media:
-        if media_path not in new_media:
-            try:
-                story_map_media_upload_service.delete_file(media_path)
-            except Exception as e:
-                logger.exception(
-                    "Unable to delete media file",
-                    extra={"media_path": media_path, "error": str(e)},
-                )
+    _delete_media([media_path for media_path in current_media if media_path not in new_media])
 
 
 def handle_config_media(new_config, story_map, request):
     """
     Handle media files for story map configuration.
 
-    1. Upload new media files to S3
+    1. Upload new media files to S3, or complete their direct uploads, concurrently
     2. Update configuration with uploaded URLs
     3. Delete unused media files from S3
     """
-    _upload_chapter_media(new_config, request)
-    _upload_featured_image(new_config, request)
+    _upload_config_media(new_config, request)
 
     if story_map and story_map.configuration:
         _cleanup_unused_media(
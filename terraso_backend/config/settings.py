@@ -265,6 +265,10 @@ GRAPHENE = {
     "RELAY_CONNECTION_MAX_LIMIT": config("RELAY_CONNECTION_MAX_LIMIT", default=1000),
 }
 
+# Serve GraphQL with the async view so I/O-bound resolvers can overlap.
+# Only useful when running under an ASGI server (see config/asgi.py).
+GRAPHQL_ASYNC_EXECUTION = config("GRAPHQL_ASYNC_EXECUTION", default=False, cast=config.boolean)
+
 WEB_CLIENT_DOMAIN = config("WEB_CLIENT_DOMAIN", default="")
 WEB_CLIENT_PORT = config("WEB_CLIENT_PORT", default=443)
 WEB_CLIENT_PROTOCOL = config("WEB_CLIENT_PROTOCOL", default="https")
@@ -329,6 +333,11 @@ DATA_ENTRY_SPREADSHEET_TYPES = {
     ".xlsx": None,
 }
 
+# Rows of spreadsheets read to infer the column types of their previews, and
+# rows included in them, see apps.shared_data.datasets
+DATA_ENTRY_PREVIEW_ROWS = config("DATA_ENTRY_PREVIEW_ROWS", default="100", cast=int)
+DATA_ENTRY_PREVIEW_SAMPLE_ROWS = config("DATA_ENTRY_PREVIEW_SAMPLE_ROWS", default="10", cast=int)
+
 DATA_ENTRY_GIS_TYPES = {
     ".geojson": ["text/plain", "application/json", "application/geo+json"],
     ".json": ["text/plain", "application/json", "application/geo+json"],
@@ -338,6 +347,46 @@ DATA_ENTRY_GIS_TYPES = {
     ".zip": ["application/zip"],
 }
 
+# Shapefile zips and KMZ files whose contents add up to more than this are not parsed
+GIS_ARCHIVE_MAX_UNCOMPRESSED_SIZE = config(
+    "GIS_ARCHIVE_MAX_UNCOMPRESSED_SIZE", default="500000000", cast=int
+)  # 500MB
+
+# Number of worker processes (per web worker) parsing GIS files to GeoJSON.
+# 0 parses them in the web worker.
+GIS_PARSING_PROCESS_POOL_SIZE = config("GIS_PARSING_PROCESS_POOL_SIZE", default="0", cast=int)
+GIS_PARSING_TIMEOUT_SECONDS = config("GIS_PARSING_TIMEOUT_SECONDS", default="60", cast=config.eval)
+# Address space limit of each GIS parsing worker, 0 for no limit
+GIS_PARSING_WORKER_MEMORY_LIMIT_MB = config(
+    "GIS_PARSING_WORKER_MEMORY_LIMIT_MB", default="2048", cast=int
+)
+
+# Simplification tolerance in degrees of each level of detail served for landscape
+# boundaries and GIS data entries. Geometries with fewer vertices than
+# GIS_SIMPLIFICATION_MIN_VERTICES are always served at full detail.
+GIS_SIMPLIFICATION_TOLERANCES = config(
+    "GIS_SIMPLIFICATION_TOLERANCES",
+    default="{'high': 0.0001, 'medium': 0.001, 'low': 0.01}",
+    cast=config.eval,
+)
+GIS_SIMPLIFICATION_MIN_VERTICES = config(
+    "GIS_SIMPLIFICATION_MIN_VERTICES", default="1000", cast=int
+)
+
+# Serve visualizations as vector tiles generated by the backend, for datasets of up
+# to VISUALIZATION_TILES_MAX_FEATURES features. Larger ones need the Mapbox tileset.
+VISUALIZATION_TILES_ENABLED = config(
+    "VISUALIZATION_TILES_ENABLED", default=False, cast=config.boolean
+)
+VISUALIZATION_TILES_MAX_FEATURES = config(
+    "VISUALIZATION_TILES_MAX_FEATURES", default="50000", cast=int
+)
+VISUALIZATION_TILES_MAX_ZOOM = config("VISUALIZATION_TILES_MAX_ZOOM", default="16", cast=int)
+# Seconds clients may reuse a tile without revalidating it
+VISUALIZATION_TILES_CACHE_MAX_AGE = config(
+    "VISUALIZATION_TILES_CACHE_MAX_AGE", default="3600", cast=int
+)
+
 DATA_ENTRY_MEDIA_TYPES = {
     ".jpg": ["image/jpeg"],
     ".jpeg": ["image/jpeg"],
@@ -386,8 +435,25 @@ RENDER_API_TOKEN = config("RENDER_API_TOKEN", default="")
 DATA_UPLOAD_MAX_MEMORY_SIZE = 70000000  # 70MB
 MEDIA_UPLOAD_MAX_FILE_SIZE = 50000000  # 50MB
 
+# Signed URLs of stored files are reused (per process, up to SIGNED_URL_CACHE_SIZE
+# of them) until this many seconds before they expire, 0 disables the cache
+SIGNED_URL_CACHE_SIZE = config("SIGNED_URL_CACHE_SIZE", default="10000", cast=int)
+SIGNED_URL_CACHE_MARGIN_SECONDS = config("SIGNED_URL_CACHE_MARGIN_SECONDS", default="600", cast=int)
+
+# Direct uploads from clients to storage, see apps.storage.direct_uploads
+DIRECT_UPLOAD_EXPIRES_IN = config("DIRECT_UPLOAD_EXPIRES_IN", default="3600", cast=int)
+# Larger files are uploaded in parts of DIRECT_UPLOAD_PART_SIZE (at least 5MB)
+DIRECT_UPLOAD_MULTIPART_THRESHOLD = config(
+    "DIRECT_UPLOAD_MULTIPART_THRESHOLD", default="20000000", cast=int
+)  # 20MB
+DIRECT_UPLOAD_PART_SIZE = config("DIRECT_UPLOAD_PART_SIZE", default="10000000", cast=int)  # 10MB
+
 STORY_MAP_MEDIA_S3_BUCKET = config("STORY_MAP_MEDIA_S3_BUCKET", default="")
 STORY_MAP_MEDIA_BASE_URL = f"https://{STORY_MAP_MEDIA_S3_BUCKET}"
+# Media files of a story map uploaded (or direct uploads completed) at the same time
+STORY_MAP_MEDIA_UPLOAD_CONCURRENCY = config(
+    "STORY_MAP_MEDIA_UPLOAD_CONCURRENCY", default="4", cast=int
+)
 
 PUBLIC_BASE_PATHS = [
     "/admin/",  # Authentication handled by Django
@@ -399,6 +465,29 @@ PUBLIC_BASE_PATHS = [
 
 HARD_DELETE_DELETION_GAP = config("HARD_DELETE_DELETION_GAP_DAYS", default="30", cast=config.eval)
 
+# Background jobs (see apps/core/jobs.py), run by the run_jobs management command.
+# JOB_QUEUE_RUN_INLINE runs jobs as soon as they are enqueued instead, for environments
+# without a worker.
+JOB_QUEUE_RUN_INLINE = config("JOB_QUEUE_RUN_INLINE", default=False, cast=config.boolean)
+# Jobs run at the same time by each worker
+JOB_QUEUE_CONCURRENCY = config("JOB_QUEUE_CONCURRENCY", default="4", cast=int)
+JOB_QUEUE_POLL_SECONDS = config("JOB_QUEUE_POLL_SECONDS", default="2", cast=config.eval)
+JOB_QUEUE_MAX_ATTEMPTS = config("JOB_QUEUE_MAX_ATTEMPTS", default="5", cast=int)
+# Failed attempts are retried after BACKOFF_SECONDS * 2^(attempt - 1), up to MAX_BACKOFF_SECONDS
+JOB_QUEUE_RETRY_BACKOFF_SECONDS = config(
+    "JOB_QUEUE_RETRY_BACKOFF_SECONDS", default="30", cast=config.eval
+)
+JOB_QUEUE_RETRY_MAX_BACKOFF_SECONDS = config(
+    "JOB_QUEUE_RETRY_MAX_BACKOFF_SECONDS", default="3600", cast=config.eval
+)
+# Workers refresh the lock of their running jobs this often
+JOB_QUEUE_HEARTBEAT_SECONDS = config("JOB_QUEUE_HEARTBEAT_SECONDS", default="60", cast=config.eval)
+# Running jobs whose lock wasn't refreshed for this long are assumed lost with their worker
+# and retried
+JOB_QUEUE_STALE_SECONDS = config("JOB_QUEUE_STALE_SECONDS", default="3600", cast=config.eval)
+# Finished jobs are deleted after this many days
+JOB_QUEUE_RETENTION_DAYS = config("JOB_QUEUE_RETENTION_DAYS", default="14", cast=config.eval)
+
 
 class JWTProvider(TypedDict):
     """Type hint to indicate correct config for JWT_EXCHANGE_PROVIDERS"""
@@ -431,6 +520,10 @@ JWT_EXCHANGE_PROVIDERS: dict[str, JWTProvider] = {
 MAPBOX_API_URL = config("MAPBOX_API_URL", default="https://api.mapbox.com")
 MAPBOX_USERNAME = config("MAPBOX_USERNAME", default="")
 MAPBOX_ACCESS_TOKEN = config("MAPBOX_ACCESS_TOKEN", default="")
+# Tileset sources are written to memory up to this size (in bytes), then to a temporary file
+MAPBOX_TILESET_SOURCE_SPOOL_MAX_SIZE = config(
+    "MAPBOX_TILESET_SOURCE_SPOOL_MAX_SIZE", default="10485760", cast=int
+)
 
 if config("SENTRY_DSN", default=""):
     sentry_sdk.init(
@@ -460,3 +553,57 @@ HUBSPOT_ACCOUNT_DELETION_FORM_API_URL = (
 GLOBAL_SOIL_ID_BUFFER_DISTANCE = config(
     "GLOBAL_SOIL_ID_BUFFER_DISTANCE", default="30000", cast=config.eval
 )
+
+# Soil ID cache entries are refreshed after these many seconds (None never expires them).
+# Expired entries are still served, and refreshed in the background, for up to
+# SOIL_ID_CACHE_STALE_WHILE_REVALIDATE_SECONDS more; older ones are recomputed before responding.
+SOIL_ID_CACHE_TTL_SECONDS = config(
+    "SOIL_ID_CACHE_TTL_SECONDS", default="7776000", cast=config.eval
+)  # 90 days
+SOIL_ID_CACHE_FAILURE_TTL_SECONDS = config(
+    "SOIL_ID_CACHE_FAILURE_TTL_SECONDS", default="86400", cast=config.eval
+)  # 1 day
+SOIL_ID_CACHE_STALE_WHILE_REVALIDATE_SECONDS = config(
+    "SOIL_ID_CACHE_STALE_WHILE_REVALIDATE_SECONDS", default="2592000", cast=config.eval
+)  # 30 days
+
+# Store new soil ID cache entries zlib-compressed (see the compact_soil_id_cache command)
+SOIL_ID_CACHE_COMPRESS_PAYLOADS = config(
+    "SOIL_ID_CACHE_COMPRESS_PAYLOADS", default=True, cast=config.boolean
+)
+
+# Number of worker processes (per web worker) running the soil ID algorithm.
+# 0 runs the algorithm inline in the web worker.
+SOIL_ID_PROCESS_POOL_SIZE = config("SOIL_ID_PROCESS_POOL_SIZE", default="0", cast=int)
+# Soil ID list/rank calls running longer than this are cancelled and reported as failures.
+# Only enforced when running in the process pool.
+SOIL_ID_ALGORITHM_TIMEOUT_SECONDS = config(
+    "SOIL_ID_ALGORITHM_TIMEOUT_SECONDS", default="60", cast=config.eval
+)
+# Timeout for the list step, which calls the upstream soil data services
+SOIL_ID_LIST_SOILS_TIMEOUT_SECONDS = config(
+    "SOIL_ID_LIST_SOILS_TIMEOUT_SECONDS", default="30", cast=config.eval
+)
+
+# Circuit breaker around the list step. It opens when at least MIN_CALLS calls were made in
+# the last WINDOW_SECONDS and FAILURE_RATE of them failed or took longer than SLOW_CALL_SECONDS.
+# While open, requests get the nearest cached result (within SOIL_ID_NEAREST_CACHE_DEGREES)
+# or a DATA_UNAVAILABLE failure, and one probe call is let through every OPEN_SECONDS.
+SOIL_ID_CIRCUIT_BREAKER_FAILURE_RATE = config(
+    "SOIL_ID_CIRCUIT_BREAKER_FAILURE_RATE", default="0.5", cast=config.eval
+)
+SOIL_ID_CIRCUIT_BREAKER_MIN_CALLS = config(
+    "SOIL_ID_CIRCUIT_BREAKER_MIN_CALLS", default="10", cast=int
+)
+SOIL_ID_CIRCUIT_BREAKER_WINDOW_SECONDS = config(
+    "SOIL_ID_CIRCUIT_BREAKER_WINDOW_SECONDS", default="60", cast=config.eval
+)
+SOIL_ID_CIRCUIT_BREAKER_SLOW_CALL_SECONDS = config(
+    "SOIL_ID_CIRCUIT_BREAKER_SLOW_CALL_SECONDS", default="20", cast=config.eval
+)
+SOIL_ID_CIRCUIT_BREAKER_OPEN_SECONDS = config(
+    "SOIL_ID_CIRCUIT_BREAKER_OPEN_SECONDS", default="30", cast=config.eval
+)
+SOIL_ID_NEAREST_CACHE_DEGREES = config(
+    "SOIL_ID_NEAREST_CACHE_DEGREES", default="0.01", cast=config.eval
+)
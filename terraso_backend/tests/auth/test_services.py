@@ -37,10 +37,12 @@ def user():
 
 @mock_aws
 @mock.patch("urllib.request.urlopen", mock.mock_open(read_data="file content"))
-# Mocked Model get because of multithreading context
 @mock.patch("apps.storage.tasks.User.objects.get")
 @mock.patch("apps.storage.services.ProfileImageService.upload_url")
-def test_sign_up_with_google_creates_user(mock_upload, mock_get, respx_mock, access_tokens_google):
+def test_sign_up_with_google_creates_user(
+    mock_upload, mock_get, respx_mock, access_tokens_google, settings
+):
+    settings.JOB_QUEUE_RUN_INLINE = True
     mock_upload.return_value = "https://test.com/user-id/image-path"
     mock_get.return_value = User(id="test_id")
     respx_mock.post(GoogleProvider.GOOGLE_TOKEN_URI).mock(
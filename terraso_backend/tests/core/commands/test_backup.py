@@ -0,0 +1,218 @@
+# Copyright © 2026 Technology Matters
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see https://www.gnu.org/licenses/.
+
+import gzip
+import json
+
+import pytest
+from django.core.management import CommandError, call_command
+from mixer.backend.django import mixer
+
+from apps.core.management.commands.backup import Command as BackupCommand
+from apps.core.management.commands.loadbackup import Command as LoadBackupCommand
+from apps.core.models import User
+from apps.story_map.models import StoryMap
+
+
+# The backup threads use their own connections, so the data has to be committed
+@pytest.mark.django_db(transaction=True)
+def test_parallel_backup(tmp_path):
+    users = mixer.cycle(3).blend(User)
+
+    call_command("backup", parallel=True, workers=2, chunk_size=2, directory=tmp_path)
+
+    (backup_dir,) = tmp_path.iterdir()
+    manifest = json.loads((backup_dir / "manifest.json").read_text())
+    assert manifest["migrations"] == BackupCommand._query_migration_versions()
+    parts = {part["model"]: part for part in manifest["parts"]}
+    assert parts["core.user"]["objects"] == 3
+    assert "core.job" not in parts
+    assert "sessions.session" not in parts
+
+    with gzip.open(backup_dir / parts["core.user"]["file"], "rt") as fp:
+        objects = [json.loads(line) for line in fp]
+    assert sorted(obj["fields"]["email"] for obj in objects) == sorted(user.email for user in users)
+    assert sorted(path.name for path in backup_dir.iterdir()) == sorted(
+        [*(part["file"] for part in manifest["parts"]), "manifest.json"]
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_incremental_backup(tmp_path):
+    user = mixer.blend(User)
+    unchanged, changed, deleted = mixer.cycle(3).blend(StoryMap, created_by=user)
+    call_command("backup", parallel=True, directory=tmp_path)
+    (full_backup,) = tmp_path.iterdir()
+
+    changed.title = "Changed"
+    changed.save()
+    created = mixer.blend(StoryMap, created_by=user)
+    deleted.delete()
+    call_command("backup", parallel=True, incremental=True, overlap_minutes=0, directory=tmp_path)
+
+    (incremental_backup,) = [path for path in tmp_path.iterdir() if path != full_backup]
+    manifest = json.loads((incremental_backup / "manifest.json").read_text())
+    assert manifest["previous"] == full_backup.name
+    parts = {part["model"]: part for part in manifest["parts"]}
+    # Users have a natural key, so are backed up whole
+    assert parts["core.user"]["pks"] is None
+    assert parts["core.user"]["objects"] == 1
+
+    with gzip.open(incremental_backup / parts["story_map.storymap"]["file"], "rt") as fp:
+        objects = [json.loads(line) for line in fp]
+    assert sorted(obj["pk"] for obj in objects) == sorted([str(changed.id), str(created.id)])
+    with gzip.open(incremental_backup / parts["story_map.storymap"]["pks"], "rt") as fp:
+        pks = fp.read().split()
+    assert sorted(pks) == sorted(str(story_map.id) for story_map in (unchanged, changed, created))
+
+
+def test_find_latest_backup_dir(tmp_path):
+    for name in (
+        "backup_2026-01-01T00:00:00_data.json.gz",
+        "backup_2026-01-01T00:00:00_migrations.json",
+    ):
+        (tmp_path / name).touch()
+    parallel_backup = tmp_path / "backup_2026-02-01T00:00:00"
+    parallel_backup.mkdir()
+    (parallel_backup / "manifest.json").write_text(
+        json.dumps(
+            {"migrations": {}, "parts": [{"model": "core.user", "file": "core.user.jsonl.gz"}]}
+        )
+    )
+    # Incomplete backups have no manifest
+    (tmp_path / "backup_2026-03-01T00:00:00").mkdir()
+
+    fixtures, manifest_file, pks_files = LoadBackupCommand._find_latest_backup_dir(tmp_path)
+
+    assert fixtures == [("core.user", parallel_backup / "core.user.jsonl.gz")]
+    assert manifest_file == parallel_backup / "manifest.json"
+    assert pks_files == {}
+
+    (tmp_path / "backup_2026-04-01T00:00:00_data.json.gz").touch()
+    (tmp_path / "backup_2026-04-01T00:00:00_migrations.json").touch()
+
+    fixtures, migrations_file, pks_files = LoadBackupCommand._find_latest_backup_dir(tmp_path)
+
+    assert fixtures == [(None, tmp_path / "backup_2026-04-01T00:00:00_data.json.gz")]
+    assert migrations_file == tmp_path / "backup_2026-04-01T00:00:00_migrations.json"
+    assert pks_files == {}
+
+
+def test_find_latest_backup_dir_incremental(tmp_path):
+    def write_backup(name, previous, parts):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "manifest.json").write_text(
+            json.dumps({"migrations": {}, "previous": previous, "parts": parts})
+        )
+
+    write_backup(
+        "backup_2026-01-01T00:00:00",
+        None,
+        [
+            {"model": "core.group", "file": "core.group.jsonl.gz", "pks": None},
+            {"model": "core.user", "file": "core.user.jsonl.gz", "pks": None},
+        ],
+    )
+    for name, previous in (
+        ("backup_2026-01-02T00:00:00", "backup_2026-01-01T00:00:00"),
+        ("backup_2026-01-03T00:00:00", "backup_2026-01-02T00:00:00"),
+    ):
+        write_backup(
+            name,
+            previous,
+            [
+                {"model": "core.group", "file": "core.group.jsonl.gz", "pks": None},
+                {"model": "core.user", "file": "core.user.jsonl.gz", "pks": "core.user.pks.gz"},
+            ],
+        )
+
+    fixtures, manifest_file, pks_files = LoadBackupCommand._find_latest_backup_dir(tmp_path)
+
+    # Fully dumped models are only loaded from the latest backup
+    assert fixtures == [
+        ("core.user", tmp_path / "backup_2026-01-01T00:00:00" / "core.user.jsonl.gz"),
+        ("core.user", tmp_path / "backup_2026-01-02T00:00:00" / "core.user.jsonl.gz"),
+        ("core.group", tmp_path / "backup_2026-01-03T00:00:00" / "core.group.jsonl.gz"),
+        ("core.user", tmp_path / "backup_2026-01-03T00:00:00" / "core.user.jsonl.gz"),
+    ]
+    assert manifest_file == tmp_path / "backup_2026-01-03T00:00:00" / "manifest.json"
+    assert pks_files == {"core.user": tmp_path / "backup_2026-01-03T00:00:00" / "core.user.pks.gz"}
+
+
+def test_drop_deleted_rows(tmp_path):
+    def write_fixture(name, pks):
+        with gzip.open(tmp_path / name, "wt", encoding="utf-8") as fp:
+            for pk in pks:
+                fp.write(json.dumps({"model": "story_map.storymap", "pk": pk, "fields": {}}) + "\n")
+        return tmp_path / name
+
+    full = write_fixture("full.jsonl.gz", ["a", "deleted", "b"])
+    # Created after the full backup, and deleted by the next one
+    incremental = write_fixture("incremental.jsonl.gz", ["b", "short-lived"])
+    other = write_fixture("other.jsonl.gz", ["x"])
+    with gzip.open(tmp_path / "latest.pks.gz", "wt", encoding="utf-8") as fp:
+        fp.write("a\nb\n")
+
+    fixtures, copies = LoadBackupCommand._drop_deleted_rows(
+        [
+            ("story_map.storymap", full),
+            ("core.group", other),
+            ("story_map.storymap", incremental),
+        ],
+        {"story_map.storymap": tmp_path / "latest.pks.gz"},
+    )
+
+    assert fixtures == [copies[0], other, copies[1]]
+    for fixture, pks in zip(copies, (["a", "b"], ["b"])):
+        with gzip.open(fixture, "rt", encoding="utf-8") as fp:
+            assert [json.loads(line)["pk"] for line in fp] == pks
+
+
+@pytest.mark.django_db
+def test_rewrite_urls(settings):
+    settings.DB_RESTORE_SOURCE_HOST = "source.example.org"
+    settings.DB_RESTORE_DEST_HOST = "dest.example.org"
+    user = mixer.blend(User, profile_image="https://files.source.example.org/user.png")
+    other_user = mixer.blend(User, profile_image="https://other.example.org/user.png")
+    deleted_user = mixer.blend(User, profile_image="https://images.source.example.org/user.png")
+    deleted_user.delete()
+
+    call_command("loadbackup", only_rewrite_urls=True, dry_run=True)
+
+    user.refresh_from_db()
+    assert user.profile_image == "https://files.source.example.org/user.png"
+
+    call_command("loadbackup", only_rewrite_urls=True, batch_size=1)
+
+    user.refresh_from_db()
+    assert user.profile_image == "https://dest.example.org/user.png"
+    other_user.refresh_from_db()
+    assert other_user.profile_image == "https://other.example.org/user.png"
+    deleted_user = User._base_manager.get(pk=deleted_user.pk)
+    assert deleted_user.profile_image == "https://dest.example.org/user.png"
+
+
+def test_backup_parallel_options_require_parallel(tmp_path):
+    with pytest.raises(CommandError, match="--workers, --incremental can only be used"):
+        call_command("backup", incremental=True, workers=2)
+    with pytest.raises(CommandError, match="--directory can only be used"):
+        call_command("backup", directory=tmp_path)
+    with pytest.raises(CommandError, match="--overlap-minutes can only be used"):
+        call_command("backup", overlap_minutes=0)
+
+
+def test_loadbackup_dry_run_requires_only_rewrite_urls():
+    with pytest.raises(CommandError):
+        call_command("loadbackup", dry_run=True)
@@ -0,0 +1,47 @@
+# Copyright © 2026 Technology Matters
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see https://www.gnu.org/licenses/.
+
+import subprocess
+import sys
+
+from apps.core.management.commands.profile_imports import parse_import_times
+
+IMPORT_TIME_OUTPUT = """import time: self [us] | cumulative | imported package
+import time:       234 |        234 |       _json
+import time:       472 |        705 |     json.scanner
+import time:       693 |       9970 |   json.decoder
+import time:       346 |      11808 | json
+"""
+
+
+def test_parse_import_times():
+    assert parse_import_times(IMPORT_TIME_OUTPUT) == [
+        ("_json", 234, 234, 3),
+        ("json.scanner", 472, 705, 2),
+        ("json.decoder", 693, 9970, 1),
+        ("json", 346, 11808, 0),
+    ]
+
+
+def test_gis_modules_do_not_import_gis_stack():
+    script = (
+        "import sys; "
+        "import apps.core.gis.file_types, apps.core.gis.parsing, apps.core.gis.utils; "
+        "print(','.join(sorted({'fiona', 'geopandas', 'pyproj', 'shapely'} & set(sys.modules))))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == ""
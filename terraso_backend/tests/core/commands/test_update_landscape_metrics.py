@@ -0,0 +1,63 @@
+# Copyright © 2026 Technology Matters
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see https://www.gnu.org/licenses/.
+
+import pytest
+from django.core.management import call_command
+from mixer.backend.django import mixer
+
+from apps.core.models import Landscape
+
+pytestmark = pytest.mark.django_db
+
+
+def _square(size):
+    return {
+        "type": "FeatureCollection",
+        "features": [
+            {
+                "type": "Feature",
+                "geometry": {
+                    "type": "Polygon",
+                    "coordinates": [[[0, 0], [size, 0], [size, size], [0, size], [0, 0]]],
+                },
+            }
+        ],
+    }
+
+
+def test_update_landscape_metrics():
+    landscapes = [mixer.blend(Landscape, area_polygon=_square(size)) for size in (1, 2, 3)]
+    Landscape.objects.update(area_bbox=None, area_vertex_count=None)
+
+    call_command("update_landscape_metrics", batch_size=2)
+
+    for landscape, size in zip(landscapes, (1, 2, 3)):
+        landscape.refresh_from_db()
+        assert landscape.area_bbox == [0, 0, size, size]
+        assert landscape.area_vertex_count == 5
+
+
+def test_update_landscape_metrics_skips_invalid_boundary():
+    valid = mixer.blend(Landscape, area_polygon=_square(1))
+    invalid = mixer.blend(Landscape)
+    Landscape.objects.filter(id=invalid.id).update(area_polygon={"type": "FeatureCollection"})
+    Landscape.objects.update(area_bbox=None, area_vertex_count=None)
+
+    call_command("update_landscape_metrics")
+
+    valid.refresh_from_db()
+    invalid.refresh_from_db()
+    assert valid.area_vertex_count == 5
+    assert invalid.area_vertex_count is None
@@ -16,11 +16,15 @@
 import json
 import os
 import tempfile
+import zipfile
 from importlib import resources
 
+import geopandas as gpd
 import pytest
+from django.core.exceptions import ValidationError
 
 from apps.core.gis.parsers import parse_file_to_geojson
+from apps.core.gis.utils import DEFAULT_CRS
 
 KMZ_TEST_FILES = [
     ("resources/gis/kmz_sample_1.kmz", "resources/gis/kmz_sample_1_geojson.json"),
@@ -268,3 +272,72 @@ def test_parse_gpx_file(gpx_file):
 
     # Assert that the output of the parse_gpx_file function is as expected
     assert gpx_json == GPX_GEOJSON
+
+
+GPX_WITH_TIME_CONTENT = """<?xml version="1.0" standalone="yes"?>
+<gpx xmlns="http://www.topografix.com/GPX/1/1" version="1.1">
+    <wpt lat="45.52" lon="-122.681944">
+        <time>2024-05-01T12:30:00Z</time>
+        <name><![CDATA[Portland]]></name>
+    </wpt>
+    <wpt lat="-22.908333" lon="-43.196389">
+        <name><![CDATA[Rio de Janeiro]]></name>
+    </wpt>
+</gpx>"""
+
+
+@pytest.mark.parametrize(
+    "gpx_file",
+    [
+        (GPX_WITH_TIME_CONTENT, "gpx"),
+    ],
+    indirect=True,
+)
+def test_parse_gpx_file_with_timestamps(gpx_file):
+    with open(gpx_file, "rb") as file:
+        gpx_json = parse_file_to_geojson(file)
+
+    properties = [feature["properties"] for feature in gpx_json["features"]]
+    assert properties[0]["time"] == "2024-05-01T12:30:00+00:00"
+    assert properties[1]["time"] is None
+    assert properties[1]["name"] == "Rio de Janeiro"
+
+
+@pytest.fixture
+def multi_layer_shapefile_zip():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        zip_path = os.path.join(tmpdir, "layers.zip")
+        with zipfile.ZipFile(zip_path, "w") as zip_file:
+            for layer_name, x in [("first", 0), ("second", 1)]:
+                gdf = gpd.GeoDataFrame(
+                    {"layer": [layer_name], "geometry": gpd.points_from_xy([x], [x])},
+                    crs=DEFAULT_CRS,
+                )
+                layer_dir = os.path.join(tmpdir, layer_name)
+                os.mkdir(layer_dir)
+                gdf.to_file(os.path.join(layer_dir, f"{layer_name}.shp"))
+                for file_name in os.listdir(layer_dir):
+                    zip_file.write(os.path.join(layer_dir, file_name), f"{layer_name}/{file_name}")
+        yield zip_path
+
+
+def test_parse_multi_layer_shapefile(multi_layer_shapefile_zip):
+    with open(multi_layer_shapefile_zip, "rb") as file:
+        shapefile_json = parse_file_to_geojson(file)
+
+    assert [feature["properties"]["layer"] for feature in shapefile_json["features"]] == [
+        "first",
+        "second",
+    ]
+    assert [feature["geometry"]["coordinates"] for feature in shapefile_json["features"]] == [
+        [0.0, 0.0],
+        [1.0, 1.0],
+    ]
+
+
+def test_parse_shapefile_rejects_large_archive(settings, multi_layer_shapefile_zip):
+    settings.GIS_ARCHIVE_MAX_UNCOMPRESSED_SIZE = 100
+
+    with open(multi_layer_shapefile_zip, "rb") as file:
+        with pytest.raises(ValidationError):
+            parse_file_to_geojson(file)
@@ -0,0 +1,90 @@
+# Copyright © 2026 Technology Matters
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see https://www.gnu.org/licenses/.
+
+import io
+import json
+from unittest import mock
+
+import pytest
+from django.core.exceptions import ValidationError
+
+from apps.core.gis import parsing
+from apps.core.process_pool import WorkerCrashed, WorkerTimeout
+
+GEOJSON = {
+    "type": "FeatureCollection",
+    "features": [
+        {
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [-78.48, -0.16]},
+            "properties": {"name": "Point"},
+        }
+    ],
+}
+
+
+def _geojson_file():
+    file = io.BytesIO(json.dumps(GEOJSON).encode())
+    file.name = "test.geojson"
+    file.read()
+    return file
+
+
+def test_parse_inline_when_pool_disabled(settings):
+    settings.GIS_PARSING_PROCESS_POOL_SIZE = 0
+
+    with mock.patch("apps.core.gis.parsing._get_pool") as mock_get_pool:
+        geojson = parsing.parse_file_to_geojson(_geojson_file())
+
+    mock_get_pool.assert_not_called()
+    assert geojson["features"][0]["properties"] == {"name": "Point"}
+
+
+def test_parse_in_worker_sends_file_content(settings):
+    settings.GIS_PARSING_PROCESS_POOL_SIZE = 1
+    settings.GIS_PARSING_TIMEOUT_SECONDS = 5
+
+    with mock.patch("apps.core.gis.parsing._get_pool") as mock_get_pool:
+        mock_get_pool.return_value.run.side_effect = lambda func, *args, **kwargs: func(*args)
+        geojson = parsing.parse_file_to_geojson(_geojson_file())
+
+    _, file_name, content = mock_get_pool.return_value.run.call_args.args
+    assert file_name == "test.geojson"
+    assert json.loads(content) == GEOJSON
+    assert mock_get_pool.return_value.run.call_args.kwargs == {"timeout": 5}
+    assert geojson["features"][0]["properties"] == {"name": "Point"}
+
+
+@pytest.mark.parametrize(
+    "worker_error, error_code",
+    [(WorkerTimeout(), "parsing_timeout"), (WorkerCrashed(), "parsing_failed")],
+)
+def test_parse_in_worker_failure(settings, worker_error, error_code):
+    settings.GIS_PARSING_PROCESS_POOL_SIZE = 1
+
+    with mock.patch("apps.core.gis.parsing._get_pool") as mock_get_pool:
+        mock_get_pool.return_value.run.side_effect = worker_error
+        with pytest.raises(ValidationError) as error:
+            parsing.parse_file_to_geojson(_geojson_file())
+
+    assert error.value.message == error_code
+
+
+def test_parse_file_content_memory_error():
+    with mock.patch("apps.core.gis.parsers.parse_file_to_geojson", side_effect=MemoryError):
+        with pytest.raises(ValidationError) as error:
+            parsing._parse_file_content("test.geojson", b"{}")
+
+    assert error.value.message == "parsing_failed"
@@ -16,8 +16,14 @@
 import math
 
 from apps.core.gis.utils import (
+    calculate_geojson_centroid,
     calculate_geojson_feature_area,
+    calculate_geojson_metrics,
+    calculate_geojson_metrics_batch,
     calculate_geojson_polygon_area,
+    calculate_geojson_simplified_levels,
+    calculate_geojson_vertex_count,
+    get_simplified_geojson,
 )
 
 
@@ -29,3 +35,52 @@ def test_calculate_area(unit_polygon):
 def test_calculate_multipoly(usa_geojson):
     area = calculate_geojson_feature_area(usa_geojson)
     assert math.isclose(9510743744824, area, rel_tol=0.001)
+
+
+def test_calculate_simplified_levels(usa_geojson, settings):
+    settings.GIS_SIMPLIFICATION_MIN_VERTICES = 0
+    settings.GIS_SIMPLIFICATION_TOLERANCES = {"medium": 0.1, "low": 1}
+
+    levels = calculate_geojson_simplified_levels(usa_geojson)
+
+    vertex_count = calculate_geojson_vertex_count(usa_geojson)
+    assert 0 < calculate_geojson_vertex_count(levels["low"]) < vertex_count
+    assert calculate_geojson_vertex_count(levels["low"]) < calculate_geojson_vertex_count(
+        levels["medium"]
+    )
+    assert [feature["properties"] for feature in levels["low"]["features"]] == [
+        feature["properties"] for feature in usa_geojson["features"]
+    ]
+    assert get_simplified_geojson(levels, "low") == levels["low"]
+    assert get_simplified_geojson(levels, "full") is None
+
+
+def test_calculate_simplified_levels_small_geometry(usa_geojson, settings):
+    settings.GIS_SIMPLIFICATION_MIN_VERTICES = calculate_geojson_vertex_count(usa_geojson) + 1
+
+    assert calculate_geojson_simplified_levels(usa_geojson) == {}
+
+
+def test_calculate_metrics(usa_geojson):
+    metrics = calculate_geojson_metrics(usa_geojson)
+
+    assert metrics["area_scalar_m2"] == round(calculate_geojson_feature_area(usa_geojson), 3)
+    assert metrics["center_coordinates"] == calculate_geojson_centroid(usa_geojson)
+    assert metrics["vertex_count"] == calculate_geojson_vertex_count(usa_geojson)
+    min_lng, min_lat, max_lng, max_lat = metrics["bbox"]
+    assert min_lng < metrics["center_coordinates"]["lng"] < max_lng
+    assert min_lat < metrics["center_coordinates"]["lat"] < max_lat
+
+
+def test_calculate_metrics_batch(usa_geojson):
+    point = {"features": [{"geometry": {"type": "Point", "coordinates": [-104.9, 39.7]}}]}
+
+    assert calculate_geojson_metrics_batch([usa_geojson, point]) == [
+        calculate_geojson_metrics(usa_geojson),
+        {
+            "area_scalar_m2": 0,
+            "center_coordinates": {"lat": 39.7, "lng": -104.9},
+            "bbox": [-104.9, 39.7, -104.9, 39.7],
+            "vertex_count": 1,
+        },
+    ]
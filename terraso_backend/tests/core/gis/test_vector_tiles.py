@@ -0,0 +1,226 @@
+# Copyright © 2026 Technology Matters
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see https://www.gnu.org/licenses/.
+
+import struct
+
+import shapely
+
+from apps.core.gis.vector_tiles import (
+    encode_tile,
+    is_valid_tile,
+    project_to_web_mercator,
+    tile_bounds,
+)
+
+
+def read_varint(data, position):
+    value = shift = 0
+    while True:
+        byte = data[position]
+        position += 1
+        value |= (byte & 0x7F) << shift
+        shift += 7
+        if not byte & 0x80:
+            return value, position
+
+
+def read_fields(data):
+    position = 0
+    while position < len(data):
+        key, position = read_varint(data, position)
+        field, wire_type = key >> 3, key & 0x7
+        if wire_type == 0:
+            value, position = read_varint(data, position)
+        elif wire_type == 1:
+            value = struct.unpack("<d", data[position : position + 8])[0]
+            position += 8
+        else:
+            length, position = read_varint(data, position)
+            value = data[position : position + length]
+            position += length
+        yield field, value
+
+
+def read_packed(data):
+    position = 0
+    while position < len(data):
+        value, position = read_varint(data, position)
+        yield value
+
+
+def unzigzag(value):
+    return (value >> 1) ^ -(value & 1)
+
+
+def decode_geometry(commands):
+    """Decodes geometry commands to a list of (command, [(x, y)]) in tile coordinates"""
+    commands = list(commands)
+    x = y = 0
+    decoded = []
+    index = 0
+    while index < len(commands):
+        command, count = commands[index] & 0x7, commands[index] >> 3
+        index += 1
+        points = []
+        if command != 7:
+            for _ in range(count):
+                x += unzigzag(commands[index])
+                y += unzigzag(commands[index + 1])
+                index += 2
+                points.append((x, y))
+        decoded.append((command, points))
+    return decoded
+
+
+def decode_tile(data):
+    """Minimal MVT decoder, returns the layers as dicts"""
+    layers = []
+    for field, layer_data in read_fields(data):
+        assert field == 3
+        layer = {"features": [], "keys": [], "values": []}
+        for layer_field, value in read_fields(layer_data):
+            if layer_field == 1:
+                layer["name"] = value.decode()
+            elif layer_field == 2:
+                feature = {}
+                for feature_field, feature_value in read_fields(value):
+                    if feature_field == 1:
+                        feature["id"] = feature_value
+                    elif feature_field == 2:
+                        feature["tags"] = list(read_packed(feature_value))
+                    elif feature_field == 3:
+                        feature["type"] = feature_value
+                    elif feature_field == 4:
+                        feature["geometry"] = decode_geometry(read_packed(feature_value))
+                layer["features"].append(feature)
+            elif layer_field == 3:
+                layer["keys"].append(value.decode())
+            elif layer_field == 4:
+                ((value_field, decoded),) = read_fields(value)
+                if value_field == 1:
+                    decoded = decoded.decode()
+                elif value_field == 6:
+                    decoded = unzigzag(decoded)
+                elif value_field == 7:
+                    decoded = bool(decoded)
+                layer["values"].append(decoded)
+            elif layer_field == 5:
+                layer["extent"] = value
+            elif layer_field == 15:
+                layer["version"] = value
+        for feature in layer["features"]:
+            tags = feature.get("tags", [])
+            feature["properties"] = {
+                layer["keys"][key]: layer["values"][value]
+                for key, value in zip(tags[::2], tags[1::2])
+            }
+        layers.append(layer)
+    return layers
+
+
+def to_web_mercator(*geojson_geometries):
+    return project_to_web_mercator(shapely.from_geojson(list(geojson_geometries)))
+
+
+def test_tile_bounds():
+    assert tile_bounds(0, 0, 0) == (
+        -20037508.342789244,
+        -20037508.342789244,
+        20037508.342789244,
+        20037508.342789244,
+    )
+    min_x, min_y, max_x, max_y = tile_bounds(1, 1, 0)
+    assert (min_x, min_y) == (0, 0)
+    assert max_x == max_y == 20037508.342789244
+
+
+def test_is_valid_tile():
+    assert is_valid_tile(0, 0, 0)
+    assert is_valid_tile(2, 3, 3)
+    assert not is_valid_tile(2, 4, 0)
+    assert not is_valid_tile(1, 0, -1)
+
+
+def test_encode_tile_points_and_properties():
+    geometries = to_web_mercator(
+        '{"type": "Point", "coordinates": [0, 0]}',
+        '{"type": "Point", "coordinates": [-90, 0]}',
+    )
+    properties = [{"title": "first", "count": -3, "ratio": 0.5, "visible": True}, {"title": None}]
+
+    (layer,) = decode_tile(encode_tile("layer", geometries, properties, tile_bounds(0, 0, 0)))
+
+    assert layer["name"] == "layer"
+    assert layer["version"] == 2
+    assert layer["extent"] == 4096
+    assert [feature["id"] for feature in layer["features"]] == [1, 2]
+    assert [feature["type"] for feature in layer["features"]] == [1, 1]
+    assert layer["features"][0]["geometry"] == [(1, [(2048, 2048)])]
+    assert layer["features"][1]["geometry"] == [(1, [(1024, 2048)])]
+    assert layer["features"][0]["properties"] == {
+        "title": "first",
+        "count": -3,
+        "ratio": 0.5,
+        "visible": True,
+    }
+    assert layer["features"][1]["properties"] == {}
+
+
+def test_encode_tile_clips_to_tile_and_buffer():
+    geometries = to_web_mercator(
+        '{"type": "Point", "coordinates": [10, 10]}',
+        '{"type": "Point", "coordinates": [-10, 10]}',
+        '{"type": "LineString", "coordinates": [[-90, 10], [180, 10]]}',
+    )
+
+    (layer,) = decode_tile(encode_tile("layer", geometries, [{}, {}, {}], tile_bounds(2, 2, 1)))
+
+    # The point west of the tile is left out
+    assert [feature["id"] for feature in layer["features"]] == [1, 3]
+    ((move_to, (start,)), (line_to, (end,))) = layer["features"][1]["geometry"]
+    assert (move_to, line_to) == (1, 2)
+    assert start[0] == -64
+    assert end[0] == 4096 + 64
+
+
+def test_encode_tile_polygon_winding():
+    geometries = to_web_mercator(
+        '{"type": "Polygon", "coordinates": ['
+        "[[10, 10], [10, 40], [40, 40], [40, 10], [10, 10]],"
+        "[[20, 20], [30, 20], [30, 30], [20, 30], [20, 20]]]}"
+    )
+
+    (layer,) = decode_tile(encode_tile("layer", geometries, [{}], tile_bounds(1, 1, 0)))
+
+    (feature,) = layer["features"]
+    assert feature["type"] == 3
+    rings = []
+    for command, points in feature["geometry"]:
+        if command == 1:
+            rings.append(list(points))
+        elif command == 2:
+            rings[-1].extend(points)
+    assert len(rings) == 2
+
+    def signed_area(points):
+        return sum(x1 * y2 - x2 * y1 for (x1, y1), (x2, y2) in zip(points, points[1:] + points[:1]))
+
+    assert signed_area(rings[0]) > 0
+    assert signed_area(rings[1]) < 0
+
+
+def test_encode_tile_empty():
+    geometries = to_web_mercator('{"type": "Point", "coordinates": [-10, -10]}')
+    assert encode_tile("layer", geometries, [{}], tile_bounds(1, 1, 0)) == b""
@@ -118,19 +118,51 @@ def test_landscape_area_calculated_once(unit_polygon):
         "type": "FeatureCollection",
         "features": [{"type": "Feature", "geometry": unit_polygon}],
     }
+    metrics = {
+        "area_scalar_m2": 1,
+        "center_coordinates": None,
+        "bbox": None,
+        "vertex_count": 5,
+    }
     with patch(
-        "apps.core.models.landscapes.calculate_geojson_feature_area", return_value=1
+        "apps.core.models.landscapes.calculate_geojson_metrics", return_value=metrics
     ) as mock1:
         landscape = mixer.blend(Landscape, area_polygon=area_polygon)
     mock1.assert_called_once()
     landscape.name = "foo"
     with patch(
-        "apps.core.models.landscapes.calculate_geojson_feature_area", return_value=1
+        "apps.core.models.landscapes.calculate_geojson_metrics", return_value=metrics
     ) as mock2:
         landscape.save()
     mock2.assert_not_called()
 
 
+def test_landscape_area_metrics_calculated():
+    area_polygon = {
+        "type": "FeatureCollection",
+        "features": [
+            {
+                "type": "Feature",
+                "geometry": {
+                    "type": "Polygon",
+                    "coordinates": [[[0, 0], [2, 0], [2, 1], [0, 1], [0, 0]]],
+                },
+            }
+        ],
+    }
+    landscape = mixer.blend(Landscape, area_polygon=area_polygon)
+
+    assert landscape.area_bbox == [0, 0, 2, 1]
+    assert landscape.area_vertex_count == 5
+    assert landscape.center_coordinates == {"lat": 0.5, "lng": 1}
+
+    landscape.area_polygon = None
+    landscape.save()
+
+    assert landscape.area_bbox is None
+    assert landscape.area_vertex_count is None
+
+
 def test_can_recreate_landscape_after_deletion():
     user = mixer.blend(User)
     landscape = mixer.blend(Landscape, created_by=user)
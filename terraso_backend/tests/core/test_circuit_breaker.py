@@ -0,0 +1,123 @@
+# Copyright © 2026 Technology Matters
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see https://www.gnu.org/licenses/.
+
+import pytest
+
+from apps.core.circuit_breaker import CircuitBreaker, CircuitOpenError, CircuitState
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def breaker(clock):
+    return CircuitBreaker(
+        "test",
+        failure_rate=0.5,
+        min_calls=4,
+        window_seconds=60,
+        slow_call_seconds=5,
+        open_seconds=30,
+        clock=clock,
+    )
+
+
+def _fail():
+    raise ConnectionError("upstream down")
+
+
+def _succeed():
+    return "ok"
+
+
+def _fail_calls(breaker, count):
+    for _ in range(count):
+        with pytest.raises(ConnectionError):
+            breaker.call(_fail)
+
+
+def test_opens_after_failure_rate_reached(breaker):
+    breaker.call(_succeed)
+    breaker.call(_succeed)
+    _fail_calls(breaker, 1)
+    assert breaker.state == CircuitState.CLOSED
+
+    _fail_calls(breaker, 1)
+    assert breaker.state == CircuitState.OPEN
+
+    with pytest.raises(CircuitOpenError):
+        breaker.call(_succeed)
+    assert breaker.stats()["rejected_calls"] == 1
+
+
+def test_old_failures_leave_window(breaker, clock):
+    _fail_calls(breaker, 3)
+    clock.now += 61
+    breaker.call(_succeed)
+
+    assert breaker.state == CircuitState.CLOSED
+
+
+def test_slow_calls_count_as_failures(breaker, clock):
+    def slow():
+        clock.now += 6
+        return "ok"
+
+    for _ in range(4):
+        assert breaker.call(slow) == "ok"
+
+    assert breaker.state == CircuitState.OPEN
+    assert breaker.stats()["slow_calls"] == 4
+
+
+def test_half_open_probe_closes_circuit(breaker, clock):
+    _fail_calls(breaker, 4)
+    clock.now += 30
+
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert breaker.call(_succeed) == "ok"
+    assert breaker.state == CircuitState.CLOSED
+
+
+def test_half_open_probe_failure_reopens_circuit(breaker, clock):
+    _fail_calls(breaker, 4)
+    clock.now += 30
+
+    _fail_calls(breaker, 1)
+    assert breaker.state == CircuitState.OPEN
+    assert breaker.stats()["times_opened"] == 2
+
+
+def test_half_open_allows_single_probe(breaker, clock):
+    _fail_calls(breaker, 4)
+    clock.now += 30
+
+    def probe():
+        with pytest.raises(CircuitOpenError):
+            breaker.call(_succeed)
+        return "ok"
+
+    assert breaker.call(probe) == "ok"
+    assert breaker.state == CircuitState.CLOSED
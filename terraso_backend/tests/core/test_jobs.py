@@ -0,0 +1,211 @@
+# Copyright © 2026 Technology Matters
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see https://www.gnu.org/licenses/.
+
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from django.db import IntegrityError
+from django.utils import timezone
+
+from apps.core import jobs
+from apps.core.models import Job
+
+pytestmark = pytest.mark.django_db
+
+calls = []
+
+
+def record_call(*args, **kwargs):
+    calls.append((args, kwargs))
+
+
+def fail():
+    raise ValueError("failed in job")
+
+
+@pytest.fixture(autouse=True)
+def clear_calls():
+    calls.clear()
+
+
+def test_enqueue_stores_job(settings):
+    settings.JOB_QUEUE_MAX_ATTEMPTS = 3
+
+    job = jobs.enqueue(record_call, 1, "a", key="value")
+
+    job.refresh_from_db()
+    assert job.task == "tests.core.test_jobs.record_call"
+    assert job.args == [1, "a"]
+    assert job.kwargs == {"key": "value"}
+    assert job.status == Job.Status.QUEUED
+    assert job.max_attempts == 3
+    assert calls == []
+
+
+def test_enqueue_dedupes_queued_jobs():
+    job = jobs.enqueue(record_call, 1, dedupe_key="key")
+    duplicate = jobs.enqueue(record_call, 2, dedupe_key="key")
+
+    assert duplicate.id == job.id
+    assert Job.objects.count() == 1
+
+    jobs.claim_jobs(1, "worker")
+    assert jobs.enqueue(record_call, 3, dedupe_key="key").id != job.id
+
+
+def test_enqueue_retries_when_queued_job_was_claimed():
+    claimed = jobs.enqueue(record_call, 1, dedupe_key="key")
+    save = Job.save
+
+    def claimed_during_insert(job, *args, **kwargs):
+        if job.id != claimed.id and Job.objects.filter(status=Job.Status.QUEUED).exists():
+            jobs.claim_jobs(1, "worker")
+            raise IntegrityError("duplicate key value violates unique constraint")
+        return save(job, *args, **kwargs)
+
+    with mock.patch.object(Job, "save", claimed_during_insert):
+        job = jobs.enqueue(record_call, 2, dedupe_key="key")
+
+    job.refresh_from_db()
+    assert job.status == Job.Status.QUEUED
+    assert job.args == [2]
+    assert Job.objects.count() == 2
+
+
+def test_enqueue_replaces_queued_job_args():
+    job = jobs.enqueue(record_call, 1, dedupe_key="key", replace_queued=True)
+    duplicate = jobs.enqueue(record_call, 2, dedupe_key="key", key="value", replace_queued=True)
+
+    assert duplicate.id == job.id
+    job.refresh_from_db()
+    assert job.args == [2]
+    assert job.kwargs == {"key": "value"}
+
+
+def test_enqueue_run_inline(settings):
+    settings.JOB_QUEUE_RUN_INLINE = True
+
+    job = jobs.enqueue(record_call, 1)
+
+    assert calls == [((1,), {})]
+    assert job.status == Job.Status.SUCCEEDED
+    assert job.attempts == 1
+
+
+def test_claim_jobs_skips_jobs_not_due():
+    due_job = jobs.enqueue(record_call, 1)
+    jobs.enqueue(record_call, 2, delay_seconds=60)
+
+    claimed = jobs.claim_jobs(10, "worker")
+
+    assert [job.id for job in claimed] == [due_job.id]
+    due_job.refresh_from_db()
+    assert due_job.status == Job.Status.RUNNING
+    assert due_job.locked_by == "worker"
+    assert due_job.attempts == 1
+
+
+def test_run_job_success():
+    jobs.enqueue(record_call, 1)
+    [job] = jobs.claim_jobs(1, "worker")
+
+    jobs.run_job(job)
+
+    job.refresh_from_db()
+    assert calls == [((1,), {})]
+    assert job.status == Job.Status.SUCCEEDED
+    assert job.finished_at is not None
+
+
+def test_run_job_failure_is_retried_with_backoff(settings):
+    settings.JOB_QUEUE_RETRY_BACKOFF_SECONDS = 10
+    jobs.enqueue(fail, max_attempts=2)
+    [job] = jobs.claim_jobs(1, "worker")
+
+    jobs.run_job(job)
+
+    job.refresh_from_db()
+    assert job.status == Job.Status.QUEUED
+    assert "failed in job" in job.last_error
+    assert job.run_after >= timezone.now() + timedelta(seconds=9)
+
+    Job.objects.filter(id=job.id).update(run_after=timezone.now())
+    [job] = jobs.claim_jobs(1, "worker")
+    jobs.run_job(job)
+
+    job.refresh_from_db()
+    assert job.status == Job.Status.FAILED
+    assert job.attempts == 2
+
+
+def test_retry_delay_grows_up_to_max(settings):
+    settings.JOB_QUEUE_RETRY_BACKOFF_SECONDS = 10
+    settings.JOB_QUEUE_RETRY_MAX_BACKOFF_SECONDS = 50
+
+    assert 10 <= jobs.retry_delay_seconds(1) <= 12
+    assert 40 <= jobs.retry_delay_seconds(3) <= 48
+    assert 50 <= jobs.retry_delay_seconds(10) <= 60
+
+
+def test_requeue_stale_jobs(settings):
+    settings.JOB_QUEUE_STALE_SECONDS = 60
+    jobs.enqueue(record_call, max_attempts=2)
+    [job] = jobs.claim_jobs(1, "worker")
+    Job.objects.filter(id=job.id).update(locked_at=timezone.now() - timedelta(seconds=120))
+
+    jobs.requeue_stale_jobs()
+
+    job.refresh_from_db()
+    assert job.status == Job.Status.QUEUED
+
+
+def test_heartbeat_keeps_running_jobs_from_going_stale(settings):
+    settings.JOB_QUEUE_STALE_SECONDS = 60
+    jobs.enqueue(record_call)
+    jobs.enqueue(record_call)
+    [job, other_worker_job] = jobs.claim_jobs(1, "worker") + jobs.claim_jobs(1, "other")
+    Job.objects.update(locked_at=timezone.now() - timedelta(seconds=120))
+
+    assert jobs.heartbeat_jobs("worker") == 1
+    jobs.requeue_stale_jobs()
+
+    job.refresh_from_db()
+    assert job.status == Job.Status.RUNNING
+    other_worker_job.refresh_from_db()
+    assert other_worker_job.status == Job.Status.QUEUED
+
+
+def test_purge_finished_jobs(settings):
+    settings.JOB_QUEUE_RETENTION_DAYS = 1
+    old_job = jobs.enqueue(record_call)
+    recent_job = jobs.enqueue(record_call)
+    Job.objects.update(status=Job.Status.SUCCEEDED, finished_at=timezone.now())
+    Job.objects.filter(id=old_job.id).update(finished_at=timezone.now() - timedelta(days=2))
+
+    assert jobs.purge_finished_jobs() == 1
+    assert list(Job.objects.values_list("id", flat=True)) == [recent_job.id]
+
+
+# Jobs run in worker threads, which use their own database connections
+@pytest.mark.django_db(transaction=True)
+def test_worker_burst_runs_due_jobs():
+    jobs.enqueue(record_call, 1)
+    jobs.enqueue(record_call, 2)
+
+    jobs.JobWorker(concurrency=1, poll_seconds=0.1).run(burst=True)
+
+    assert sorted(calls) == [((1,), {}), ((2,), {})]
+    assert set(Job.objects.values_list("status", flat=True)) == {Job.Status.SUCCEEDED}
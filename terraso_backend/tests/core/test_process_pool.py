@@ -0,0 +1,74 @@
+# Copyright © 2026 Technology Matters
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see https://www.gnu.org/licenses/.
+
+import os
+import time
+
+import pytest
+
+from apps.core.process_pool import ProcessWorkerPool, WorkerCrashed, WorkerTimeout
+
+
+def _add(a, b):
+    return a + b
+
+
+def _fail():
+    raise ValueError("failed in worker")
+
+
+def _sleep(seconds):
+    time.sleep(seconds)
+    return os.getpid()
+
+
+def _exit():
+    os._exit(1)
+
+
+@pytest.fixture
+def pool():
+    pool = ProcessWorkerPool(1)
+    yield pool
+    pool.shutdown()
+
+
+def test_run_returns_result(pool):
+    assert pool.run(_add, 1, b=2) == 3
+
+
+def test_run_reraises_worker_exception(pool):
+    with pytest.raises(ValueError, match="failed in worker"):
+        pool.run(_fail)
+
+
+def test_run_reuses_worker_process(pool):
+    assert pool.run(_sleep, 0) == pool.run(_sleep, 0)
+
+
+def test_run_timeout_kills_worker(pool):
+    first_pid = pool.run(_sleep, 0)
+
+    with pytest.raises(WorkerTimeout):
+        pool.run(_sleep, 10, timeout=0.5)
+
+    assert pool.run(_sleep, 0) != first_pid
+
+
+def test_run_worker_crash(pool):
+    with pytest.raises(WorkerCrashed):
+        pool.run(_exit)
+
+    assert pool.run(_add, 1, 1) == 2
@@ -0,0 +1,140 @@
+# Copyright © 2026 Technology Matters
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see https://www.gnu.org/licenses/.
+
+import asyncio
+import importlib
+from inspect import isawaitable
+from types import SimpleNamespace
+from unittest import mock
+
+import pytest
+from asgiref.sync import sync_to_async
+from django.conf import settings as django_settings
+from django.urls import clear_url_caches
+from graphql.language import OperationType
+
+from apps.graphql import urls as graphql_urls
+from apps.graphql.async_execution import async_capable, enable_async_execution
+
+
+def _info(operation=OperationType.QUERY, async_execution=False):
+    context = SimpleNamespace()
+    if async_execution:
+        enable_async_execution(context)
+    return SimpleNamespace(context=context, operation=SimpleNamespace(operation=operation))
+
+
+@async_capable
+def _resolve_value(root, info, value=None):
+    return value
+
+
+def test_async_capable_resolver_is_sync_by_default():
+    assert _resolve_value(None, _info(), value=42) == 42
+
+
+def test_async_capable_resolver_returns_awaitable_in_async_execution():
+    result = _resolve_value(None, _info(async_execution=True), value=42)
+
+    assert isawaitable(result)
+    assert asyncio.run(result) == 42
+
+
+def test_async_capable_resolver_stays_sync_for_mutations():
+    info = _info(operation=OperationType.MUTATION, async_execution=True)
+
+    assert _resolve_value(None, info, value=42) == 42
+
+
+def _reload_urls():
+    # The GraphQL view is picked when the URLs are imported
+    importlib.reload(graphql_urls)
+    importlib.reload(importlib.import_module(django_settings.ROOT_URLCONF))
+    clear_url_caches()
+
+
+@pytest.fixture
+def async_graphql_execution(settings):
+    original = settings.GRAPHQL_ASYNC_EXECUTION
+    settings.GRAPHQL_ASYNC_EXECUTION = True
+    _reload_urls()
+    with mock.patch(
+        "apps.graphql.async_execution.sync_to_async", wraps=sync_to_async
+    ) as sync_to_async_spy:
+        yield sync_to_async_spy
+    settings.GRAPHQL_ASYNC_EXECUTION = original
+    _reload_urls()
+
+
+@pytest.mark.django_db
+def test_async_view_query_awaits_async_capable_resolvers(
+    async_graphql_execution, client_query, data_entry_current_user_file
+):
+    response = client_query(
+        """
+        {dataEntries {
+          edges {
+            node {
+              id
+              url
+            }
+          }
+        }}
+        """
+    )
+
+    assert response.status_code == 200
+    (edge,) = response.json()["data"]["dataEntries"]["edges"]
+    assert edge["node"]["id"] == str(data_entry_current_user_file.id)
+    assert "X-Amz-Expires" in edge["node"]["url"]
+    assert async_graphql_execution.called
+
+
+@pytest.mark.django_db
+def test_async_view_mutation_resolves_synchronously(
+    async_graphql_execution, client_query, data_entry_current_user_file
+):
+    response = client_query(
+        """
+        mutation updateDataEntry($input: DataEntryUpdateMutationInput!) {
+          updateDataEntry(input: $input) {
+            dataEntry {
+              name
+              url
+            }
+          }
+        }
+        """,
+        variables={"input": {"id": str(data_entry_current_user_file.id), "name": "New Name"}},
+    )
+
+    data_entry = response.json()["data"]["updateDataEntry"]["dataEntry"]
+    assert data_entry["name"] == "New Name"
+    assert "X-Amz-Expires" in data_entry["url"]
+    assert not async_graphql_execution.called
+
+
+@pytest.mark.django_db
+def test_async_view_auth_optional(
+    async_graphql_execution, client_query_no_token, expired_client_query
+):
+    response = client_query_no_token("{ dataEntries { edges { node { id } } } }")
+
+    assert response.status_code == 200
+    assert response.json()["data"]["dataEntries"]["edges"] == []
+
+    response = expired_client_query("{ dataEntries { edges { node { id } } } }")
+
+    assert response.status_code == 401
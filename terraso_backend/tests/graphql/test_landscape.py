@@ -16,6 +16,8 @@
 import json
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 pytestmark = pytest.mark.django_db
 
@@ -95,6 +97,48 @@ def test_landscapes_query_with_json_polygon(client_query, landscapes):
         assert landscape.area_polygon in landscapes_result
 
 
+def test_landscape_area_polygon_level_of_detail(client_query, landscapes, usa_geojson, settings):
+    settings.GIS_SIMPLIFICATION_MIN_VERTICES = 0
+    settings.GIS_SIMPLIFICATION_TOLERANCES = {"low": 1}
+    landscape = landscapes[0]
+    landscape.area_polygon = usa_geojson
+    landscape.save()
+
+    response = client_query(
+        """
+        {landscape(id: "%s") {
+            full: areaPolygon
+            low: areaPolygon(levelOfDetail: LOW)
+          }
+        }
+        """
+        % landscape.id
+    )
+    landscape_result = response.json()["data"]["landscape"]
+
+    assert json.loads(landscape_result["full"]) == usa_geojson
+    assert json.loads(landscape_result["low"]) == landscape.area_polygon_simplified["low"]
+    assert len(landscape_result["low"]) < len(landscape_result["full"])
+
+
+def test_landscapes_area_polygon_skips_simplified_levels(client_query, landscapes):
+    with CaptureQueriesContext(connection) as queries:
+        response = client_query("{landscapes { edges { node { areaPolygon } } } }")
+
+    assert len(response.json()["data"]["landscapes"]["edges"]) == len(landscapes)
+    assert not [query for query in queries if "area_polygon_simplified" in query["sql"]]
+
+
+def test_landscapes_area_polygon_level_of_detail_loaded_with_landscapes(client_query, landscapes):
+    with CaptureQueriesContext(connection) as queries:
+        response = client_query(
+            "{landscapes { edges { node { areaPolygon(levelOfDetail: LOW) } } } }"
+        )
+
+    assert len(response.json()["data"]["landscapes"]["edges"]) == len(landscapes)
+    assert len([query for query in queries if "area_polygon_simplified" in query["sql"]]) == 1
+
+
 def test_landscapes_query_with_membership(
     client_query, managed_landscapes, landscape_user_memberships
 ):
@@ -13,6 +13,7 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program. If not, see https://www.gnu.org/licenses/.
 
+import io
 import json
 import os
 import tempfile
@@ -26,6 +27,9 @@ import pytest
 from apps.collaboration.models import Membership as CollaborationMembership
 from apps.core import group_collaboration_roles
 from apps.core.gis.utils import DEFAULT_CRS
+from apps.core.jobs import run_job
+from apps.core.models import Job
+from apps.shared_data.models import DataEntry
 
 from ..core.gis.test_parsers import KML_TEST_FILES
 
@@ -440,14 +444,16 @@ def test_data_entries_from_parent_query_by_resource_field(
     "kml_file_path_expected",
     KML_TEST_FILES,
 )
+@mock.patch("apps.shared_data.services.data_entry_upload_service.get_file_version")
 @mock.patch("apps.shared_data.services.data_entry_upload_service.get_file")
 def test_data_entry_kml_to_geojson(
-    get_file_mock, client_query, data_entry_kml, kml_file_path_expected
+    get_file_mock, get_file_version_mock, client_query, data_entry_kml, kml_file_path_expected
 ):
     expected_file_path = kml_file_path_expected[1]
     with open(resources.files("tests").joinpath(expected_file_path), "rb") as file:
         expected_json = json.load(file)
     kml_file_path = kml_file_path_expected[0]
+    get_file_version_mock.return_value = "v1"
     with open(resources.files("tests").joinpath(kml_file_path), "rb") as file:
         get_file_mock.return_value = file
         response = client_query(
@@ -469,7 +475,58 @@ def test_data_entry_kml_to_geojson(
 
 
 @mock.patch("apps.shared_data.services.data_entry_upload_service.get_file")
-def test_data_entry_shapefil_to_geojson(get_file_mock, client_query, data_entry_shapefile):
+def test_data_entry_preview(get_file_mock, client_query, data_entry_kml):
+    data_entry_kml.resource_type = "csv"
+    data_entry_kml.save()
+    get_file_mock.side_effect = lambda *args: io.StringIO("site,lat,lon\nA,-12.5,-77.1\n")
+    query = (
+        """
+      {dataEntry(id: "%s") {
+        preview
+      }}
+      """
+        % data_entry_kml.id
+    )
+
+    # Not cached yet, so it is read by a worker instead of the request
+    response = client_query(query)
+    assert response.json()["data"]["dataEntry"]["preview"] is None
+    get_file_mock.assert_not_called()
+    job = Job.objects.get(dedupe_key=f"cache_data_entry_preview:{data_entry_kml.s3_object_name}")
+    run_job(job)
+
+    response = client_query(query)
+    preview = json.loads(response.json()["data"]["dataEntry"]["preview"])
+    assert [column["name"] for column in preview["columns"]] == ["site", "lat", "lon"]
+    assert preview["latitudeColumns"][0] == "lat"
+    assert preview["longitudeColumns"][0] == "lon"
+    assert preview["sampleRows"] == [["A", "-12.5", "-77.1"]]
+
+
+def test_data_entry_link_has_no_preview(client_query, data_entry_kml):
+    data_entry_kml.entry_type = DataEntry.ENTRY_TYPE_LINK
+    data_entry_kml.resource_type = "csv"
+    data_entry_kml.save()
+
+    response = client_query(
+        """
+      {dataEntry(id: "%s") {
+        preview
+      }}
+      """
+        % data_entry_kml.id
+    )
+
+    assert response.json()["data"]["dataEntry"]["preview"] is None
+    assert not Job.objects.filter(dedupe_key__startswith="cache_data_entry_preview:").exists()
+
+
+@mock.patch("apps.shared_data.services.data_entry_upload_service.get_file_version")
+@mock.patch("apps.shared_data.services.data_entry_upload_service.get_file")
+def test_data_entry_shapefil_to_geojson(
+    get_file_mock, get_file_version_mock, client_query, data_entry_shapefile
+):
+    get_file_version_mock.return_value = "v1"
     gdf = gpd.GeoDataFrame({"geometry": gpd.points_from_xy([0], [0])}, crs=DEFAULT_CRS)
     with tempfile.TemporaryDirectory() as tmpdir:
         shapefile_zip = tempfile.NamedTemporaryFile(suffix=".zip")
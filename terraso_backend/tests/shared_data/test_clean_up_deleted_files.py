@@ -0,0 +1,70 @@
+# Copyright © 2026 Technology Matters
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see https://www.gnu.org/licenses/.
+
+from unittest.mock import patch
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+from mixer.backend.django import mixer
+
+from apps.shared_data.models import DataEntry, DataEntryGeoJsonCache
+
+pytestmark = pytest.mark.django_db
+
+
+def _deleted_data_entry(user, name, days_ago):
+    data_entry = mixer.blend(
+        DataEntry, url=f"https://example.org/{user.id}/{name}", created_by=user
+    )
+    data_entry.delete()
+    DataEntry.all_objects.filter(pk=data_entry.pk).update(
+        deleted_at=timezone.now() - timezone.timedelta(days=days_ago)
+    )
+    return data_entry
+
+
+@patch("apps.shared_data.models.data_entries.data_entry_upload_service.delete_files")
+def test_clean_up_deleted_files_in_batches(mock_delete_files, user):
+    mock_delete_files.return_value = {}
+    old_entries = [_deleted_data_entry(user, f"file-{index}.csv", 10) for index in range(5)]
+    # Shares its file with the first entry, so it has to be in the same batch
+    old_entries.append(_deleted_data_entry(user, "file-0.csv", 10))
+    recent = _deleted_data_entry(user, "recent.csv", 1)
+    DataEntryGeoJsonCache.objects.create(
+        object_name=old_entries[1].s3_object_name, file_version="1", geojson={}
+    )
+
+    call_command("clean_up_deleted_files", batch_size=2, concurrency=1)
+
+    batches = [call.args[0] for call in mock_delete_files.call_args_list]
+    assert batches == [
+        [old_entries[0].s3_object_name],
+        [old_entries[1].s3_object_name, old_entries[2].s3_object_name],
+        [old_entries[3].s3_object_name, old_entries[4].s3_object_name],
+    ]
+    assert DataEntry.all_objects.filter(file_removed_at__isnull=False).count() == 6
+    assert DataEntry.all_objects.get(pk=recent.pk).file_removed_at is None
+    assert not DataEntryGeoJsonCache.objects.exists()
+
+
+@patch("apps.shared_data.models.data_entries.data_entry_upload_service.delete_files")
+def test_clean_up_deleted_files_failures(mock_delete_files, user):
+    data_entry = _deleted_data_entry(user, "file.csv", 10)
+    mock_delete_files.return_value = {data_entry.s3_object_name: "Access Denied"}
+
+    call_command("clean_up_deleted_files", concurrency=1)
+
+    assert DataEntry.all_objects.get(pk=data_entry.pk).file_removed_at is None
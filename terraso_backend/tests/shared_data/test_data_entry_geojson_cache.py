@@ -0,0 +1,104 @@
+# Copyright © 2026 Technology Matters
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see https://www.gnu.org/licenses/.
+
+import io
+import json
+from unittest import mock
+
+import pytest
+from django.core.exceptions import ValidationError
+
+from apps.core.process_pool import WorkerTimeout
+from apps.shared_data.models import DataEntryGeoJsonCache
+
+pytestmark = pytest.mark.django_db
+
+OBJECT_NAME = "user-id/areas.geojson"
+GEOJSON = {"type": "FeatureCollection", "features": []}
+
+
+def _geojson_file(content):
+    file = io.BytesIO(content)
+    file.name = OBJECT_NAME
+    return file
+
+
+@pytest.fixture
+def get_file_version_mock():
+    with mock.patch(
+        "apps.shared_data.services.data_entry_upload_service.get_file_version",
+        return_value="v1",
+    ) as get_file_version_mock:
+        yield get_file_version_mock
+
+
+@pytest.fixture
+def get_file_mock():
+    with mock.patch(
+        "apps.shared_data.services.data_entry_upload_service.get_file",
+        side_effect=lambda *args: _geojson_file(json.dumps(GEOJSON).encode()),
+    ) as get_file_mock:
+        yield get_file_mock
+
+
+def test_geojson_parsed_once_per_version(get_file_version_mock, get_file_mock):
+    assert DataEntryGeoJsonCache.get_geojson(OBJECT_NAME) == GEOJSON
+    assert DataEntryGeoJsonCache.get_geojson(OBJECT_NAME) == GEOJSON
+
+    assert get_file_mock.call_count == 1
+
+
+def test_new_file_version_replaces_cached_geojson(get_file_version_mock, get_file_mock):
+    DataEntryGeoJsonCache.get_geojson(OBJECT_NAME)
+    get_file_version_mock.return_value = "v2"
+    DataEntryGeoJsonCache.get_geojson(OBJECT_NAME)
+
+    assert get_file_mock.call_count == 2
+    assert list(
+        DataEntryGeoJsonCache.objects.filter(object_name=OBJECT_NAME).values_list(
+            "file_version", flat=True
+        )
+    ) == ["v2"]
+
+
+def test_parse_error_is_cached(get_file_version_mock, get_file_mock):
+    get_file_mock.side_effect = lambda *args: _geojson_file(b"not json")
+
+    for _ in range(2):
+        with pytest.raises(ValidationError) as error:
+            DataEntryGeoJsonCache.get_geojson(OBJECT_NAME)
+        assert error.value.message == "invalid_geojson_file"
+
+    assert get_file_mock.call_count == 1
+
+
+def test_invalidate_removes_cached_geojson(get_file_version_mock, get_file_mock):
+    DataEntryGeoJsonCache.get_geojson(OBJECT_NAME)
+    DataEntryGeoJsonCache.invalidate(OBJECT_NAME)
+
+    assert not DataEntryGeoJsonCache.objects.filter(object_name=OBJECT_NAME).exists()
+
+
+def test_parsing_timeout_is_not_cached(settings, get_file_version_mock, get_file_mock):
+    settings.GIS_PARSING_PROCESS_POOL_SIZE = 1
+    with mock.patch("apps.core.gis.parsing._get_pool") as mock_get_pool:
+        mock_get_pool.return_value.run.side_effect = WorkerTimeout()
+        with pytest.raises(ValidationError) as error:
+            DataEntryGeoJsonCache.get_geojson(OBJECT_NAME)
+        assert error.value.message == "parsing_timeout"
+        assert not DataEntryGeoJsonCache.objects.filter(object_name=OBJECT_NAME).exists()
+
+        mock_get_pool.return_value.run.side_effect = lambda func, *args, **kwargs: GEOJSON
+        assert DataEntryGeoJsonCache.get_geojson(OBJECT_NAME) == GEOJSON
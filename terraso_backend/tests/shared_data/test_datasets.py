@@ -0,0 +1,139 @@
+# Copyright © 2026 Technology Matters
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see https://www.gnu.org/licenses/.
+
+import io
+from unittest import mock
+
+import pytest
+
+from apps.shared_data.datasets import get_column_type, get_dataset_preview
+from apps.shared_data.models import DataEntryPreviewCache
+
+pytestmark = pytest.mark.django_db
+
+OBJECT_NAME = "user-id/dataset.csv"
+
+ROWS = [
+    ["Site", "Lat", "Longitude", "Visited", "Date", "pH"],
+    ["A", "-12.5", "-77.1", "yes", "2024-01-30", "6.5"],
+    ["B", "10", "120.25", "no", "2024-02-01", ""],
+    ["C", "", "", "", "", "7"],
+]
+
+
+@pytest.mark.parametrize(
+    "values, column_type",
+    [
+        (["1", "2.5", "-3e2"], "number"),
+        (["Yes", "no", ""], "boolean"),
+        (["2024-01-30", "2024-02-01 10:00:00"], "date"),
+        (["1", "a"], "text"),
+        (["", None, " "], "empty"),
+    ],
+)
+def test_get_column_type(values, column_type):
+    assert get_column_type(values) == column_type
+
+
+def test_get_dataset_preview(settings):
+    settings.DATA_ENTRY_PREVIEW_SAMPLE_ROWS = 2
+
+    preview = get_dataset_preview(iter(ROWS))
+
+    assert preview["columns"] == [
+        {"name": "Site", "type": "text"},
+        {"name": "Lat", "type": "number"},
+        {"name": "Longitude", "type": "number"},
+        {"name": "Visited", "type": "boolean"},
+        {"name": "Date", "type": "date"},
+        {"name": "pH", "type": "number"},
+    ]
+    # Named columns first, other numeric columns within range are candidates too
+    assert preview["latitudeColumns"] == ["Lat", "pH"]
+    assert preview["longitudeColumns"] == ["Longitude", "Lat", "pH"]
+    assert preview["sampleRows"] == [ROWS[1], [*ROWS[2][:5], None]]
+
+
+def test_get_dataset_preview_only_reads_first_rows(settings):
+    settings.DATA_ENTRY_PREVIEW_ROWS = 2
+    rows = iter([ROWS[0], *ROWS[1:3], ["D", "not a number", "", "", "", ""]])
+
+    preview = get_dataset_preview(rows)
+
+    assert preview["columns"][1] == {"name": "Lat", "type": "number"}
+    assert next(rows)[0] == "D"
+
+
+def test_get_dataset_preview_empty_file():
+    assert get_dataset_preview(iter([])) is None
+
+
+@mock.patch("apps.shared_data.services.data_entry_upload_service.content_addressed", False)
+@mock.patch(
+    "apps.shared_data.services.data_entry_upload_service.get_file_version", return_value="v1"
+)
+@mock.patch("apps.shared_data.services.data_entry_upload_service.get_file")
+def test_preview_read_once_per_version(get_file_mock, get_file_version_mock):
+    get_file_mock.side_effect = lambda *args: io.StringIO("a,b\n1,2\n")
+
+    preview = DataEntryPreviewCache.get_preview(OBJECT_NAME, "csv")
+    assert DataEntryPreviewCache.get_preview(OBJECT_NAME, "csv") == preview
+    assert preview["sampleRows"] == [["1", "2"]]
+    assert get_file_mock.call_count == 1
+
+    get_file_version_mock.return_value = "v2"
+    DataEntryPreviewCache.get_preview(OBJECT_NAME, "csv")
+
+    assert get_file_mock.call_count == 2
+    assert list(
+        DataEntryPreviewCache.objects.filter(object_name=OBJECT_NAME).values_list(
+            "file_version", flat=True
+        )
+    ) == ["v2"]
+
+
+@mock.patch("apps.shared_data.services.data_entry_upload_service.get_file_version")
+@mock.patch("apps.shared_data.services.data_entry_upload_service.get_file")
+def test_preview_of_content_addressed_file_keyed_on_name(get_file_mock, get_file_version_mock):
+    get_file_mock.side_effect = lambda *args: io.StringIO("a,b\n1,2\n")
+
+    assert DataEntryPreviewCache.get_cached(OBJECT_NAME) is None
+    preview = DataEntryPreviewCache.get_preview(OBJECT_NAME, "csv")
+
+    assert DataEntryPreviewCache.get_cached(OBJECT_NAME).preview == preview
+    assert get_file_mock.call_count == 1
+    get_file_version_mock.assert_not_called()
+
+
+@mock.patch(
+    "apps.shared_data.services.data_entry_upload_service.get_file_version", return_value="v1"
+)
+@mock.patch("apps.shared_data.services.data_entry_upload_service.get_file")
+def test_preview_of_invalid_file(get_file_mock, get_file_version_mock):
+    get_file_mock.side_effect = lambda *args: io.BytesIO(b"not a workbook")
+
+    assert DataEntryPreviewCache.get_preview("user-id/dataset.xlsx", "xlsx") is None
+    assert DataEntryPreviewCache.get_preview("user-id/dataset.xlsx", "xlsx") is None
+    assert get_file_mock.call_count == 1
+
+
+@mock.patch("apps.shared_data.services.data_entry_upload_service.get_file")
+def test_preview_storage_error_is_not_cached(get_file_mock):
+    get_file_mock.side_effect = OSError("Connection reset")
+
+    with pytest.raises(OSError):
+        DataEntryPreviewCache.get_preview(OBJECT_NAME, "csv")
+
+    assert DataEntryPreviewCache.get_cached(OBJECT_NAME) is None
@@ -13,8 +13,11 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program. If not, see https://www.gnu.org/licenses/.
 
+from unittest.mock import patch
+
 import pytest
 from django.db import models
+from mixer.backend.django import mixer
 
 from apps.collaboration.models import Membership as CollaborationMembership
 from apps.core import group_collaboration_roles
@@ -40,6 +43,75 @@ def test_data_entry_get_signed_url(settings, data_entry):
     assert "X-Amz-Expires" in data_entry.signed_url
 
 
+def test_data_entry_signed_url_named_after_entry(user, data_entry):
+    # Identical uploads share their storage object, but keep their own names
+    other_data_entry = mixer.blend(
+        DataEntry, url=data_entry.url, created_by=user, name="Other name", resource_type="csv"
+    )
+
+    assert data_entry.signed_url != other_data_entry.signed_url
+    assert "Other" in other_data_entry.signed_url
+
+
+@patch("apps.shared_data.models.data_entries.DataEntryFileStorage.delete")
+def test_data_entry_shared_file_deleted_with_last_entry(mock_delete, user, data_entry):
+    # Identical uploads share their storage object
+    other_data_entry = mixer.blend(DataEntry, url=data_entry.url, created_by=user)
+    data_entry.delete()
+    other_data_entry.delete()
+
+    data_entry.delete_file_on_storage()
+
+    mock_delete.assert_not_called()
+    assert data_entry.file_removed_at is not None
+
+    other_data_entry.delete_file_on_storage()
+
+    mock_delete.assert_called_once_with(data_entry.s3_object_name)
+
+
+@patch("apps.shared_data.models.data_entries.data_entry_upload_service.delete_files")
+def test_data_entry_file_kept_for_upload_made_while_locking(mock_delete_files, user, data_entry):
+    data_entry.delete()
+
+    def upload_identical_file(object_names):
+        # An upload of the same content held the lock until its entry was saved
+        mixer.blend(DataEntry, url=data_entry.url, created_by=user)
+
+    with patch(
+        "apps.shared_data.models.data_entries.lock_object_names",
+        side_effect=upload_identical_file,
+    ) as mock_lock:
+        DataEntry.delete_files_on_storage([data_entry])
+
+    mock_lock.assert_called_once_with({data_entry.s3_object_name})
+    mock_delete_files.assert_called_once_with([])
+
+
+@patch("apps.shared_data.models.data_entries.data_entry_upload_service.delete_files")
+def test_data_entry_delete_files_on_storage(mock_delete_files, user, data_entry):
+    shared = mixer.blend(DataEntry, url=data_entry.url, created_by=user)
+    still_needed = mixer.blend(DataEntry, url=f"{data_entry.url}.other", created_by=user)
+    other = mixer.blend(DataEntry, url=still_needed.url, created_by=user)
+    failing = mixer.blend(DataEntry, url=f"{data_entry.url}.failing", created_by=user)
+    for entry in (data_entry, shared, other, failing):
+        entry.delete()
+    mock_delete_files.return_value = {failing.s3_object_name: "Access Denied"}
+
+    failed = DataEntry.delete_files_on_storage([data_entry, shared, other, failing])
+
+    assert failed == {failing: "Access Denied"}
+    # The file of other is still needed by an entry that isn't deleted
+    mock_delete_files.assert_called_once_with([data_entry.s3_object_name, failing.s3_object_name])
+    removed = DataEntry.all_objects.filter(file_removed_at__isnull=False)
+    assert set(removed) == {data_entry, shared, other}
+
+
+def test_data_entry_delete_files_on_storage_not_deleted(data_entry):
+    with pytest.raises(RuntimeError):
+        DataEntry.delete_files_on_storage([data_entry])
+
+
 def test_data_entry_can_be_updated_by_its_creator(user, data_entry):
     assert user.has_perm(DataEntry.get_perm("change"), obj=data_entry)
 
@@ -13,6 +13,8 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program. If not, see https://www.gnu.org/licenses/.
 
+import hashlib
+import io
 import json
 from unittest import mock
 from unittest.mock import patch
@@ -21,6 +23,10 @@ import pytest
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.urls.base import reverse
 
+from apps.shared_data.forms import validate_file_content_type
+from apps.shared_data.views import DataEntryFileUploadView
+from apps.storage.direct_uploads import DirectUploadError, UploadedObject
+
 pytestmark = pytest.mark.django_db
 
 
@@ -184,6 +190,170 @@ def test_create_data_entry_file_invalid_type(logged_client, upload_url, data_ent
     assert "errors" in response_data
 
 
+def test_create_data_entry_oversized_while_received(logged_client, upload_url, data_entry_payload):
+    with (
+        patch.object(DataEntryFileUploadView, "upload_max_size", 10),
+        patch(
+            "apps.shared_data.forms.data_entry_upload_service.upload_file"
+        ) as mocked_upload_service,
+    ):
+        response = logged_client.post(upload_url, data_entry_payload)
+
+        mocked_upload_service.assert_not_called()
+
+    assert response.status_code == 400
+    assert response.json()["errors"][0]["message"][0]["code"] == "File size exceeds 10 MB"
+
+
+def test_create_data_entry_invalid_content_while_received(
+    logged_client, upload_url, data_entry_payload
+):
+    data_entry_payload["data_file"] = SimpleUploadedFile(
+        name="data_file.json",
+        content=b"%PDF-1.4 not json",
+        content_type="application/json",
+    )
+    with patch(
+        "apps.shared_data.views.validate_file_content_type",
+        wraps=validate_file_content_type,
+    ) as mocked_validate:
+        response = logged_client.post(upload_url, data_entry_payload)
+
+    assert response.status_code == 400
+    assert response.json()["errors"][0]["message"][0]["code"] == "invalid_extension"
+    mocked_validate.assert_called_once_with("data_file.json", "application/pdf")
+
+
+def test_create_data_entry_checksum_computed_while_received(
+    logged_client, upload_url, data_entry_payload
+):
+    content = data_entry_payload["data_file"].read()
+    data_entry_payload["data_file"].seek(0)
+    with patch(
+        "apps.shared_data.forms.data_entry_upload_service.upload_file"
+    ) as mocked_upload_service:
+        mocked_upload_service.return_value = "https://example.org/uploaded_file.json"
+        response = logged_client.post(upload_url, data_entry_payload)
+
+    assert response.status_code == 201
+    uploaded_file = mocked_upload_service.call_args[0][1]
+    assert uploaded_file.sha256 == hashlib.sha256(content).hexdigest()
+
+
+@patch("apps.shared_data.views.create_upload")
+def test_create_data_entry_upload_target(mock_create_upload, logged_client, user):
+    mock_create_upload.return_value = {"upload_token": "token", "method": "POST"}
+
+    response = logged_client.post(
+        reverse("shared_data:upload-target"), {"file_name": "data_file.csv", "size": 100}
+    )
+
+    assert response.status_code == 201
+    assert response.json()["upload_token"] == "token"
+    _, user_id, path, file_name, size, _ = mock_create_upload.call_args[0]
+    assert (user_id, path, file_name, size) == (
+        user.id,
+        f"{user.id}/data_file.csv",
+        "data_file.csv",
+        100,
+    )
+
+
+@pytest.mark.parametrize(
+    "payload, code",
+    [
+        ({"file_name": "data_file.csv", "size": 50000001}, "File size exceeds 10 MB"),
+        ({"file_name": "data_file.txt", "size": 100}, "invalid_media_type"),
+        ({"file_name": "data_file.csv"}, "invalid_upload"),
+    ],
+)
+@patch("apps.shared_data.views.create_upload")
+def test_create_data_entry_upload_target_invalid(mock_create_upload, logged_client, payload, code):
+    response = logged_client.post(reverse("shared_data:upload-target"), payload)
+
+    assert response.status_code == 400
+    assert response.json()["errors"][0]["message"][0]["code"] == code
+    mock_create_upload.assert_not_called()
+
+
+@pytest.fixture
+def finalize_payload(landscape):
+    return {
+        "name": "Testing Data File",
+        "upload_token": "token",
+        "target_type": "landscape",
+        "target_slug": landscape.slug,
+    }
+
+
+@patch("apps.shared_data.views.start_cache_data_entry_geojson_task")
+@patch("apps.shared_data.views.open_uploaded_file")
+@patch("apps.shared_data.views.finalize_upload")
+def test_finalize_data_entry_upload(
+    mock_finalize_upload,
+    mock_open_uploaded_file,
+    mock_start_cache_task,
+    logged_client,
+    user,
+    landscape,
+    finalize_payload,
+):
+    mock_finalize_upload.return_value = UploadedObject(
+        path=f"{user.id}/data_file.csv", file_name="data_file.csv", size=19
+    )
+    file = io.BytesIO(b"col1,col2\nval1,val2")
+    file.name = "data_file.csv"
+    mock_open_uploaded_file.return_value = file
+
+    response = logged_client.post(reverse("shared_data:upload-finalize"), finalize_payload)
+
+    assert response.status_code == 201
+    response_data = response.json()
+    assert f"/{user.id}/data_file.csv" in response_data["url"]
+    assert response_data["resourceType"] == "csv"
+    assert response_data["size"] == 19
+    assert str(landscape.id) in response_data["sharedResources"]
+    assert mock_finalize_upload.call_args[0][1:] == (user.id, "token", 50000000)
+    mock_start_cache_task.assert_not_called()
+
+
+@patch("apps.shared_data.views.data_entry_upload_service.delete_file")
+@patch("apps.shared_data.views.open_uploaded_file")
+@patch("apps.shared_data.views.finalize_upload")
+def test_finalize_data_entry_upload_invalid_type(
+    mock_finalize_upload,
+    mock_open_uploaded_file,
+    mock_delete_file,
+    logged_client,
+    user,
+    finalize_payload,
+):
+    mock_finalize_upload.return_value = UploadedObject(
+        path=f"{user.id}/data_file.pdf", file_name="data_file.pdf", size=19
+    )
+    file = io.BytesIO(b"this is a text file")
+    file.name = "data_file.pdf"
+    mock_open_uploaded_file.return_value = file
+
+    response = logged_client.post(reverse("shared_data:upload-finalize"), finalize_payload)
+
+    assert response.status_code == 400
+    assert response.json()["errors"][0]["message"][0]["code"] == "invalid_extension"
+    mock_delete_file.assert_called_once_with(f"{user.id}/data_file.pdf")
+
+
+@patch("apps.shared_data.views.finalize_upload")
+def test_finalize_data_entry_upload_invalid_token(
+    mock_finalize_upload, logged_client, finalize_payload
+):
+    mock_finalize_upload.side_effect = DirectUploadError("invalid_upload_token")
+
+    response = logged_client.post(reverse("shared_data:upload-finalize"), finalize_payload)
+
+    assert response.status_code == 400
+    assert response.json()["errors"][0]["message"][0]["code"] == "invalid_upload_token"
+
+
 @mock.patch("apps.shared_data.models.data_entries.data_entry_file_storage.url")
 def test_download_data_entry_file_shared_all(
     get_url_mock, not_logged_in_client, shared_resource_data_entry_shared_all
@@ -0,0 +1,182 @@
+# Copyright © 2026 Technology Matters
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see https://www.gnu.org/licenses/.
+
+import io
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from django.urls import reverse
+from mixer.backend.django import mixer
+
+from apps.core.gis.vector_tiles import CONTENT_TYPE
+from apps.shared_data.visualization_tiles import (
+    TILES_PATH_PREFIX,
+    _get_cached_tile_index,
+    get_tile_path,
+    remove_visualization_tiles,
+)
+from apps.story_map.models import StoryMap
+
+from ..core.gis.test_vector_tiles import decode_tile
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def tiles_enabled(settings):
+    settings.VISUALIZATION_TILES_ENABLED = True
+    yield
+    _get_cached_tile_index.cache_clear()
+
+
+@pytest.fixture
+def published_visualization_config(visualization_config, user):
+    visualization_config.owner = mixer.blend(StoryMap, created_by=user, is_published=True)
+    visualization_config.configuration = {
+        "datasetConfig": {"longitude": "lng", "latitude": "lat"},
+        "annotateConfig": {"dataPoints": [{"column": "col1"}]},
+    }
+    visualization_config.save()
+    return visualization_config
+
+
+def tile_url(visualization_config, z, x, y):
+    return reverse(
+        "shared_data:visualization-tile",
+        kwargs={"visualization_id": visualization_config.id, "z": z, "x": x, "y": y},
+    )
+
+
+@patch("apps.shared_data.datasets.data_entry_upload_service.get_file")
+@patch("apps.shared_data.visualization_tiles.data_entry_upload_service.storage")
+def test_visualization_tile_generated_and_cached(
+    mock_storage, mock_get_file, not_logged_in_client, published_visualization_config
+):
+    mock_storage.open.side_effect = FileNotFoundError()
+    mock_get_file.return_value = io.StringIO("lat,lng,col1\n10,10,val1\n-10,-10,val2")
+
+    response = not_logged_in_client.get(tile_url(published_visualization_config, 1, 1, 0))
+
+    assert response.status_code == 200
+    assert response["Content-Type"] == CONTENT_TYPE
+    assert "max-age=3600" in response["Cache-Control"]
+    assert response["ETag"]
+    (layer,) = decode_tile(response.content)
+    assert [feature["properties"]["fields"] for feature in layer["features"]] == [
+        '[{"label": "col1", "value": "val1"}]'
+    ]
+
+    path, content = mock_storage.save.call_args[0]
+    assert path == get_tile_path(published_visualization_config, 1, 1, 0)
+    assert content.read() == response.content
+
+
+@patch("apps.shared_data.datasets.data_entry_upload_service.get_file")
+@patch("apps.shared_data.visualization_tiles.data_entry_upload_service.storage")
+def test_visualization_tile_from_cache(
+    mock_storage, mock_get_file, not_logged_in_client, published_visualization_config
+):
+    mock_storage.open.return_value = io.BytesIO(b"cached tile")
+
+    response = not_logged_in_client.get(tile_url(published_visualization_config, 1, 1, 0))
+
+    assert response.status_code == 200
+    assert response.content == b"cached tile"
+    mock_get_file.assert_not_called()
+    mock_storage.save.assert_not_called()
+
+
+@patch("apps.shared_data.datasets.data_entry_upload_service.get_file")
+@patch("apps.shared_data.visualization_tiles.data_entry_upload_service.storage")
+def test_visualization_tile_too_many_features_is_cached(
+    mock_storage, mock_get_file, settings, not_logged_in_client, published_visualization_config
+):
+    settings.VISUALIZATION_TILES_MAX_FEATURES = 1
+    mock_storage.open.side_effect = FileNotFoundError()
+    mock_get_file.side_effect = lambda *args: io.StringIO("lat,lng,col1\n10,10,val1\n-10,-10,val2")
+
+    for x in (0, 1):
+        response = not_logged_in_client.get(tile_url(published_visualization_config, 1, x, 0))
+        assert response.status_code == 404
+
+    assert mock_get_file.call_count == 1
+
+
+@patch("apps.shared_data.views.get_tile")
+def test_visualization_tile_not_modified(
+    mock_get_tile, not_logged_in_client, published_visualization_config
+):
+    url = tile_url(published_visualization_config, 1, 1, 0)
+    mock_get_tile.return_value = b""
+    etag = not_logged_in_client.get(url)["ETag"]
+
+    response = not_logged_in_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == 304
+    assert mock_get_tile.call_count == 1
+
+    response = not_logged_in_client.get(url, HTTP_IF_NONE_MATCH=f'"other", {etag}')
+    assert response.status_code == 304
+
+    response = not_logged_in_client.get(url, HTTP_IF_NONE_MATCH=f'"other{etag[1:]}')
+    assert response.status_code == 200
+
+
+@patch("apps.shared_data.visualization_tiles.data_entry_upload_service.storage")
+def test_remove_visualization_tiles_keeps_current_version(mock_storage, visualization_config):
+    current_path = get_tile_path(visualization_config, 0, 0, 0)
+    old_path = f"{TILES_PATH_PREFIX}/{visualization_config.id}/20000101000000000000/0/0/0.mvt"
+    mock_storage.bucket.objects.filter.return_value = [
+        SimpleNamespace(key=current_path),
+        SimpleNamespace(key=old_path),
+    ]
+    mock_storage.bucket.delete_objects.return_value = {}
+
+    remove_visualization_tiles(str(visualization_config.id))
+
+    mock_storage.bucket.delete_objects.assert_called_once_with(
+        Delete={"Objects": [{"Key": old_path}], "Quiet": True}
+    )
+
+    visualization_config.delete()
+    remove_visualization_tiles(str(visualization_config.id))
+
+    assert mock_storage.bucket.delete_objects.call_args.kwargs["Delete"]["Objects"] == [
+        {"Key": current_path},
+        {"Key": old_path},
+    ]
+
+
+def test_visualization_tile_not_allowed(not_logged_in_client, visualization_config):
+    response = not_logged_in_client.get(tile_url(visualization_config, 0, 0, 0))
+
+    assert response.status_code == 404
+
+
+def test_visualization_tile_disabled(
+    settings, not_logged_in_client, published_visualization_config
+):
+    settings.VISUALIZATION_TILES_ENABLED = False
+
+    response = not_logged_in_client.get(tile_url(published_visualization_config, 0, 0, 0))
+
+    assert response.status_code == 404
+
+
+def test_visualization_tile_out_of_range(not_logged_in_client, published_visualization_config):
+    response = not_logged_in_client.get(tile_url(published_visualization_config, 1, 2, 0))
+
+    assert response.status_code == 404
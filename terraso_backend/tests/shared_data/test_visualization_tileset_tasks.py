@@ -40,7 +40,24 @@ def create_mock_response(response):
     return mock_response
 
 
-@patch("apps.shared_data.visualization_tileset_tasks.data_entry_upload_service.get_file")
+def mock_post_responses(mock_request_post, responses):
+    """Mocks the posts in order, returns the ndjson uploaded as the tileset source"""
+    uploads = []
+    mock_responses = [create_mock_response(response) for response in responses]
+
+    def post(url, **kwargs):
+        body = kwargs.get("data")
+        if body is not None:
+            # The source file is only readable while the request is sent
+            body.file.seek(0)
+            uploads.append(body.file.read().decode("utf-8"))
+        return mock_responses.pop(0)
+
+    mock_request_post.side_effect = post
+    return uploads
+
+
+@patch("apps.shared_data.datasets.data_entry_upload_service.get_file")
 @patch("apps.core.gis.mapbox.requests.post")
 def test_create_mapbox_tileset_dataset_success(
     mock_request_post, mock_get_file, visualization_config
@@ -68,13 +85,13 @@ def test_create_mapbox_tileset_dataset_success(
         {"status_code": 200, "json_data": {}},
         {"status_code": 200, "json_data": {}},
     ]
-    mock_request_post.side_effect = [create_mock_response(response) for response in mock_responses]
+    uploads = mock_post_responses(mock_request_post, mock_responses)
     create_mapbox_tileset(visualization_config.id)
     updated_visualization_config = VisualizationConfig.objects.get(id=visualization_config.id)
     assert updated_visualization_config.mapbox_tileset_id is not None
     assert mock_request_post.call_count == 3
 
-    assert json.loads(mock_request_post.call_args_list[0][1]["files"][0][1][1]) == {
+    assert json.loads(uploads[0]) == {
         "type": "Feature",
         "geometry": {"type": "Point", "coordinates": [-0.1805502450716432, -78.48306234911033]},
         "properties": {
@@ -111,18 +128,14 @@ def test_create_mapbox_tileset_gis_dataentry_success(
             {"status_code": 200, "json_data": {}},
             {"status_code": 200, "json_data": {}},
         ]
-        mock_request_post.side_effect = [
-            create_mock_response(response) for response in mock_responses
-        ]
+        uploads = mock_post_responses(mock_request_post, mock_responses)
         create_mapbox_tileset(visualization_config_kml.id)
 
     updated_visualization_config = VisualizationConfig.objects.get(id=visualization_config_kml.id)
     assert updated_visualization_config.mapbox_tileset_id is not None
     assert mock_request_post.call_count == 3
 
-    assert mock_request_post.call_args_list[0][1]["files"][0][1][1] == get_line_delimited_geojson(
-        expected_json
-    )
+    assert uploads[0] == get_line_delimited_geojson(expected_json)
 
     assert (
         mock_request_post.call_args_list[1][1]["json"]["name"]
@@ -130,7 +143,7 @@ def test_create_mapbox_tileset_gis_dataentry_success(
     )
 
 
-@patch("apps.shared_data.visualization_tileset_tasks.data_entry_upload_service.get_file")
+@patch("apps.shared_data.datasets.data_entry_upload_service.get_file")
 @patch("apps.core.gis.mapbox.requests.post")
 def test_create_mapbox_tileset_fail(mock_request_post, mock_get_file, visualization_config):
     visualization_config.configuration = {
@@ -153,12 +166,40 @@ def test_create_mapbox_tileset_fail(mock_request_post, mock_get_file, visualizat
         {"status_code": 400, "json_data": {}},
     ]
     mock_request_post.side_effect = [create_mock_response(response) for response in mock_responses]
-    create_mapbox_tileset(visualization_config.id)
+    with pytest.raises(Exception):
+        create_mapbox_tileset(visualization_config.id)
     updated_visualization_config = VisualizationConfig.objects.get(id=visualization_config.id)
     assert updated_visualization_config.mapbox_tileset_id is None
     assert mock_request_post.call_count == 1
 
 
+@patch("apps.shared_data.datasets.data_entry_upload_service.get_file")
+@patch("apps.core.gis.mapbox.requests.post")
+def test_create_mapbox_tileset_dataset_skips_rows_without_coordinates(
+    mock_request_post, mock_get_file, visualization_config
+):
+    visualization_config.configuration = {
+        "datasetConfig": {"longitude": "lng", "latitude": "lat"},
+        "annotateConfig": {"dataPoints": [{"column": "col1"}], "annotationTitle": "title"},
+    }
+    visualization_config.save()
+    mock_get_file.return_value = io.StringIO(
+        "title,lat,lng,col1\nfirst,1,2,val1\n\nsecond,,3,val2\nthird,4,5\n"
+    )
+    mock_responses = [
+        {"status_code": 200, "json_data": {"id": "tileset-id-1"}},
+        {"status_code": 200, "json_data": {}},
+        {"status_code": 200, "json_data": {}},
+    ]
+    uploads = mock_post_responses(mock_request_post, mock_responses)
+    create_mapbox_tileset(visualization_config.id)
+
+    features = [json.loads(line) for line in uploads[0].split("\n")]
+    assert [feature["geometry"]["coordinates"] for feature in features] == [[2, 1], [5, 4]]
+    assert [feature["properties"]["title"] for feature in features] == ["first", "third"]
+    assert json.loads(features[1]["properties"]["fields"]) == [{"label": "col1", "value": None}]
+
+
 @patch("apps.core.gis.mapbox.requests.delete")
 def test_remove_mapbox_tileset_success(mock_request_delete):
     mock_responses = [
@@ -0,0 +1,275 @@
+# Copyright © 2026 Technology Matters
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see https://www.gnu.org/licenses/.
+
+from datetime import timedelta
+from operator import attrgetter
+from unittest import mock
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+from freezegun import freeze_time
+from soil_id.us_soil import SoilListOutputData
+
+from apps.core.circuit_breaker import CircuitOpenError, CircuitState
+from apps.core.models import Job
+from apps.core.process_pool import ProcessWorkerPool
+from apps.soil_id.graphql.soil_id import algorithm
+from apps.soil_id.graphql.soil_id.resolvers import (
+    fetch_list_soils_output,
+    get_list_soils_output,
+    list_soils_circuit_breakers,
+)
+from apps.soil_id.models.soil_id_cache import SoilIdCache
+from apps.soil_id.payloads import LazySoilListOutputData
+
+pytestmark = pytest.mark.django_db
+
+LATITUDE = 34.9524
+LONGITUDE = -101.7952
+
+
+@pytest.fixture
+def cache_settings(settings):
+    settings.SOIL_ID_CACHE_TTL_SECONDS = 100
+    settings.SOIL_ID_CACHE_FAILURE_TTL_SECONDS = 10
+    settings.SOIL_ID_CACHE_STALE_WHILE_REVALIDATE_SECONDS = 50
+    settings.SOIL_ID_CACHE_COMPRESS_PAYLOADS = True
+    return settings
+
+
+def _list_output():
+    return SoilListOutputData(
+        soil_list_json={"soilList": []}, rank_data_csv="", map_unit_component_data_csv=""
+    )
+
+
+def _save_entry(data, seconds_ago):
+    with freeze_time(timezone.now() - timedelta(seconds=seconds_ago)):
+        SoilIdCache.save_data(
+            latitude=LATITUDE,
+            longitude=LONGITUDE,
+            data=data,
+            data_region=SoilIdCache.DataRegion.US,
+        )
+    return SoilIdCache.get_entry(latitude=LATITUDE, longitude=LONGITUDE)
+
+
+def test_entry_fresh_within_ttl(cache_settings):
+    entry = _save_entry(_list_output(), seconds_ago=90)
+
+    assert entry.is_fresh()
+    assert entry.is_servable_while_revalidating()
+
+
+def test_entry_stale_while_revalidating(cache_settings):
+    entry = _save_entry(_list_output(), seconds_ago=120)
+
+    assert not entry.is_fresh()
+    assert entry.is_servable_while_revalidating()
+
+
+def test_entry_expired(cache_settings):
+    entry = _save_entry(_list_output(), seconds_ago=200)
+
+    assert not entry.is_fresh()
+    assert not entry.is_servable_while_revalidating()
+
+
+def test_failure_entry_uses_failure_ttl(cache_settings):
+    entry = _save_entry("DATA_UNAVAILABLE", seconds_ago=20)
+
+    assert not entry.is_fresh()
+    assert entry.cached_data == "DATA_UNAVAILABLE"
+
+
+def test_entry_without_ttl_never_expires(cache_settings):
+    cache_settings.SOIL_ID_CACHE_TTL_SECONDS = None
+    entry = _save_entry(_list_output(), seconds_ago=10**8)
+
+    assert entry.is_fresh()
+
+
+def test_save_data_replaces_failure(cache_settings):
+    _save_entry("DATA_UNAVAILABLE", seconds_ago=0)
+    entry = _save_entry(_list_output(), seconds_ago=0)
+
+    data_region, list_output = entry.cached_data
+    assert entry.failure_reason is None
+    assert list_output.soil_list_json == {"soilList": []}
+
+
+def test_compressed_entry_round_trip(cache_settings):
+    data = SoilListOutputData(
+        soil_list_json={"soilList": [{"id": {"name": "Pullman"}}]},
+        rank_data_csv="a,b\n1,2\n",
+        map_unit_component_data_csv="c\n3\n",
+    )
+    entry = _save_entry(data, seconds_ago=0)
+
+    data_region, list_output = entry.cached_data
+    assert entry.payload_format == SoilIdCache.PayloadFormat.ZLIB
+    assert entry.soil_list_json is None
+    assert isinstance(list_output, LazySoilListOutputData)
+    assert list_output.soil_list_json == data.soil_list_json
+    assert list_output.rank_data_csv == data.rank_data_csv
+    assert list_output.map_unit_component_data_csv == data.map_unit_component_data_csv
+
+
+def test_compressed_entry_round_trip_through_worker_process(cache_settings):
+    data = SoilListOutputData(
+        soil_list_json={"soilList": [{"id": {"name": "Pullman"}}]},
+        rank_data_csv="a,b\n1,2\n",
+        map_unit_component_data_csv="c\n3\n",
+    )
+    entry = _save_entry(data, seconds_ago=0)
+    data_region, list_output = entry.cached_data
+
+    # Workers don't set up Django, so unpickling mustn't import the models
+    pool = ProcessWorkerPool(1)
+    try:
+        result = pool.run(
+            attrgetter("soil_list_json", "rank_data_csv", "map_unit_component_data_csv"),
+            list_output,
+        )
+    finally:
+        pool.shutdown()
+
+    assert result == (data.soil_list_json, data.rank_data_csv, data.map_unit_component_data_csv)
+
+
+def test_compact_soil_id_cache_command(cache_settings):
+    cache_settings.SOIL_ID_CACHE_COMPRESS_PAYLOADS = False
+    entry = _save_entry(_list_output(), seconds_ago=30)
+    assert entry.payload_format == SoilIdCache.PayloadFormat.TEXT
+
+    call_command("compact_soil_id_cache", batch_size=1)
+
+    entry.refresh_from_db()
+    data_region, list_output = entry.cached_data
+    assert entry.payload_format == SoilIdCache.PayloadFormat.ZLIB
+    assert entry.soil_list_json is None
+    assert list_output.soil_list_json == {"soilList": []}
+    assert entry.is_fresh()
+    assert entry.age >= timedelta(seconds=30)
+
+
+def test_get_nearest_entry(cache_settings):
+    _save_entry(_list_output(), seconds_ago=10**6)
+
+    entry = SoilIdCache.get_nearest_entry(
+        latitude=LATITUDE + 0.001, longitude=LONGITUDE, max_distance_degrees=0.01
+    )
+    assert entry is not None
+    assert entry.latitude == LATITUDE
+
+    assert (
+        SoilIdCache.get_nearest_entry(
+            latitude=LATITUDE + 0.1, longitude=LONGITUDE, max_distance_degrees=0.01
+        )
+        is None
+    )
+
+
+def _refresh_jobs():
+    return Job.objects.filter(dedupe_key__startswith="refresh_list_soils_output:")
+
+
+@mock.patch("apps.soil_id.graphql.soil_id.resolvers.fetch_list_soils_output")
+def test_stale_entry_served_while_refreshed(mock_fetch, cache_settings):
+    _save_entry(_list_output(), seconds_ago=120)
+
+    data_region, list_output = get_list_soils_output(latitude=LATITUDE, longitude=LONGITUDE)
+
+    assert list_output.soil_list_json == {"soilList": []}
+    mock_fetch.assert_not_called()
+    job = _refresh_jobs().get()
+    assert job.status == Job.Status.QUEUED
+    assert job.args == [LATITUDE, LONGITUDE]
+
+
+@mock.patch("apps.soil_id.graphql.soil_id.resolvers.fetch_list_soils_output")
+def test_expired_entry_fetched_before_responding(mock_fetch, cache_settings):
+    _save_entry(_list_output(), seconds_ago=200)
+    mock_fetch.return_value = "DATA_UNAVAILABLE"
+
+    assert get_list_soils_output(latitude=LATITUDE, longitude=LONGITUDE) == "DATA_UNAVAILABLE"
+
+    mock_fetch.assert_called_once_with(latitude=LATITUDE, longitude=LONGITUDE)
+    assert not _refresh_jobs().exists()
+
+
+@mock.patch("apps.soil_id.graphql.soil_id.resolvers.find_region_for_location", return_value=None)
+def test_failure_cached_with_failure_ttl(_mock_region, cache_settings):
+    assert fetch_list_soils_output(LATITUDE, LONGITUDE) == "DATA_UNAVAILABLE"
+
+    entry = SoilIdCache.get_entry(latitude=LATITUDE, longitude=LONGITUDE)
+    assert entry.cached_data == "DATA_UNAVAILABLE"
+    assert entry.ttl == timedelta(seconds=10)
+
+
+@mock.patch("apps.soil_id.graphql.soil_id.resolvers.find_region_for_location", return_value=None)
+def test_failure_does_not_replace_cached_result(_mock_region, cache_settings):
+    _save_entry(_list_output(), seconds_ago=200)
+
+    assert fetch_list_soils_output(LATITUDE, LONGITUDE) == "DATA_UNAVAILABLE"
+
+    entry = SoilIdCache.get_entry(latitude=LATITUDE, longitude=LONGITUDE)
+    assert entry.failure_reason is None
+
+
+@mock.patch(
+    "apps.soil_id.graphql.soil_id.resolvers.fetch_list_soils_output",
+    side_effect=CircuitOpenError,
+)
+def test_open_circuit_serves_nearest_entry(mock_fetch, cache_settings):
+    _save_entry(_list_output(), seconds_ago=10**6)
+
+    data_region, list_output = get_list_soils_output(latitude=LATITUDE + 0.001, longitude=LONGITUDE)
+
+    assert data_region == SoilIdCache.DataRegion.US
+    assert list_output.soil_list_json == {"soilList": []}
+
+
+@mock.patch(
+    "apps.soil_id.graphql.soil_id.resolvers.fetch_list_soils_output",
+    side_effect=CircuitOpenError,
+)
+def test_open_circuit_without_cache_is_data_unavailable(mock_fetch, cache_settings):
+    assert get_list_soils_output(latitude=LATITUDE, longitude=LONGITUDE) == "DATA_UNAVAILABLE"
+
+
+@mock.patch("apps.soil_id.graphql.soil_id.resolvers.find_region_for_location", return_value="US")
+def test_slow_list_soils_opens_circuit_without_process_pool(_mock_region, settings):
+    breaker = list_soils_circuit_breakers[SoilIdCache.DataRegion.US]
+    breaker.reset()
+    now = [0]
+
+    def slow_list_soils(*args):
+        now[0] += settings.SOIL_ID_CIRCUIT_BREAKER_SLOW_CALL_SECONDS + 1
+        return "DATA_UNAVAILABLE"
+
+    with (
+        mock.patch.object(algorithm, "SOIL_ID_PROCESS_POOL_SIZE", 0),
+        mock.patch.object(algorithm, "_list_soils", side_effect=slow_list_soils),
+        mock.patch.object(breaker, "_clock", lambda: now[0]),
+    ):
+        for _ in range(breaker.min_calls):
+            fetch_list_soils_output(LATITUDE, LONGITUDE)
+
+        assert breaker.state == CircuitState.OPEN
+        with pytest.raises(CircuitOpenError):
+            fetch_list_soils_output(LATITUDE, LONGITUDE)
+    breaker.reset()
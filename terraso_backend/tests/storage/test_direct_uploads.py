@@ -0,0 +1,167 @@
+# Copyright © 2026 Technology Matters
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see https://www.gnu.org/licenses/.
+
+import io
+import zipfile
+
+import pytest
+from django.conf import settings
+from moto import mock_aws
+from storages.backends.s3 import S3Storage
+
+from apps.core.gis.file_types import is_shape_file_zip
+from apps.storage.direct_uploads import (
+    FILE_SIZE_EXCEEDED,
+    DirectUploadError,
+    create_upload,
+    finalize_upload,
+    open_uploaded_file,
+)
+from apps.storage.services import UploadService
+
+pytestmark = pytest.mark.django_db
+
+BUCKET_NAME = "direct-uploads-test"
+
+
+class DirectUploadService(UploadService):
+    storage = None
+    base_url = f"https://{BUCKET_NAME}"
+
+
+@pytest.fixture
+def upload_service():
+    with mock_aws():
+        service = DirectUploadService()
+        service.storage = S3Storage(bucket_name=BUCKET_NAME)
+        service.storage.connection.meta.client.create_bucket(
+            Bucket=BUCKET_NAME,
+            CreateBucketConfiguration={"LocationConstraint": settings.AWS_S3_REGION_NAME},
+        )
+        yield service
+
+
+@pytest.fixture
+def s3_client(upload_service):
+    return upload_service.storage.connection.meta.client
+
+
+def test_create_upload_presigned_post(upload_service):
+    upload = create_upload(upload_service, "user-1", "user-1/file.csv", "file.csv", 10, 100)
+
+    assert upload["method"] == "POST"
+    assert upload["fields"]["key"] == "user-1/file.csv"
+    assert upload["upload_token"]
+
+
+def test_finalize_upload(upload_service, s3_client):
+    upload = create_upload(upload_service, "user-1", "user-1/file.csv", "file.csv", 10, 100)
+    s3_client.put_object(Bucket=BUCKET_NAME, Key="user-1/file.csv", Body=b"lat,lng\n1,2\n")
+
+    uploaded_object = finalize_upload(upload_service, "user-1", upload["upload_token"], 100)
+
+    assert uploaded_object.path == "user-1/file.csv"
+    assert uploaded_object.file_name == "file.csv"
+    assert uploaded_object.size == 12
+    with open_uploaded_file(upload_service, uploaded_object) as file:
+        assert file.read(3) == b"lat"
+        file.seek(-2, io.SEEK_END)
+        assert file.read() == b"2\n"
+
+
+def test_finalize_upload_only_once(upload_service, s3_client):
+    upload = create_upload(upload_service, "user-1", "user-1/file.csv", "file.csv", 10, 100)
+    s3_client.put_object(Bucket=BUCKET_NAME, Key="user-1/file.csv", Body=b"lat,lng\n1,2\n")
+    finalize_upload(upload_service, "user-1", upload["upload_token"], 100)
+
+    with pytest.raises(DirectUploadError) as error:
+        finalize_upload(upload_service, "user-1", upload["upload_token"], 100)
+
+    assert error.value.code == "upload_already_finalized"
+
+
+def test_finalize_multipart_upload(settings, upload_service, s3_client):
+    settings.DIRECT_UPLOAD_MULTIPART_THRESHOLD = 5
+    upload = create_upload(upload_service, "user-1", "user-1/file.csv", "file.csv", 12, 100)
+
+    assert upload["method"] == "PUT"
+    assert [part["part_number"] for part in upload["parts"]] == [1]
+
+    (upload_id,) = [
+        multipart_upload["UploadId"]
+        for multipart_upload in s3_client.list_multipart_uploads(Bucket=BUCKET_NAME)["Uploads"]
+    ]
+    part = s3_client.upload_part(
+        Bucket=BUCKET_NAME,
+        Key="user-1/file.csv",
+        UploadId=upload_id,
+        PartNumber=1,
+        Body=b"lat,lng\n1,2\n",
+    )
+
+    uploaded_object = finalize_upload(
+        upload_service,
+        "user-1",
+        upload["upload_token"],
+        100,
+        parts=[{"part_number": 1, "etag": part["ETag"]}],
+    )
+
+    assert uploaded_object.size == 12
+
+
+def test_finalize_upload_not_uploaded(upload_service):
+    upload = create_upload(upload_service, "user-1", "user-1/file.csv", "file.csv", 10, 100)
+
+    with pytest.raises(DirectUploadError) as error:
+        finalize_upload(upload_service, "user-1", upload["upload_token"], 100)
+
+    assert error.value.code == "upload_incomplete"
+
+
+def test_finalize_upload_other_user(upload_service, s3_client):
+    upload = create_upload(upload_service, "user-1", "user-1/file.csv", "file.csv", 10, 100)
+    s3_client.put_object(Bucket=BUCKET_NAME, Key="user-1/file.csv", Body=b"content")
+
+    with pytest.raises(DirectUploadError) as error:
+        finalize_upload(upload_service, "user-2", upload["upload_token"], 100)
+
+    assert error.value.code == "invalid_upload_token"
+
+
+def test_finalize_upload_oversized(upload_service, s3_client):
+    upload = create_upload(upload_service, "user-1", "user-1/file.csv", "file.csv", 5, 5)
+    s3_client.put_object(Bucket=BUCKET_NAME, Key="user-1/file.csv", Body=b"more than 5 bytes")
+
+    with pytest.raises(DirectUploadError) as error:
+        finalize_upload(upload_service, "user-1", upload["upload_token"], 5)
+
+    assert error.value.code == FILE_SIZE_EXCEEDED
+    assert not upload_service.storage.exists("user-1/file.csv")
+
+
+def test_open_uploaded_zip(upload_service, s3_client):
+    content = io.BytesIO()
+    with zipfile.ZipFile(content, "w") as zip_file:
+        for name in ("shape.shp", "shape.shx", "shape.prj"):
+            zip_file.writestr(name, b"0" * 100_000)
+    upload = create_upload(upload_service, "user-1", "user-1/shape.zip", "shape.zip", 10, 10**6)
+    s3_client.put_object(Bucket=BUCKET_NAME, Key="user-1/shape.zip", Body=content.getvalue())
+
+    uploaded_object = finalize_upload(upload_service, "user-1", upload["upload_token"], 10**6)
+
+    with open_uploaded_file(upload_service, uploaded_object) as file:
+        assert file.name == "shape.zip"
+        assert is_shape_file_zip(file)
@@ -0,0 +1,109 @@
+# Copyright © 2026 Technology Matters
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see https://www.gnu.org/licenses/.
+
+from unittest.mock import patch
+
+import pytest
+from django.conf import settings
+from django.core.files.base import ContentFile
+from moto import mock_aws
+from storages.backends.s3 import S3Storage
+
+from apps.storage.services import UploadService
+
+BUCKET_NAME = "upload-service-test"
+
+
+class ContentAddressedUploadService(UploadService):
+    storage = None
+    base_url = f"https://{BUCKET_NAME}"
+    content_addressed = True
+
+
+@pytest.fixture
+def upload_service():
+    with mock_aws():
+        service = ContentAddressedUploadService()
+        service.storage = S3Storage(bucket_name=BUCKET_NAME)
+        service.storage.connection.meta.client.create_bucket(
+            Bucket=BUCKET_NAME,
+            CreateBucketConfiguration={"LocationConstraint": settings.AWS_S3_REGION_NAME},
+        )
+        yield service
+
+
+def test_content_addressed_upload(upload_service):
+    with patch.object(upload_service.storage, "exists") as mock_exists:
+        url = upload_service.upload_file(
+            "user-1", ContentFile(b"a,b\n1,2"), file_name="my data.csv"
+        )
+        same_url = upload_service.upload_file(
+            "user-1", ContentFile(b"a,b\n1,2"), file_name="other name.csv"
+        )
+        other_url = upload_service.upload_file(
+            "user-1", ContentFile(b"a,b\n3,4"), file_name="my data.csv"
+        )
+
+    mock_exists.assert_not_called()
+    assert url == same_url
+    assert url != other_url
+    assert url.startswith(f"https://{BUCKET_NAME}/user-1/")
+    assert url.endswith(".csv")
+
+    path = url.removeprefix(f"https://{BUCKET_NAME}/")
+    head = upload_service.storage.connection.meta.client.head_object(Bucket=BUCKET_NAME, Key=path)
+    # Shared by identical uploads, so the name is only set when signing
+    assert "ContentDisposition" not in head
+    assert head["ContentType"] == "text/csv"
+    assert upload_service.get_file(path).read() == b"a,b\n1,2"
+
+
+def test_content_addressed_available_path(upload_service):
+    with patch.object(upload_service.storage, "exists") as mock_exists:
+        path = upload_service.get_available_path("user-1", "my data.csv")
+        other_path = upload_service.get_available_path("user-1", "my data.csv")
+
+    mock_exists.assert_not_called()
+    assert path != other_path
+    assert path.startswith("user-1/")
+    assert path.endswith(".csv")
+
+
+def test_upload_parameters(upload_service):
+    assert upload_service.get_upload_parameters("datos año.csv") == {"ContentType": "text/csv"}
+    upload_service.content_addressed = False
+    assert upload_service.get_upload_parameters("datos.csv") == {}
+
+
+def test_delete_files(upload_service):
+    client = upload_service.storage.connection.meta.client
+    paths = [f"user-1/file-{index}.csv" for index in range(5)]
+    for path in paths:
+        client.put_object(Bucket=BUCKET_NAME, Key=path, Body=b"a,b")
+
+    with (
+        patch("apps.storage.services.DELETE_BATCH_SIZE", 2),
+        patch.object(
+            upload_service.storage.bucket,
+            "delete_objects",
+            wraps=upload_service.storage.bucket.delete_objects,
+        ) as mock_delete_objects,
+    ):
+        failed = upload_service.delete_files(paths[:4] + [paths[0]])
+
+    assert failed == {}
+    assert mock_delete_objects.call_count == 2
+    remaining = client.list_objects_v2(Bucket=BUCKET_NAME)["Contents"]
+    assert [object["Key"] for object in remaining] == [paths[4]]
@@ -0,0 +1,101 @@
+# Copyright © 2026 Technology Matters
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see https://www.gnu.org/licenses/.
+
+from unittest import mock
+
+import pytest
+
+from apps.storage.signed_urls import SignedUrlCache
+
+
+@pytest.fixture
+def storage():
+    storage = mock.Mock(bucket_name="bucket", querystring_expire=3600)
+
+    def url(name, parameters=None):
+        return f"https://bucket/{name}?signature={storage.url.call_count}"
+
+    storage.url.side_effect = url
+    return storage
+
+
+@pytest.fixture(autouse=True)
+def margin(settings):
+    settings.SIGNED_URL_CACHE_MARGIN_SECONDS = 600
+
+
+def test_signed_url_reused_until_shortly_before_expiry(storage):
+    cache = SignedUrlCache(max_size=10)
+
+    with mock.patch("apps.storage.signed_urls.time.monotonic", return_value=1000):
+        url = cache.get(storage, "1/file.csv")
+        assert cache.get(storage, "1/file.csv") == url
+    with mock.patch("apps.storage.signed_urls.time.monotonic", return_value=1000 + 2999):
+        assert cache.get(storage, "1/file.csv") == url
+    assert storage.url.call_count == 1
+
+    with mock.patch("apps.storage.signed_urls.time.monotonic", return_value=1000 + 3000):
+        assert cache.get(storage, "1/file.csv") != url
+    assert storage.url.call_count == 2
+
+
+def test_signed_url_keyed_on_bucket_and_object_name(storage):
+    other_storage = mock.Mock(bucket_name="other", querystring_expire=3600)
+    other_storage.url.return_value = "https://other/1/file.csv?signature=1"
+    cache = SignedUrlCache(max_size=10)
+
+    cache.get(storage, "1/file.csv")
+    cache.get(storage, "1/other.csv")
+    assert cache.get(other_storage, "1/file.csv") == "https://other/1/file.csv?signature=1"
+    assert storage.url.call_count == 2
+
+
+def test_signed_url_keyed_on_parameters(storage):
+    cache = SignedUrlCache(max_size=10)
+    first = {"ResponseContentDisposition": 'attachment; filename="first.csv"'}
+    second = {"ResponseContentDisposition": 'attachment; filename="second.csv"'}
+
+    url = cache.get(storage, "1/file.csv", first)
+    assert cache.get(storage, "1/file.csv", dict(first)) == url
+    assert cache.get(storage, "1/file.csv", second) != url
+    storage.url.assert_called_with("1/file.csv", parameters=second)
+
+
+def test_signed_url_cache_evicts_least_recently_used(storage):
+    cache = SignedUrlCache(max_size=2)
+
+    cache.get(storage, "a")
+    cache.get(storage, "b")
+    cache.get(storage, "a")
+    cache.get(storage, "c")
+    assert storage.url.call_count == 3
+
+    cache.get(storage, "a")
+    assert storage.url.call_count == 3
+    cache.get(storage, "b")
+    assert storage.url.call_count == 4
+
+
+def test_signed_url_not_cached_when_margin_exceeds_lifetime(settings, storage):
+    settings.SIGNED_URL_CACHE_MARGIN_SECONDS = 3600
+    cache = SignedUrlCache(max_size=10)
+
+    assert cache.get(storage, "a") != cache.get(storage, "a")
+
+
+def test_signed_url_cache_disabled(storage):
+    cache = SignedUrlCache(max_size=0)
+
+    assert cache.get(storage, "a") != cache.get(storage, "a")
@@ -0,0 +1,111 @@
+# Copyright © 2026 Technology Matters
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published
+# by the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with this program. If not, see https://www.gnu.org/licenses/.
+
+import hashlib
+import io
+
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.files.uploadhandler import MemoryFileUploadHandler
+from django.http.multipartparser import MultiPartParser
+from django.test.client import BOUNDARY, MULTIPART_CONTENT, encode_multipart
+
+from apps.storage.upload_handlers import ValidatingUploadHandler
+
+CONTENT = b"col1,col2\nval1,val2\n" * 10000
+
+
+def _parse(handler, content=CONTENT):
+    body = encode_multipart(
+        BOUNDARY,
+        {
+            "data_file": SimpleUploadedFile("data.csv", content, content_type="text/csv"),
+            "name": "Data",
+        },
+    )
+    input_data = io.BytesIO(body)
+    meta = {"CONTENT_TYPE": MULTIPART_CONTENT, "CONTENT_LENGTH": str(len(body))}
+    handlers = [handler, MemoryFileUploadHandler()]
+    post, files = MultiPartParser(meta, input_data, handlers).parse()
+    return post, files, input_data.tell(), len(body)
+
+
+def test_valid_upload_checksum():
+    handler = ValidatingUploadHandler(max_size=len(CONTENT))
+
+    post, files, _, _ = _parse(handler)
+
+    assert handler.error is None
+    assert post["name"] == "Data"
+    assert files["data_file"].read() == CONTENT
+    assert handler.checksums == {"data_file": [hashlib.sha256(CONTENT).hexdigest()]}
+
+
+def test_oversized_upload_stopped_while_received():
+    handler = ValidatingUploadHandler(max_size=1000)
+
+    _, files, bytes_read, body_size = _parse(handler)
+
+    assert handler.error.code == "File size exceeds 10 MB"
+    assert "data_file" not in files
+    # Drained without being kept, so the error response can be sent
+    assert bytes_read == body_size
+
+
+def test_upload_rejected_from_content_length():
+    handler = ValidatingUploadHandler(max_size=1000, max_files=1)
+
+    post, files, bytes_read, _ = _parse(handler)
+
+    assert handler.error.code == "File size exceeds 10 MB"
+    assert not post and not files
+    assert bytes_read == 0
+
+
+def test_upload_within_overhead_stopped_while_received():
+    handler = ValidatingUploadHandler(max_size=len(CONTENT) - 1, max_files=1)
+
+    _, files, bytes_read, body_size = _parse(handler)
+
+    assert handler.error.code == "File size exceeds 10 MB"
+    assert "data_file" not in files
+    assert bytes_read == body_size
+
+
+def test_invalid_type_stopped_on_first_chunk():
+    def validate_start(field_name, file_name, mime_type):
+        assert (field_name, file_name) == ("data_file", "data.csv")
+        if mime_type != "application/pdf":
+            raise ValidationError("csv", code="invalid_extension")
+
+    handler = ValidatingUploadHandler(validate_start=validate_start)
+
+    _, files, bytes_read, body_size = _parse(handler)
+
+    assert handler.error.code == "invalid_extension"
+    assert "data_file" not in files
+    assert bytes_read == body_size
+
+
+def test_mime_type_sniffed_from_first_chunk():
+    sniffed = []
+    handler = ValidatingUploadHandler(
+        validate_start=lambda field_name, file_name, mime_type: sniffed.append(mime_type)
+    )
+
+    _parse(handler)
+
+    assert len(sniffed) == 1
+    assert sniffed[0].startswith("text/")
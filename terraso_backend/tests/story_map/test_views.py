@@ -13,7 +13,9 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with this program. If not, see https://www.gnu.org/licenses/.
 
+import io
 import json
+import threading
 from unittest import mock
 from unittest.mock import patch
 
@@ -22,6 +24,8 @@ from django.core.files.uploadedfile import SimpleUploadedFile
 from django.urls import reverse
 from mixer.backend.django import mixer
 
+from apps.storage.direct_uploads import UploadedObject
+
 pytestmark = pytest.mark.django_db
 
 
@@ -441,7 +445,7 @@ def test_update_featured_image_cleanup(logged_client, users):
             "apps.story_map.views.story_map_media_upload_service.upload_file_get_path"
         ) as mocked_upload_service,
         patch(
-            "apps.story_map.views.story_map_media_upload_service.delete_file"
+            "apps.story_map.views.story_map_media_upload_service.delete_files"
         ) as mocked_delete_service,
         patch(
             "apps.story_map.views.story_map_media_upload_service.get_signed_url"
@@ -451,6 +455,199 @@ def test_update_featured_image_cleanup(logged_client, users):
         mocked_get_signed_url.return_value = "https://example.org/new_image.jpg?signed=true"
         response = logged_client.post(url, data=data)
         mocked_upload_service.assert_called_once()
-        mocked_delete_service.assert_called_once_with("https://example.org/old_image.jpg")
+        mocked_delete_service.assert_called_once_with(["https://example.org/old_image.jpg"])
+
+    assert response.status_code == 201
+
+
+def test_update_uploads_media_concurrently(settings, logged_client, users):
+    settings.STORY_MAP_MEDIA_UPLOAD_CONCURRENCY = 3
+    old_config = {
+        "title": "Old Config",
+        "featuredImage": {"url": "old/featured.jpg"},
+        "chapters": [
+            {"id": "chapter-1", "media": {"url": "old/chapter-1.jpg", "type": "image/jpeg"}},
+            {"id": "chapter-2", "media": {"url": "old/chapter-2.jpg", "type": "image/jpeg"}},
+        ],
+    }
+    story_map = mixer.blend("story_map.StoryMap", created_by=users[0], configuration=old_config)
+    file_names = ["chapter-1.jpg", "chapter-3.jpg", "featured.jpg"]
+    data = {
+        "id": story_map.pk,
+        "title": "Updated StoryMap",
+        "publish": "false",
+        "files": [
+            SimpleUploadedFile(name=name, content=name.encode(), content_type="image/jpeg")
+            for name in file_names
+        ],
+        "configuration": json.dumps(
+            {
+                "title": "Updated StoryMap",
+                "featuredImage": {"contentId": "featured.jpg", "description": "Featured"},
+                "chapters": [
+                    {"id": "chapter-1", "media": {"contentId": "chapter-1.jpg", "type": "image"}},
+                    {"id": "chapter-2", "media": {"url": "old/chapter-2.jpg", "type": "image"}},
+                    {"id": "chapter-3", "media": {"contentId": "chapter-3.jpg", "type": "image"}},
+                    {"id": "chapter-4", "media": {"contentId": "missing.jpg", "type": "image"}},
+                ],
+            }
+        ),
+    }
+    # Every upload waits for the others, so they only finish when run concurrently
+    barrier = threading.Barrier(3, timeout=5)
+
+    def upload_file_get_path(user_id, file, file_name=None):
+        barrier.wait()
+        return f"new/{file.name}"
+
+    with (
+        patch(
+            "apps.story_map.views.story_map_media_upload_service.upload_file_get_path",
+            side_effect=upload_file_get_path,
+        ),
+        patch(
+            "apps.story_map.views.story_map_media_upload_service.delete_files"
+        ) as mocked_delete_files,
+        patch("apps.story_map.views.story_map_media_upload_service.get_signed_url"),
+    ):
+        mocked_delete_files.return_value = {}
+        response = logged_client.post(reverse("story_map:update"), data=data)
+
+    assert response.status_code == 201
+    configuration = response.json()["configuration"]
+    assert [chapter["media"].get("url") for chapter in configuration["chapters"]] == [
+        "new/chapter-1.jpg",
+        "old/chapter-2.jpg",
+        "new/chapter-3.jpg",
+        None,
+    ]
+    assert configuration["chapters"][3]["media"]["contentId"] == "missing.jpg"
+    assert configuration["featuredImage"]["url"] == "new/featured.jpg"
+    assert configuration["featuredImage"]["description"] == "Featured"
+    mocked_delete_files.assert_called_once_with(["old/chapter-1.jpg", "old/featured.jpg"])
+
+
+def test_update_deletes_uploaded_media_when_an_upload_fails(settings, logged_client, users):
+    settings.STORY_MAP_MEDIA_UPLOAD_CONCURRENCY = 3
+    old_config = {"title": "Old Config", "chapters": []}
+    story_map = mixer.blend("story_map.StoryMap", created_by=users[0], configuration=old_config)
+    file_names = ["chapter-1.jpg", "chapter-2.jpg", "chapter-3.jpg"]
+    data = {
+        "id": story_map.pk,
+        "title": "Updated StoryMap",
+        "publish": "false",
+        "files": [
+            SimpleUploadedFile(name=name, content=name.encode(), content_type="image/jpeg")
+            for name in file_names
+        ],
+        "configuration": json.dumps(
+            {
+                "title": "Updated StoryMap",
+                "chapters": [
+                    {"id": name, "media": {"contentId": name, "type": "image"}}
+                    for name in file_names
+                ],
+            }
+        ),
+    }
+
+    def upload_file_get_path(user_id, file, file_name=None):
+        if file.name == "chapter-2.jpg":
+            raise RuntimeError("upload failed")
+        return f"new/{file.name}"
+
+    with (
+        patch(
+            "apps.story_map.views.story_map_media_upload_service.upload_file_get_path",
+            side_effect=upload_file_get_path,
+        ),
+        patch(
+            "apps.story_map.views.story_map_media_upload_service.delete_files"
+        ) as mocked_delete_files,
+        pytest.raises(RuntimeError, match="upload failed"),
+    ):
+        mocked_delete_files.return_value = {}
+        logged_client.post(reverse("story_map:update"), data=data)
+
+    mocked_delete_files.assert_called_once_with(["new/chapter-1.jpg", "new/chapter-3.jpg"])
+
+
+def test_update_media_cleanup_failure(logged_client, users):
+    old_config = {"title": "Old Config", "featuredImage": {"url": "old/featured.jpg"}}
+    story_map = mixer.blend("story_map.StoryMap", created_by=users[0], configuration=old_config)
+    data = {
+        "id": story_map.pk,
+        "title": "Updated StoryMap",
+        "publish": "false",
+        "configuration": json.dumps({"title": "Updated StoryMap", "chapters": []}),
+    }
+    with patch(
+        "apps.story_map.views.story_map_media_upload_service.delete_files"
+    ) as mocked_delete_files:
+        mocked_delete_files.return_value = {"old/featured.jpg": "Access Denied"}
+        response = logged_client.post(reverse("story_map:update"), data=data)
+
+    # Files that can't be deleted don't fail the update
+    assert response.status_code == 201
+    mocked_delete_files.assert_called_once_with(["old/featured.jpg"])
+
+
+@pytest.mark.parametrize(
+    "content, status_code",
+    [
+        (b"\xff\xd8\xff\xe0\x00\x10JFIF\x00\x01\x01\x00\x00\x01\x00\x01\x00\x00", 201),
+        (b"this is not an image", 400),
+    ],
+)
+@patch("apps.story_map.views.story_map_media_upload_service.delete_file")
+@patch("apps.story_map.views.open_uploaded_file")
+@patch("apps.story_map.views.finalize_upload")
+def test_add_direct_upload_featured_image(
+    mock_finalize_upload,
+    mock_open_uploaded_file,
+    mock_delete_file,
+    logged_client,
+    users,
+    content,
+    status_code,
+):
+    path = f"{users[0].id}/story-map-media/featured-image"
+    mock_finalize_upload.return_value = UploadedObject(
+        path=path, file_name="featured-image", size=len(content)
+    )
+    mock_open_uploaded_file.return_value = io.BytesIO(content)
+    url = reverse("story_map:add")
+    data = {
+        "title": "Test StoryMap with Featured Image",
+        "publish": "false",
+        "configuration": json.dumps(
+            {
+                "title": "Test StoryMap with Featured Image",
+                "featuredImage": {"uploadToken": "token", "description": "A landscape"},
+                "chapters": [],
+            }
+        ),
+    }
+
+    response = logged_client.post(url, data=data)
+
+    assert response.status_code == status_code
+    if status_code == 201:
+        featured_image = response.json()["configuration"]["featuredImage"]
+        assert featured_image == {"url": path, "description": "A landscape"}
+        mock_delete_file.assert_not_called()
+    else:
+        assert response.json()["errors"][0]["message"][0]["code"] == "Invalid Media Type"
+        mock_delete_file.assert_called_once_with(path)
+
+
+@patch("apps.story_map.views.create_upload")
+def test_media_upload_target(mock_create_upload, logged_client, users):
+    mock_create_upload.return_value = {"upload_token": "token", "method": "POST"}
+
+    response = logged_client.post(reverse("story_map:media-upload-target"), {"size": 100})
 
     assert response.status_code == 201
+    assert response.json()["upload_token"] == "token"
+    path = mock_create_upload.call_args[0][2]
+    assert path.startswith(f"{users[0].id}/story-map-media/")